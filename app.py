@@ -1,42 +1,68 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
-import boto3
+from aws_clients import get_client, get_resource, get_table
+from bulk_import import detect_format, import_rows, read_rows
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from dashboard_stats import STATS_TABLE, stats_from_record
+from dynamo_batch import batch_get_items
+from dynamo_json import DynamoJSONProvider
+from result_cache import make_cache
+from result_watch import ResultWatcher
+from skill_index import SKILL_INDEX_TABLE, query_postings, top_candidates
+from transcript_store import read_transcript
 from datetime import datetime
+from functools import wraps
+import hmac
+import io
 import os
+import tempfile
+import time
 import uuid
-from boto3.dynamodb.conditions import Key
 import json
 
 app = Flask(__name__, template_folder='templates')
+# DynamoDB items (Decimal, sets, Binary) are serialized as-is by jsonify
+app.json = DynamoJSONProvider(app)
 CORS(app)
 
-# Replace with your region and table name
-dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
-table = dynamodb.Table('HireFusionTable')
-table_name ='ResumeAnalysisResults'  # Your second table
-
-table = dynamodb.Table('HireFusionTable')
-table_name ='ResumeAnalysisResults'
-
-# NEW table for interview analysis results
-video_analysis_table = dynamodb.Table("InterviewAnalysisResults")
-
-
+# AWS clients are created lazily and shared through aws_clients (one pool per service)
+USERS_TABLE = 'HireFusionTable'
+RESUME_TABLE = 'ResumeAnalysisResults'  # Your second table
+VIDEO_TABLE = "InterviewAnalysisResults"  # NEW table for interview analysis results
 
 # S3 Configuration (Using IAM Role)
-S3 = boto3.client("s3", region_name="us-east-1")
 BUCKET = "hirefusionai-resumes"  # Replace with your actual bucket name
-
-s3 = boto3.client('s3', region_name='us-east-1')
 VIDEO_BUCKET = 'hirefusion-interview-videos'
 
+# Read-through cache for analysis rows and user lookups. Completed analyses
+# never change, so they are kept until evicted; in-flight ones only briefly.
+# User and resume rows can be rewritten behind this worker's back (/register
+# on another worker, a re-upload, the bulk resume pipeline), so they expire.
+result_cache = make_cache()
+PENDING_CACHE_TTL = 3  # seconds
+MUTABLE_CACHE_TTL = int(os.environ.get('MUTABLE_CACHE_TTL', '60'))  # seconds
+
+# Operational endpoints and bulk user import need "Authorization: Bearer
+# <ADMIN_API_TOKEN>"; they are refused outright when no token is configured
+ADMIN_API_TOKEN = os.environ.get('ADMIN_API_TOKEN')
+
+def require_admin(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        supplied = request.headers.get("Authorization", "").encode()
+        if not ADMIN_API_TOKEN or not hmac.compare_digest(supplied, f"Bearer {ADMIN_API_TOKEN}".encode()):
+            return jsonify({"error": "Admin authorization required"}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
 def allowed_file(filename):
     ext = filename.rsplit(".", 1)[1].lower()
     return "." in filename and ext in {"pdf", "doc", "docx"}
 
 def upload_to_s3(fileobj, filename, acl="public-read"):
     unique_name = f"{uuid.uuid4().hex}_{filename}"
-    S3.upload_fileobj(fileobj, BUCKET, unique_name,
+    get_client('s3').upload_fileobj(fileobj, BUCKET, unique_name,
                       ExtraArgs={"ACL": acl, "ContentType": fileobj.content_type})
     url = f"https://{BUCKET}.s3.amazonaws.com/{unique_name}"
     return url
@@ -63,7 +89,7 @@ def register():
     password = data.get("password")
 
     # Store all fields in DynamoDB
-    table.put_item(Item={
+    get_table(USERS_TABLE).put_item(Item={
         'email': email,  # primary key
         'full_name': full_name,
         'username': username,
@@ -73,16 +99,75 @@ def register():
         'password': password,
         'created_at': datetime.utcnow().isoformat()
     })
+    result_cache.invalidate(f"user:{email}")
 
     return jsonify({"message": "User registered successfully"})
 
+MAX_IMPORT_BYTES = int(os.environ.get('MAX_IMPORT_BYTES', str(50 * 1024 * 1024)))
+SPOOL_CHUNK_BYTES = 64 * 1024
+
+def spool_upload(source, limit):
+    """Copy a stream to a temporary file; None (and nothing kept) if it is over limit bytes."""
+    spool = tempfile.TemporaryFile()
+    copied = 0
+    while True:
+        chunk = source.read(SPOOL_CHUNK_BYTES)
+        if not chunk:
+            spool.seek(0)
+            return spool
+        copied += len(chunk)
+        if copied > limit:
+            spool.close()
+            return None
+        spool.write(chunk)
+
+@app.route("/api/users/bulk_import", methods=["POST"])
+@require_admin
+def bulk_import_users():
+    """
+    Imports candidates from a CSV or JSONL upload (form field "file", or the
+    raw request body) of at most MAX_IMPORT_BYTES. Rows are written in
+    batches as they are read back from a disk spool, and the response
+    streams one JSON result per row, then a summary line. Emails that are
+    already registered come back as "conflict" and are left as they are.
+    """
+    if request.content_length is not None and request.content_length > MAX_IMPORT_BYTES:
+        return jsonify({"error": f"Upload larger than {MAX_IMPORT_BYTES} bytes"}), 413
+
+    upload = request.files.get("file")
+    if upload:
+        source, fmt = upload.stream, detect_format(upload.filename, upload.content_type)
+    else:
+        source, fmt = request.stream, detect_format(content_type=request.content_type)
+    fmt = request.args.get("format", fmt)
+    if fmt not in ("csv", "jsonl"):
+        return jsonify({"error": "format must be csv or jsonl"}), 400
+
+    # Spool to disk: the request's own streams are closed once this view returns
+    spool = spool_upload(source, MAX_IMPORT_BYTES)
+    if spool is None:
+        return jsonify({"error": f"Upload larger than {MAX_IMPORT_BYTES} bytes"}), 413
+    dynamodb = get_resource('dynamodb')
+
+    def results():
+        counts = {"ok": 0, "conflict": 0, "error": 0}
+        with io.TextIOWrapper(spool, encoding="utf-8-sig", newline="") as text:
+            for result in import_rows(read_rows(text, fmt), dynamodb, USERS_TABLE):
+                counts[result["status"]] += 1
+                if result["status"] == "ok":
+                    result_cache.invalidate(f"user:{result['email']}")
+                yield json.dumps(result) + "\n"
+        yield json.dumps({"summary": counts}) + "\n"
+
+    return Response(results(), mimetype="application/x-ndjson")
+
 @app.route("/login", methods=["POST"])
 def login():
     data = request.get_json()
     email = data.get("email")
     password = data.get("password")
 
-    response = table.get_item(Key={'email': email})
+    response = get_table(USERS_TABLE).get_item(Key={'email': email})
     user = response.get("Item")
 
     if not user:
@@ -110,7 +195,7 @@ def allowed_file(filename):
 
 def upload_to_s3(fileobj, filename):
     unique_name = f"{uuid.uuid4().hex}_{filename}"
-    S3.upload_fileobj(fileobj, BUCKET, unique_name,
+    get_client('s3').upload_fileobj(fileobj, BUCKET, unique_name,
                       ExtraArgs={"ContentType": fileobj.content_type})
     url = f"https://{BUCKET}.s3.amazonaws.com/{unique_name}"
     return url
@@ -120,20 +205,22 @@ def generate_presigned_url():
         data = request.get_json()
         file_name = data.get('filename')
         file_type = data.get('filetype')
+        email = data.get('email')
 
         if not file_name or not file_type:
             return jsonify({'error': 'Missing filename or filetype'}), 400
 
         resume_id = str(uuid.uuid4())  # ✅ generate only once
         unique_filename = f"{resume_id}_{file_name}"  # ✅ use resume_id in S3 filename
-        presigned_url = s3.generate_presigned_url(
+        presigned_url = get_client('s3').generate_presigned_url(
         ClientMethod='put_object',
          Params={
               'Bucket': BUCKET,
               'Key': unique_filename,
               'ContentType': file_type,
               'Metadata': {
-              'resumeid': resume_id  # <-- this will be attached to the S3 object
+              'resumeid': resume_id,  # <-- this will be attached to the S3 object
+              **({'useremail': email} if email else {})  # feeds the dashboard aggregates
               }
             },
            ExpiresIn=3600
@@ -153,30 +240,36 @@ def get_resume_data():
         return jsonify({'error': 'Missing resume_id'}), 400
 
     try:
-        # Use the high-level resource interface for consistency
-        analysis_table = dynamodb.Table(table_name)
-
-        response = analysis_table.get_item(Key={'ResumeID': resume_id})
-        item = response.get('Item')
-
-        if not item:
+        def load():
+            # Use the high-level resource interface for consistency
+            item = get_table(RESUME_TABLE).get_item(Key={'ResumeID': resume_id}).get('Item')
+            return resume_payload(item) if item else None
+
+        # A missing row is only cached briefly
+        payload = result_cache.get(
+            f"resume:{resume_id}", load, lambda value: MUTABLE_CACHE_TTL if value else PENDING_CACHE_TTL
+        )
+        if not payload:
             return jsonify({"error": "Resume not found"}), 404
 
-        return jsonify({
-            'ResumeID': item.get('ResumeID'),
-            'CertificationsCount': int(item.get('CertificationsCount', 0)),
-            'InternshipDetected': item.get('InternshipDetected', False),
-            'InternshipType': item.get('InternshipType', 'Unknown'),
-            'ProjectDetected': item.get('ProjectDetected', False),
-            'ResumeFile': item.get('ResumeFile', ''),
-            'Score': int(item.get('Score', 0)),
-            'Skills': json.loads(item.get('Skills', '[]')) if 'Skills' in item else []
-        })
+        return jsonify(payload)
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+def resume_payload(item):
+    return {
+        'ResumeID': item.get('ResumeID'),
+        'CertificationsCount': item.get('CertificationsCount', 0),
+        'InternshipDetected': item.get('InternshipDetected', False),
+        'InternshipType': item.get('InternshipType', 'Unknown'),
+        'ProjectDetected': item.get('ProjectDetected', False),
+        'ResumeFile': item.get('ResumeFile', ''),
+        'Score': item.get('Score', 0),
+        'Skills': json.loads(item.get('Skills', '[]')) if 'Skills' in item else []
+    }
 def upload_video_to_s3(file_obj, filename):
-    s3.upload_fileobj(
+    get_client('s3').upload_fileobj(
         file_obj,
         VIDEO_BUCKET,
         f"videos/{filename}",
@@ -187,6 +280,36 @@ def upload_video_to_s3(file_obj, filename):
     return f"https://{VIDEO_BUCKET}.s3.amazonaws.com/videos/{filename}"
 
 
+def video_key(analysis_id, filename):
+    return f"videos/{analysis_id}_{filename}"
+
+def video_metadata(analysis_id, email=None):
+    # analysisid links the S3 object to the app's record; email feeds the dashboard aggregates
+    metadata = {"analysisid": analysis_id}
+    if email:
+        metadata["useremail"] = email
+    return metadata
+
+def put_processing_record(analysis_id, key):
+    """Insert the PROCESSING row, unless a result for this id is already there."""
+    try:
+        get_table(VIDEO_TABLE).put_item(
+            Item={
+                "analysis_id": analysis_id,
+                "video_url": f"https://{VIDEO_BUCKET}.s3.amazonaws.com/{key}",
+                "status": "PROCESSING",
+                "skills": [],
+                "transcript": "",
+                "scores": {},
+                "timestamp": int(datetime.utcnow().timestamp())
+            },
+            ConditionExpression="attribute_not_exists(analysis_id)"
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+
 # ✅ Video Upload Endpoint
 @app.route("/api/upload_video", methods=["POST"])
 def upload_video():
@@ -199,68 +322,409 @@ def upload_video():
 
     try:
         analysis_id = str(uuid.uuid4())
-        unique_name = f"{analysis_id}_{file.filename}"
+        key = video_key(analysis_id, file.filename)
 
         # Upload video to S3
-        s3.upload_fileobj(
+        get_client('s3').upload_fileobj(
             file,
             VIDEO_BUCKET,
-            f"videos/{unique_name}",
-            ExtraArgs={"ContentType": file.content_type}
+            key,
+            ExtraArgs={"ContentType": file.content_type,
+                       "Metadata": video_metadata(analysis_id, request.args.get("email"))}
         )
-        video_url = f"https://{VIDEO_BUCKET}.s3.amazonaws.com/videos/{unique_name}"
 
         # Insert into DynamoDB with PROCESSING state
-        video_analysis_table.put_item(Item={
+        put_processing_record(analysis_id, key)
+
+        return jsonify({
             "analysis_id": analysis_id,
-            "video_url": video_url,
-            "status": "PROCESSING",
-            "skills": [],
-            "transcript": "",
-            "scores": {},
-            "timestamp": int(datetime.utcnow().timestamp())
-        })
+            "status": "PROCESSING"
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# -------------------------
+# Direct-to-S3 multipart video upload
+# -------------------------
+# The browser PUTs parts straight to S3 with presigned URLs (in parallel, and
+# resumable: uploaded parts are listed back from S3), so Flask only signs.
+
+VIDEO_PART_SIZE = 8 * 1024 * 1024  # bytes; S3 needs >= 5 MiB for every part but the last
+MAX_UPLOAD_PARTS = 10000           # S3 limit per multipart upload
+MAX_PRESIGN_PARTS = 100            # URLs signed per /parts request
+UPLOAD_URL_EXPIRY = 3600
+
+def multipart_params(data):
+    """Validate key/upload_id from a request body; the key must belong to the analysis id."""
+    key, upload_id = data.get("key"), data.get("upload_id")
+    analysis_id = data.get("analysis_id")
+    if not key or not upload_id or not analysis_id:
+        return None
+    if not key.startswith(f"videos/{analysis_id}_"):
+        return None
+    return key, upload_id, analysis_id
+
+def list_uploaded_parts(key, upload_id):
+    s3 = get_client('s3')
+    kwargs = {"Bucket": VIDEO_BUCKET, "Key": key, "UploadId": upload_id}
+    parts = []
+    while True:
+        response = s3.list_parts(**kwargs)
+        parts.extend(response.get("Parts", []))
+        if not response.get("IsTruncated"):
+            return parts
+        kwargs["PartNumberMarker"] = response["NextPartNumberMarker"]
+
+@app.route("/api/video_upload/initiate", methods=["POST"])
+def initiate_video_upload():
+    data = request.get_json() or {}
+    file_name = data.get("filename")
+    file_type = data.get("filetype")
+    try:
+        size = int(data.get("size", 0))
+    except (TypeError, ValueError):
+        size = 0
+    if not file_name or not file_type or size <= 0:
+        return jsonify({"error": "Missing filename, filetype or size"}), 400
+
+    # Grow the part size for very large files so the part count stays within S3's limit
+    part_size = max(VIDEO_PART_SIZE, -(-size // MAX_UPLOAD_PARTS))
+    try:
+        analysis_id = str(uuid.uuid4())
+        key = video_key(analysis_id, file_name)
+        upload = get_client('s3').create_multipart_upload(
+            Bucket=VIDEO_BUCKET,
+            Key=key,
+            ContentType=file_type,
+            Metadata=video_metadata(analysis_id, data.get("email"))
+        )
+        return jsonify({
+            "analysis_id": analysis_id,
+            "key": key,
+            "upload_id": upload["UploadId"],
+            "part_size": part_size,
+            "part_count": max(1, -(-size // part_size))
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/video_upload/parts", methods=["POST"])
+def presign_video_parts():
+    data = request.get_json() or {}
+    params = multipart_params(data)
+    part_numbers = data.get("part_numbers") or []
+    if not params or not part_numbers:
+        return jsonify({"error": "Missing key, upload_id, analysis_id or part_numbers"}), 400
+    if len(part_numbers) > MAX_PRESIGN_PARTS:
+        return jsonify({"error": f"At most {MAX_PRESIGN_PARTS} parts per request"}), 400
+    if not all(isinstance(n, int) and 1 <= n <= MAX_UPLOAD_PARTS for n in part_numbers):
+        return jsonify({"error": "Invalid part number"}), 400
+
+    key, upload_id, _ = params
+    try:
+        s3 = get_client('s3')
+        urls = {
+            str(number): s3.generate_presigned_url(
+                ClientMethod='upload_part',
+                Params={"Bucket": VIDEO_BUCKET, "Key": key, "UploadId": upload_id, "PartNumber": number},
+                ExpiresIn=UPLOAD_URL_EXPIRY
+            )
+            for number in part_numbers
+        }
+        return jsonify({"urls": urls}), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/video_upload/status", methods=["POST"])
+def video_upload_status():
+    """Parts S3 already has, so a dropped upload can resume where it stopped."""
+    params = multipart_params(request.get_json() or {})
+    if not params:
+        return jsonify({"error": "Missing key, upload_id or analysis_id"}), 400
+
+    key, upload_id, _ = params
+    try:
+        parts = list_uploaded_parts(key, upload_id)
+        return jsonify({"parts": [{"part_number": p["PartNumber"], "size": p["Size"]} for p in parts]}), 200
+
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'NoSuchUpload':
+            return jsonify({"error": "Upload not found"}), 404
+        return jsonify({"error": str(e)}), 500
+
+@app.route("/api/video_upload/complete", methods=["POST"])
+def complete_video_upload():
+    data = request.get_json() or {}
+    params = multipart_params(data)
+    if not params:
+        return jsonify({"error": "Missing key, upload_id or analysis_id"}), 400
+    expected = data.get("part_count")
+    if expected is not None and (isinstance(expected, bool) or not isinstance(expected, int)
+                                 or not 1 <= expected <= MAX_UPLOAD_PARTS):
+        return jsonify({"error": f"part_count must be an integer from 1 to {MAX_UPLOAD_PARTS}"}), 400
+
+    key, upload_id, analysis_id = params
+    try:
+        # ETags come from S3 itself, so the browser never needs to read response headers
+        parts = list_uploaded_parts(key, upload_id)
+        if not parts:
+            return jsonify({"error": "No parts uploaded"}), 400
+        if expected is not None:
+            missing = sorted(set(range(1, expected + 1)) - {p["PartNumber"] for p in parts})
+            if missing:
+                return jsonify({"error": "Parts missing", "missing": missing}), 409
+        get_client('s3').complete_multipart_upload(
+            Bucket=VIDEO_BUCKET,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": p["PartNumber"], "ETag": p["ETag"]} for p in parts]}
+        )
+
+        put_processing_record(analysis_id, key)
 
         return jsonify({
             "analysis_id": analysis_id,
             "status": "PROCESSING"
         }), 200
 
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'NoSuchUpload':
+            return jsonify({"error": "Upload not found"}), 404
+        return jsonify({"error": str(e)}), 500
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/api/video_upload/abort", methods=["POST"])
+def abort_video_upload():
+    params = multipart_params(request.get_json() or {})
+    if not params:
+        return jsonify({"error": "Missing key, upload_id or analysis_id"}), 400
 
+    key, upload_id, _ = params
+    try:
+        get_client('s3').abort_multipart_upload(Bucket=VIDEO_BUCKET, Key=key, UploadId=upload_id)
+        return jsonify({"status": "ABORTED"}), 200
+
+    except ClientError as e:
+        # Aborting twice is fine
+        if e.response['Error']['Code'] == 'NoSuchUpload':
+            return jsonify({"status": "ABORTED"}), 200
+        return jsonify({"error": str(e)}), 500
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-from decimal import Decimal
 
-def decimal_to_float(obj):
-    """Helper to convert DynamoDB Decimal types to float"""
-    if isinstance(obj, list):
-        return [decimal_to_float(i) for i in obj]
-    elif isinstance(obj, dict):
-        return {k: decimal_to_float(v) for k, v in obj.items()}
-    elif isinstance(obj, Decimal):
-        return float(obj)
-    return obj
+MAX_RESULT_FIELDS = 20
+
+def requested_fields():
+    """Top-level attributes named in ?fields=a,b,c, or None for the whole item."""
+    fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+    return list(dict.fromkeys(fields)) or None
 
 @app.route("/api/video_result", methods=["GET"])
 def video_result():
+    """
+    Interview analysis result. Long transcripts are stored in S3 and the row
+    only carries a preview in transcript; ?fields=transcript,scores,...
+    returns just those attributes, with the full transcript fetched from S3.
+    """
     analysis_id = request.args.get("analysis_id")
     if not analysis_id:
         return jsonify({"error": "Missing analysis_id"}), 400
+    fields = requested_fields()
+    if fields and len(fields) > MAX_RESULT_FIELDS:
+        return jsonify({"error": f"At most {MAX_RESULT_FIELDS} fields per request"}), 400
 
     try:
-        resp = video_analysis_table.get_item(Key={"analysis_id": analysis_id})
-        item = resp.get("Item")
+        # One cached copy of the row, whichever fields are asked for; it is small
+        # because long transcripts are offloaded
+        item = result_cache.get(
+            f"video:{analysis_id}",
+            lambda: fetch_video_item(analysis_id),
+            lambda value: None if value and video_finished(value) else PENDING_CACHE_TTL
+        )
         if not item:
             return jsonify({"error": "Analysis not found"}), 404
+        if not fields:
+            return jsonify(item), 200
+
+        result = {name: item[name] for name in fields if name in item}
+        if "transcript" in fields and item.get("transcript_s3"):
+            # Written once, before the row points at it
+            result["transcript"] = result_cache.get(
+                f"transcript:{analysis_id}", lambda: read_transcript(get_client('s3'), item["transcript_s3"]),
+                lambda value: None
+            )
+        return jsonify(result), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+MAX_BATCH_LOOKUP = 500  # ids per /api/candidates/batch request, per kind
+
+@app.route("/api/candidates/batch", methods=["POST"])
+def candidates_batch():
+    """
+    Looks up many candidates in one round trip.
+    Body: {"resume_ids": [...], "analysis_ids": [...]}; both tables are read
+    concurrently with BatchGetItem. Ids that are not found come back as null.
+    """
+    data = request.get_json(silent=True)
+    data = data if isinstance(data, dict) else {}
+    id_lists = [data.get("resume_ids") or [], data.get("analysis_ids") or []]
+    if not all(isinstance(ids, list) and all(isinstance(i, str) and i for i in ids) for ids in id_lists):
+        return jsonify({"error": "resume_ids and analysis_ids must be lists of strings"}), 400
+    resume_ids, analysis_ids = (list(dict.fromkeys(ids)) for ids in id_lists)
+    if not resume_ids and not analysis_ids:
+        return jsonify({"error": "Missing resume_ids or analysis_ids"}), 400
+    if len(resume_ids) > MAX_BATCH_LOOKUP or len(analysis_ids) > MAX_BATCH_LOOKUP:
+        return jsonify({"error": f"At most {MAX_BATCH_LOOKUP} ids of each kind per request"}), 400
+
+    try:
+        dynamodb = get_resource('dynamodb')
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            resumes = pool.submit(
+                batch_get_items, dynamodb, RESUME_TABLE, [{'ResumeID': i} for i in resume_ids]
+            )
+            videos = pool.submit(
+                batch_get_items, dynamodb, VIDEO_TABLE, [{'analysis_id': i} for i in analysis_ids]
+            )
+            resume_items, resume_unprocessed = resumes.result()
+            video_items, video_unprocessed = videos.result()
+
+        found_resumes = {item['ResumeID']: resume_payload(item) for item in resume_items}
+        found_videos = {item['analysis_id']: item for item in video_items}
+        return jsonify({
+            "resumes": {i: found_resumes.get(i) for i in resume_ids},
+            "videos": {i: found_videos.get(i) for i in analysis_ids},
+            # Keys DynamoDB kept throttling after every retry; the client may ask again
+            "unprocessed": {
+                "resume_ids": [key['ResumeID'] for key in resume_unprocessed],
+                "analysis_ids": [key['analysis_id'] for key in video_unprocessed]
+            }
+        }), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+MAX_TOP_K = 100
+
+@app.route("/api/candidates/top", methods=["GET"])
+def top_candidates_for_skills():
+    """
+    Best candidates for a skill set, from the skill inverted index.
+    Query: skills=Python,Kubernetes,AWS&k=10. Ranked by number of skills
+    matched, then by resume Score.
+    """
+    skills = [s for s in request.args.get("skills", "").split(",") if s.strip()]
+    if not skills:
+        return jsonify({"error": "Missing skills"}), 400
+    try:
+        k = int(request.args.get("k", 10))
+    except ValueError:
+        return jsonify({"error": "k must be an integer"}), 400
+    if not 1 <= k <= MAX_TOP_K:
+        return jsonify({"error": f"k must be between 1 and {MAX_TOP_K}"}), 400
 
-        return jsonify(decimal_to_float(item)), 200
+    try:
+        index_table = get_table(SKILL_INDEX_TABLE)
+        candidates = top_candidates(lambda skill: query_postings(index_table, skill), skills, k)
+        return jsonify({"skills": skills, "candidates": candidates}), 200
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# -------------------------
+# Push-based result delivery
+# -------------------------
+
+RESULT_WAIT_SECONDS = 25      # long-poll hold time, below typical proxy timeouts
+RESULT_STREAM_SECONDS = 25    # lifetime of one SSE connection; the client reconnects
+RESULT_HEARTBEAT_SECONDS = 15
+
+def fetch_resume_item(resume_id):
+    return get_table(RESUME_TABLE).get_item(Key={'ResumeID': resume_id}).get('Item')
+
+def fetch_video_item(analysis_id):
+    return get_table(VIDEO_TABLE).get_item(Key={"analysis_id": analysis_id}).get('Item')
+
+def video_finished(item):
+    return item.get("status") in ("COMPLETED", "FAILED")
+
+# One shared backend read loop per id, however many browsers are waiting on it
+RESULT_WATCHERS = {
+    "resume": (ResultWatcher(fetch_resume_item, lambda item: True), resume_payload),
+    "video": (ResultWatcher(fetch_video_item, video_finished), lambda item: item),
+}
+
+def watch_params():
+    kind = request.args.get("kind")
+    result_id = request.args.get("id")
+    if kind not in RESULT_WATCHERS or not result_id:
+        return None, None
+    return kind, result_id
+
+@app.route("/api/wait_result", methods=["GET"])
+def wait_result():
+    """
+    Long-poll: holds the request until the resume/video analysis is done
+    or the wait times out (202, the client simply asks again).
+    """
+    kind, result_id = watch_params()
+    if not kind:
+        return jsonify({"error": "Missing or invalid kind/id"}), 400
+
+    try:
+        timeout = float(request.args.get("timeout", RESULT_WAIT_SECONDS))
+    except ValueError:
+        return jsonify({"error": "timeout must be a number"}), 400
+    if not timeout >= 0:  # also rejects NaN
+        return jsonify({"error": "timeout must not be negative"}), 400
+
+    watcher, payload = RESULT_WATCHERS[kind]
+    item = watcher.wait(result_id, min(timeout, RESULT_WAIT_SECONDS))
+    if item is None:
+        return jsonify({"status": "PENDING"}), 202
+    return jsonify({"status": "COMPLETED", "result": payload(item)}), 200
+
+@app.route("/api/result_stream", methods=["GET"])
+def result_stream():
+    """
+    Server-Sent Events: sends one `result` event when the analysis is done,
+    with heartbeat comments in between. Connections are kept short so they
+    do not hold a sync worker: after RESULT_STREAM_SECONDS a `reconnect`
+    event tells the client to open a new one.
+    """
+    kind, result_id = watch_params()
+    if not kind:
+        return jsonify({"error": "Missing or invalid kind/id"}), 400
+
+    watcher, payload = RESULT_WATCHERS[kind]
+
+    def events():
+        deadline = time.monotonic() + RESULT_STREAM_SECONDS
+        while time.monotonic() < deadline:
+            item = watcher.wait(result_id, min(deadline - time.monotonic(), RESULT_HEARTBEAT_SECONDS))
+            if item is not None:
+                yield f"event: result\ndata: {app.json.dumps(payload(item))}\n\n"
+                return
+            yield ": waiting\n\n"
+        yield "event: reconnect\ndata: {}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # -------------------------
 # Dashboard API Endpoints
 # -------------------------
@@ -268,38 +732,16 @@ def video_result():
 @app.route("/api/dashboard_stats", methods=["GET"])
 def dashboard_stats():
     """
-    Returns actual dashboard stats from DynamoDB.
-    Assumes 'HireFusionTable' has resume and video records.
+    Returns dashboard stats from the user's aggregate record in DynamoDB.
+    The record is kept up to date by the analysis Lambdas (see dashboard_stats.py).
     """
     email = request.args.get("email")
     if not email:
         return jsonify({"error": "Missing email"}), 400
 
     try:
-        # Query all items for this user
-        response = table.query(
-            KeyConditionExpression=Key('email').eq(email)
-        )
-        items = response.get("Items", [])
-
-        # Separate resume and video records
-        resume_items = [i for i in items if i.get("type") == "resume"]
-        video_items = [i for i in items if i.get("type") == "video"]
-
-        stats = {
-            "resumeCount": len(resume_items),
-            "resumeAvgScore": (
-                sum(int(i.get("score", 0)) for i in resume_items) / len(resume_items)
-                if resume_items else 0
-            ),
-            "videoCount": len(video_items),
-            "videoAvgScore": (
-                sum(int(i.get("score", 0)) for i in video_items) / len(video_items)
-                if video_items else 0
-            )
-        }
-
-        return jsonify(stats)
+        response = get_table(STATS_TABLE).get_item(Key={'email': email})
+        return jsonify(stats_from_record(response.get("Item")))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -314,23 +756,37 @@ def user_details():
         return jsonify({"error": "Missing email"}), 400
 
     try:
-        response = table.get_item(Key={'email': email})
-        user = response.get("Item")
-        if not user:
+        def load():
+            user = get_table(USERS_TABLE).get_item(Key={'email': email}).get("Item")
+            if not user:
+                return None
+            return {
+                "full_name": user.get("full_name"),
+                "email": user.get("email"),
+                "phone": user.get("phone"),
+                "username": user.get("username"),
+                "date_of_birth": user.get("date_of_birth"),
+                "gender": user.get("gender")
+            }
+
+        # /register invalidates this worker's copy; unknown emails are not cached
+        details = result_cache.get(f"user:{email}", load, lambda value: MUTABLE_CACHE_TTL if value else 0)
+        if not details:
             return jsonify({"error": "User not found"}), 404
 
-        return jsonify({
-            "full_name": user.get("full_name"),
-            "email": user.get("email"),
-            "phone": user.get("phone"),
-            "username": user.get("username"),
-            "date_of_birth": user.get("date_of_birth"),
-            "gender": user.get("gender")
-        })
+        return jsonify(details)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/cache_stats", methods=["GET"])
+@require_admin
+def cache_stats():
+    """
+    Hit/miss counters and size of the read-through result cache.
+    """
+    return jsonify(result_cache.stats())
+
 
 if __name__ == "__main__":
     app.run(host='0.0.0.0', port=5000)
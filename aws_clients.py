@@ -0,0 +1,76 @@
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+
+AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
+# One urllib3 pool per service, shared by every thread of the worker
+MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '50'))
+TCP_KEEPALIVE = os.environ.get('AWS_TCP_KEEPALIVE', 'true').lower() == 'true'
+
+# Services whose low-level client is taken from the resource, so both share a pool
+_RESOURCE_BACKED = {'dynamodb'}
+
+_lock = threading.Lock()
+_session = None
+_clients = {}
+_resources = {}
+_tables = {}
+
+
+def _config():
+    return Config(
+        region_name=AWS_REGION,
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        tcp_keepalive=TCP_KEEPALIVE,
+        retries={'mode': 'standard'}
+    )
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        _session = boto3.session.Session()
+    return _session
+
+
+def get_resource(service):
+    """Return the shared boto3 resource for service, creating it on first use."""
+    resource = _resources.get(service)
+    if resource is None:
+        # Session/client construction is not thread-safe, so it happens under the lock
+        with _lock:
+            resource = _resources.get(service)
+            if resource is None:
+                resource = _get_session().resource(service, config=_config())
+                _resources[service] = resource
+    return resource
+
+
+def get_client(service):
+    """Return the shared low-level client for service, creating it on first use."""
+    client = _clients.get(service)
+    if client is None:
+        if service in _RESOURCE_BACKED:
+            client = get_resource(service).meta.client
+        else:
+            with _lock:
+                client = _clients.get(service)
+                if client is None:
+                    client = _get_session().client(service, config=_config())
+        _clients[service] = client
+    return client
+
+
+def get_table(name):
+    """Return a cached DynamoDB Table bound to the shared dynamodb resource."""
+    table = _tables.get(name)
+    if table is None:
+        resource = get_resource('dynamodb')
+        with _lock:
+            table = _tables.get(name)
+            if table is None:
+                table = resource.Table(name)
+                _tables[name] = table
+    return table
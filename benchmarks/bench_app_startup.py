@@ -0,0 +1,88 @@
+"""
+Import-time and first-request benchmark for app.py.
+
+Each run is a fresh interpreter (like a new gunicorn worker). DynamoDB is
+served by a local HTTP stand-in through AWS_ENDPOINT_URL, so no AWS
+account is needed. Pass --app to time another copy of app.py (e.g. one
+checked out from an older commit) for a before/after comparison.
+
+    python benchmarks/bench_app_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CHILD = r'''
+import http.server, importlib.util, json, os, sys, threading, time
+
+class DynamoStandIn(http.server.BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps({"Item": {"email": {"S": "a@b.c"}, "full_name": {"S": "Bench"}}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-amz-json-1.0')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), DynamoStandIn)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+os.environ['AWS_ENDPOINT_URL'] = f'http://127.0.0.1:{server.server_port}'
+
+sys.path.insert(0, os.path.dirname(sys.argv[1]))
+sys.path.insert(0, sys.argv[2])
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location('app_under_test', sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+imported = time.perf_counter()
+
+client = module.app.test_client()
+first = client.get('/api/user_details?email=a@b.c')
+first_done = time.perf_counter()
+second = client.get('/api/user_details?email=a@b.c')
+second_done = time.perf_counter()
+assert first.status_code == 200 and second.status_code == 200, first.get_data(as_text=True)
+
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'first_request_ms': (first_done - imported) * 1000,
+    'warm_request_ms': (second_done - first_done) * 1000,
+}))
+'''
+
+
+def run_once(app_path):
+    env = dict(os.environ)
+    env.setdefault('AWS_ACCESS_KEY_ID', 'bench')
+    env.setdefault('AWS_SECRET_ACCESS_KEY', 'bench')
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD, os.path.abspath(app_path), os.path.abspath(ROOT)],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--app', default=os.path.join(ROOT, 'app.py'))
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [run_once(args.app) for _ in range(args.runs)]
+    print(f"{args.app} ({args.runs} fresh interpreters, median)")
+    for metric in ('import_ms', 'first_request_ms', 'warm_request_ms'):
+        print(f"  {metric:>18}: {statistics.median(s[metric] for s in samples):8.1f}")
+
+
+if __name__ == '__main__':
+    main()
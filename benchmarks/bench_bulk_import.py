@@ -0,0 +1,82 @@
+"""
+Bulk candidate import throughput: one put_item per candidate (what
+/register costs per row) vs. bulk_import's batched, pipelined,
+conditional writes.
+
+DynamoDB is the in-process stand-in from fakes.py with a fixed per-call
+latency, and a share of the batched calls throttled to exercise retries.
+The input repeats a few emails, which come back as conflicts.
+
+    python benchmarks/bench_bulk_import.py --rows 5000 --latency-ms 8
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bulk_import import USERS_TABLE, import_rows, read_rows  # noqa: E402
+from fakes import FakeDynamoDB  # noqa: E402
+
+
+def make_csv(rows):
+    lines = ["email,full_name,username,phone,gender"]
+    for n in range(rows):
+        lines.append(f"cand{n}@campus.edu,Candidate {n},cand{n},555-{n:04d},F")
+    lines.append("not-an-email,Broken Row,broken,,")
+    lines.extend(f"cand{n}@campus.edu,Duplicate {n},dup{n},,M" for n in range(min(rows, 5)))
+    return "\n".join(lines) + "\n"
+
+
+def run_put_item(data, latency_ms):
+    # Later duplicates overwrite, as repeated /register calls do
+    dynamodb = FakeDynamoDB({USERS_TABLE: ['email']}, latency_ms=latency_ms)
+    table = dynamodb.Table(USERS_TABLE)
+    for _, record, _ in read_rows(io.StringIO(data), 'csv'):
+        if '@' in record['email']:
+            table.put_item(Item=dict(record))
+    return dynamodb
+
+
+def run_bulk(data, latency_ms, throttle_rate, workers):
+    dynamodb = FakeDynamoDB({USERS_TABLE: ['email']}, latency_ms=latency_ms, throttle_rate=throttle_rate, seed=1)
+    results = list(import_rows(read_rows(io.StringIO(data), 'csv'), dynamodb, USERS_TABLE, workers))
+    return dynamodb, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--latency-ms', type=float, default=8.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.05)
+    args = parser.parse_args()
+
+    data = make_csv(args.rows)
+    print(f"{args.rows:,} rows, {args.latency_ms} ms per call, "
+          f"{args.throttle_rate:.0%} of batched calls throttled")
+    print(f"{'mode':<22} {'seconds':>8} {'rows/s':>9} {'calls':>7} {'written':>8} {'conflicts':>9} {'errors':>7}")
+
+    start = time.perf_counter()
+    dynamodb = run_put_item(data, args.latency_ms)
+    elapsed = time.perf_counter() - start
+    written = len(dynamodb.tables[USERS_TABLE].items)
+    print(f"{'put_item per row':<22} {elapsed:>8.2f} {args.rows / elapsed:>9.0f} "
+          f"{sum(dynamodb.calls.values()):>7} {written:>8} {'-':>9} {'-':>7}")
+
+    for workers in (1, 4, 8):
+        start = time.perf_counter()
+        dynamodb, results = run_bulk(data, args.latency_ms, args.throttle_rate, workers)
+        elapsed = time.perf_counter() - start
+        written = len(dynamodb.tables[USERS_TABLE].items)
+        conflicts = sum(r['status'] == 'conflict' for r in results)
+        errors = sum(r['status'] == 'error' for r in results)
+        assert len(results) == args.rows + 1 + conflicts and written == args.rows
+        assert all(item['username'].startswith('cand') for item in dynamodb.tables[USERS_TABLE].items.values())
+        print(f"{f'bulk, {workers} in flight':<22} {elapsed:>8.2f} {args.rows / elapsed:>9.0f} "
+              f"{sum(dynamodb.calls.values()):>7} {written:>8} {conflicts:>9} {errors:>7}")
+
+
+if __name__ == '__main__':
+    main()
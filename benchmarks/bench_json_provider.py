@@ -0,0 +1,85 @@
+"""
+Serializing large DynamoDB items: decimal_to_float copy + jsonify (old
+/api/video_result path) vs. jsonify through DynamoJSONProvider.
+
+Items mimic finished interview analyses: a long inline transcript plus
+per-second score maps, every number a Decimal as boto3 returns it.
+
+    python benchmarks/bench_json_provider.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import Flask, jsonify  # noqa: E402
+
+from dynamo_json import DynamoJSONProvider  # noqa: E402
+
+WORDS = "we deployed the service on kubernetes and cut the p99 latency by half".split()
+
+
+def decimal_to_float(obj):
+    # The helper app.py used before DynamoJSONProvider
+    if isinstance(obj, list):
+        return [decimal_to_float(i) for i in obj]
+    elif isinstance(obj, dict):
+        return {k: decimal_to_float(v) for k, v in obj.items()}
+    elif isinstance(obj, Decimal):
+        return float(obj)
+    return obj
+
+
+def make_item(transcript_words, seconds, rng):
+    def score():
+        return Decimal(str(round(rng.uniform(0, 100), 2)))
+
+    return {
+        'analysis_id': 'bench',
+        'Status': 'COMPLETED',
+        'TotalScore': score(),
+        'Transcript': " ".join(rng.choice(WORDS) for _ in range(transcript_words)),
+        'Timeline': [
+            {'Second': Decimal(s), 'Facial': score(), 'Gesture': score(),
+             'Emotions': {e: score() for e in ('HAPPY', 'CALM', 'CONFUSED', 'SURPRISED')}}
+            for s in range(seconds)
+        ],
+        'SentimentScore': {k: score() for k in ('Positive', 'Negative', 'Neutral', 'Mixed')},
+    }
+
+
+def measure(app, fn, repeat):
+    with app.test_request_context():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best * 1000, peak / 1024
+
+
+def main():
+    rng = random.Random(3)
+    legacy_app = Flask('legacy')
+    provider_app = Flask('provider')
+    provider_app.json = DynamoJSONProvider(provider_app)
+
+    print(f"{'transcript':>10} {'timeline':>9} {'copy ms':>8} {'direct ms':>10} {'copy KiB':>9} {'direct KiB':>11}")
+    for words, seconds in ((2_000, 120), (20_000, 900), (60_000, 3_600)):
+        item = make_item(words, seconds, rng)
+        repeat = 20 if seconds < 1000 else 5
+        copy_ms, copy_kib = measure(legacy_app, lambda: jsonify(decimal_to_float(item)), repeat)
+        direct_ms, direct_kib = measure(provider_app, lambda: jsonify(item), repeat)
+        print(f"{words:>10} {seconds:>9} {copy_ms:>8.1f} {direct_ms:>10.1f} {copy_kib:>9.0f} {direct_kib:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Segmented transcription: one whole-file job vs. silence-split segments
+transcribed concurrently, on generated audio with a fake transcriber.
+
+The audio is a run of "words": sine bursts whose frequency encodes the
+word, with short gaps inside sentences and longer pauses between them.
+The fake transcriber only sees a WAV file. It finds the bursts, decodes
+each word from its zero crossings, and sleeps in proportion to the audio
+length, like a real job. The words recovered and the worst start-time drift
+against what was generated are reported; tests/test_segmented_transcribe.py
+holds the split/merge correctness checks.
+
+    python benchmarks/bench_segmented_transcribe.py --minutes 20 --target 120
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from segmented_transcribe import find_silences, read_wav, transcribe_wav, write_wav  # noqa: E402
+
+RATE = 16000
+VOCABULARY = ("i built designed a project during my internship and the experience with cloud "
+              "certification developed services team data pipeline api platform").split()
+BASE_HZ, STEP_HZ = 300, 25  # word n is a BASE_HZ + n * STEP_HZ tone
+DECODE_MS = 100
+
+
+def generate_audio(minutes, rng):
+    """Return (samples, words) where words are (word, start, end) in seconds."""
+    samples, words = array('h'), []
+    noise = lambda count: array('h', (rng.randint(-60, 60) for _ in range(count)))  # noqa: E731
+    while len(samples) < minutes * 60 * RATE:
+        for _ in range(rng.randint(4, 14)):
+            n = rng.randrange(len(VOCABULARY))
+            length = int(rng.uniform(0.2, 0.5) * RATE)
+            step = 2 * math.pi * (BASE_HZ + n * STEP_HZ) / RATE
+            start = len(samples)
+            samples.extend(int(8000 * math.sin(step * i)) for i in range(length))
+            words.append((VOCABULARY[n], start / RATE, len(samples) / RATE))
+            samples.extend(noise(int(rng.uniform(0.06, 0.15) * RATE)))  # gap between words
+        samples.extend(noise(int(rng.uniform(0.5, 1.5) * RATE)))  # pause between sentences
+    return samples, words
+
+
+def fake_transcribe_file(path, realtime_factor, job_overhead):
+    """Decode a WAV the way the generator encoded it; output has Transcribe's shape."""
+    samples, rate = read_wav(path)
+    duration = len(samples) / rate
+    time.sleep(job_overhead + duration * realtime_factor)
+
+    # Speech is whatever lies between the gaps
+    gaps = find_silences(samples, rate, min_ms=40, frame_ms=10)
+    edges = [0.0] + [t for gap in gaps for t in gap] + [duration]
+    items = []
+    for start, end in zip(edges[0::2], edges[1::2]):
+        if end - start < 0.1:
+            continue
+        # Skip the frame edge, which can still hold some of the gap's noise
+        first = int((start + 0.02) * rate)
+        window = samples[first:first + rate * DECODE_MS // 1000]
+        crossings = sum((a < 0) != (b < 0) for a, b in zip(window, window[1:]))
+        hz = crossings * 1000 / (2 * DECODE_MS)
+        word = VOCABULARY[max(0, min(len(VOCABULARY) - 1, round((hz - BASE_HZ) / STEP_HZ)))]
+        items.append({'start_time': f"{start:.3f}", 'end_time': f"{end:.3f}", 'type': 'pronunciation',
+                      'alternatives': [{'confidence': '0.99', 'content': word}]})
+    text = " ".join(item['alternatives'][0]['content'] for item in items)
+    return {'results': {'transcripts': [{'transcript': text}], 'items': items}}
+
+
+def check(merged, words):
+    items = merged['results']['items']
+    recovered = [item['alternatives'][0]['content'] for item in items]
+    matched = sum(a == b[0] for a, b in zip(recovered, words))
+    drift = max((abs(float(item['start_time']) - word[1]) for item, word in zip(items, words)), default=0.0)
+    return len(items), matched, drift
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--minutes', type=float, default=20)
+    parser.add_argument('--target', type=float, default=120, help="target segment length, seconds")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--realtime-factor', type=float, default=0.005, help="job seconds per audio second")
+    parser.add_argument('--job-overhead', type=float, default=0.5, help="queueing seconds per job")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    samples, words = generate_audio(args.minutes, rng)
+    transcribe = lambda segment: fake_transcribe_file(  # noqa: E731
+        segment['path'], args.realtime_factor, args.job_overhead)
+
+    with tempfile.TemporaryDirectory() as work:
+        wav_path = os.path.join(work, 'interview.wav')
+        write_wav(wav_path, samples, RATE)
+        print(f"{len(samples) / RATE / 60:.1f} min of audio, {len(words)} words, "
+              f"{args.realtime_factor * 60:.2f} s per audio minute + {args.job_overhead} s per job")
+        print(f"{'mode':<28} {'segments':>8} {'seconds':>8} {'words':>7} {'correct':>8} {'max drift ms':>13}")
+
+        start = time.perf_counter()
+        whole = fake_transcribe_file(wav_path, args.realtime_factor, args.job_overhead)
+        elapsed = time.perf_counter() - start
+        found, matched, drift = check(whole, words)
+        print(f"{'one job':<28} {1:>8} {elapsed:>8.2f} {found:>7} {matched:>8} {drift * 1000:>13.1f}")
+
+        start = time.perf_counter()
+        merged, segments = transcribe_wav(wav_path, transcribe, args.workers, target=args.target,
+                                          max_length=args.target * 1.4, min_length=args.target * 0.2)
+        elapsed = time.perf_counter() - start
+        found, matched, drift = check(merged, words)
+        label = f"segmented, {args.workers} concurrent"
+        print(f"{label:<28} {len(segments):>8} {elapsed:>8.2f} {found:>7} {matched:>8} {drift * 1000:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Timing comparison for long-transcript sentiment against a local Comprehend
+stand-in: one detect_sentiment call per chunk in sequence vs. the batched,
+concurrent detect_transcript_sentiment.
+
+    python benchmarks/bench_sentiment.py --latency-ms 80
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fakes import FakeComprehend  # noqa: E402
+from transcript_sentiment import chunk_text, combine_sentiments, detect_transcript_sentiment  # noqa: E402
+
+SENTENCES = [
+    "I really enjoyed leading the migration project.",
+    "It was difficult at first because the legacy system kept failing.",
+    "We built monitoring and the team was proud of the result.",
+    "My internship taught me how to work with stakeholders.",
+    "Honestly the deadline was a problem but we shipped on time.",
+]
+
+
+def make_transcript(minutes, rng):
+    # Roughly 150 spoken words per minute, about 9 words per sentence
+    return " ".join(rng.choice(SENTENCES) for _ in range(minutes * 17))
+
+
+def sequential(comprehend, text):
+    chunks = chunk_text(text)
+    results = [comprehend.detect_sentiment(Text=chunk, LanguageCode='en') for chunk in chunks]
+    return combine_sentiments(results, [len(c.encode('utf-8')) for c in chunks])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--latency-ms', type=float, default=80.0, help='simulated Comprehend call latency')
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    comprehend = FakeComprehend(latency_ms=args.latency_ms)
+    print(f"{'minutes':>8} {'chunks':>7} {'sequential ms':>14} {'batched ms':>11} {'label':>9}")
+    for minutes in (10, 60, 180):
+        text = make_transcript(minutes, rng)
+
+        start = time.perf_counter()
+        expected = sequential(comprehend, text)
+        sequential_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        result = detect_transcript_sentiment(comprehend, text)
+        batched_ms = (time.perf_counter() - start) * 1000
+
+        assert result['Sentiment'] == expected['Sentiment']
+        print(f"{minutes:>8} {result['ChunkCount']:>7} {sequential_ms:>14.1f} {batched_ms:>11.1f} {result['Sentiment']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark: per-keyword substring scan vs. the compiled SkillMatcher.
+
+    python benchmarks/bench_skill_matcher.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from resume_scoring import SKILL_KEYWORDS  # noqa: E402
+from skill_matcher import SkillMatcher  # noqa: E402
+
+FILLER = (
+    "Responsible for designing and delivering features across the platform team. "
+    "Collaborated with stakeholders, mentored junior engineers and improved reliability. "
+)
+
+
+def legacy_scan(skills, text):
+    return list(set(skill for skill in skills if skill.lower() in text.lower()))
+
+
+def make_text(pages, skills, rng):
+    # Roughly 3,000 characters per page with a few skills sprinkled in
+    parts = []
+    for _ in range(pages):
+        page = []
+        while sum(len(p) for p in page) < 3000:
+            page.append(FILLER)
+            page.append(rng.choice(skills) + ", ")
+        parts.append("".join(page))
+    return "\n".join(parts)
+
+
+def make_taxonomy(size, rng):
+    taxonomy = list(SKILL_KEYWORDS)
+    while len(taxonomy) < size:
+        word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 12)))
+        taxonomy.append(word.capitalize())
+    return taxonomy
+
+
+def timeit(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'taxonomy':>9} {'pages':>6} {'legacy ms':>10} {'matcher ms':>11} {'build ms':>9}")
+    for size in (len(SKILL_KEYWORDS), 1000, 5000):
+        taxonomy = make_taxonomy(size, rng)
+        build_ms = timeit(lambda: SkillMatcher(taxonomy), 1)
+        matcher = SkillMatcher(taxonomy)
+        for pages in (2, 50):
+            text = make_text(pages, taxonomy, rng)
+            repeat = 5 if pages > 2 or size > 1000 else 20
+            legacy_ms = timeit(lambda: legacy_scan(taxonomy, text), repeat)
+            matcher_ms = timeit(lambda: matcher.find_all(text), repeat)
+            print(f"{size:>9} {pages:>6} {legacy_ms:>10.2f} {matcher_ms:>11.2f} {build_ms:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
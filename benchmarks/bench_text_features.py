@@ -0,0 +1,73 @@
+"""
+Benchmark: repeated lower()/count() transcript scoring vs. extract_text_features.
+
+    python benchmarks/bench_text_features.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from text_features import extract_text_features  # noqa: E402
+
+KEYWORDS = ["experience", "project", "internship", "developed", "built", "designed", "certification"]
+VOCABULARY = (
+    "so I worked on the backend team and we shipped features every sprint "
+    "my last project was a data pipeline I built and designed during an internship "
+    "where I developed dashboards and earned a cloud certification and certificate "
+    "the industry experience taught me about reliability ownership and communication"
+).split()
+WORDS_PER_MINUTE = 150
+
+
+def legacy_features(transcript_text):
+    # The counts video_resume_lambda_2 computed before the shared extractor
+    word_count = len(transcript_text.split())
+    keyword_hits = sum(transcript_text.lower().count(word) for word in KEYWORDS)
+    projects = transcript_text.lower().count("project")
+    internships = transcript_text.lower().count("internship")
+    certifications = len(re.findall(r"certification|certificate", transcript_text.lower()))
+    return word_count, keyword_hits, projects, internships, certifications
+
+
+def shared_features(transcript_text):
+    features = extract_text_features(transcript_text)
+    return (
+        features["word_count"],
+        sum(features[word] for word in KEYWORDS),
+        features["project"],
+        features["internship"],
+        features["certification"] + features["certificate"],
+    )
+
+
+def make_transcript(minutes, rng):
+    words = (rng.choice(VOCABULARY) for _ in range(minutes * WORDS_PER_MINUTE))
+    return " ".join(w.capitalize() if rng.random() < 0.1 else w for w in words)
+
+
+def timeit(fn, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{'minutes':>8} {'chars':>9} {'legacy ms':>10} {'shared ms':>10} {'speedup':>8}")
+    for minutes in (5, 30, 60, 180):
+        text = make_transcript(minutes, rng)
+        assert legacy_features(text) == shared_features(text), "scores diverged"
+        legacy_ms = timeit(legacy_features, text, 20)
+        shared_ms = timeit(shared_features, text, 20)
+        print(f"{minutes:>8} {len(text):>9} {legacy_ms:>10.2f} {shared_ms:>10.2f} {legacy_ms / shared_ms:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Memory benchmark: json.loads(response.read()) vs. stream_transcript on a
+synthetic Amazon Transcribe output file, measured with tracemalloc.
+
+    python benchmarks/bench_transcript_stream.py --minutes 60
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from transcript_stream import stream_transcript  # noqa: E402
+
+VOCABULARY = "so I worked on the backend project and we built a data pipeline during my internship".split()
+
+
+def write_transcript_file(path, minutes, rng):
+    # Same layout as Transcribe output: transcripts first, then one item per word
+    words, items, t = [], [], 0.0
+    for _ in range(minutes * 150):
+        word = rng.choice(VOCABULARY)
+        words.append(word)
+        items.append({
+            "start_time": f"{t:.3f}", "end_time": f"{t + 0.32:.3f}",
+            "alternatives": [{"confidence": f"{rng.uniform(0.8, 1):.4f}", "content": word}],
+            "type": "pronunciation"
+        })
+        t += 0.4
+    document = {
+        "jobName": "bench", "accountId": "000000000000", "status": "COMPLETED",
+        "results": {"transcripts": [{"transcript": " ".join(words)}], "items": items}
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f)
+    return " ".join(words)
+
+
+def load_whole(path):
+    with open(path, 'rb') as response:
+        data = json.loads(response.read().decode('utf-8'))
+    return data['results']['transcripts'][0]['transcript'] if data['results']['transcripts'] else ""
+
+
+def load_streamed(path, with_words=False):
+    with open(path, 'rb') as response:
+        return stream_transcript(response, with_words=with_words)[0]
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / (1024 * 1024), elapsed_ms
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--minutes', type=int, nargs='+', default=[10, 60, 120])
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    print(f"{'minutes':>8} {'file MB':>8} {'mode':>16} {'peak MB':>8} {'ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in args.minutes:
+            path = os.path.join(tmp, f'transcript_{minutes}.json')
+            expected = write_transcript_file(path, minutes, rng)
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            for label, fn, extra in (
+                ('json.loads', load_whole, ()),
+                ('stream', load_streamed, ()),
+                ('stream+words', load_streamed, (True,)),
+            ):
+                text, peak_mb, elapsed_ms = measure(fn, path, *extra)
+                assert text == expected
+                print(f"{minutes:>8} {size_mb:>8.2f} {label:>16} {peak_mb:>8.2f} {elapsed_ms:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
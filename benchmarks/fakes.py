@@ -0,0 +1,714 @@
+"""
+In-process stand-ins for the AWS services HireFusion calls, used by the
+benchmarks. Each fake can inject per-call latency and throttling errors.
+FakeAWS bundles one of each behind the boto3 client()/resource() calls.
+"""
+import contextlib
+import hashlib
+import io
+import json
+import operator
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+
+def client_error(code, operation, message=''):
+    return ClientError({'Error': {'Code': code, 'Message': message or code}}, operation)
+
+
+class FakeService:
+    THROTTLE_CODE = 'ThrottlingException'
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, throttle_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.throttle_rate = throttle_rate
+        self.calls = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _call(self, operation):
+        with self._lock:
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+            delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+            throttled = self._rng.random() < self.throttle_rate
+        if delay:
+            time.sleep(delay / 1000)
+        if throttled:
+            raise client_error(self.THROTTLE_CODE, operation, 'Rate exceeded')
+
+
+class FakeComprehend(FakeService):
+    MAX_BYTES = 5000
+    MAX_BATCH = 25
+    POSITIVE = {'great', 'good', 'excited', 'love', 'enjoyed', 'success', 'proud'}
+    NEGATIVE = {'bad', 'difficult', 'failed', 'hate', 'problem', 'struggled'}
+
+    def _score(self, text):
+        words = text.lower().split()
+        pos = sum(w in self.POSITIVE for w in words)
+        neg = sum(w in self.NEGATIVE for w in words)
+        total = pos + neg + 1
+        scores = {'Positive': pos / total, 'Negative': neg / total, 'Neutral': 1 / total, 'Mixed': 0.0}
+        label = max(scores, key=scores.get).upper()
+        return {'Sentiment': label, 'SentimentScore': scores}
+
+    def _check(self, text, operation):
+        if len(text.encode('utf-8')) > self.MAX_BYTES:
+            raise client_error('TextSizeLimitExceededException', operation)
+
+    def detect_sentiment(self, Text, LanguageCode):
+        self._call('DetectSentiment')
+        self._check(Text, 'DetectSentiment')
+        return self._score(Text)
+
+    def batch_detect_sentiment(self, TextList, LanguageCode):
+        self._call('BatchDetectSentiment')
+        if len(TextList) > self.MAX_BATCH:
+            raise client_error('BatchSizeLimitExceededException', 'BatchDetectSentiment')
+        results, errors = [], []
+        for index, text in enumerate(TextList):
+            if len(text.encode('utf-8')) > self.MAX_BYTES:
+                errors.append({'Index': index, 'ErrorCode': 'TextSizeLimitExceededException'})
+            else:
+                results.append({'Index': index, **self._score(text)})
+        return {'ResultList': results, 'ErrorList': errors}
+
+
+class FakeS3(FakeService):
+    """Objects in memory, multipart uploads, presigned URLs (signed locally, so no latency)."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.objects = {}  # (bucket, key) -> dict(Body, Metadata, ContentType, ETag)
+        self.uploads = {}  # upload id -> dict(Bucket, Key, Metadata, ContentType, Parts)
+
+    def _store(self, bucket, key, body, metadata=None, content_type=None):
+        etag = '"%s"' % hashlib.md5(body).hexdigest()  # what S3 reports for single-part uploads
+        with self._lock:
+            self.objects[(bucket, key)] = {'Body': bytes(body), 'Metadata': dict(metadata or {}),
+                                           'ContentType': content_type, 'ETag': etag}
+
+    def _object(self, bucket, key, operation):
+        obj = self.objects.get((bucket, key))
+        if obj is None:
+            raise client_error('404' if operation == 'HeadObject' else 'NoSuchKey', operation)
+        return obj
+
+    def put_object(self, Bucket, Key, Body=b'', Metadata=None, ContentType=None, **kwargs):
+        self._call('PutObject')
+        if isinstance(Body, str):
+            Body = Body.encode('utf-8')
+        self._store(Bucket, Key, Body if isinstance(Body, bytes) else Body.read(), Metadata, ContentType)
+        return {'ETag': self.objects[(Bucket, Key)]['ETag']}
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, **kwargs):
+        self._call('PutObject')
+        extra = ExtraArgs or {}
+        self._store(Bucket, Key, Fileobj.read(), extra.get('Metadata'), extra.get('ContentType'))
+
+    def head_object(self, Bucket, Key, **kwargs):
+        self._call('HeadObject')
+        obj = self._object(Bucket, Key, 'HeadObject')
+        return {'Metadata': dict(obj['Metadata']), 'ContentLength': len(obj['Body']),
+                'ContentType': obj['ContentType'], 'ETag': obj['ETag']}
+
+    def get_object(self, Bucket, Key, **kwargs):
+        self._call('GetObject')
+        obj = self._object(Bucket, Key, 'GetObject')
+        return {'Body': io.BytesIO(obj['Body']), 'ContentLength': len(obj['Body']),
+                'Metadata': dict(obj['Metadata']), 'ETag': obj['ETag']}
+
+    def list_objects_v2(self, Bucket, Prefix='', **kwargs):
+        self._call('ListObjectsV2')
+        keys = sorted(key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix))
+        return {'Contents': [{'Key': key, 'Size': len(self.objects[(Bucket, key)]['Body'])} for key in keys]}
+
+    def get_paginator(self, operation):
+        fake = self
+
+        class Paginator:
+            def paginate(self, **kwargs):
+                yield getattr(fake, operation)(**kwargs)
+
+        return Paginator()
+
+    def generate_presigned_url(self, ClientMethod, Params=None, ExpiresIn=3600):
+        params = Params or {}
+        query = f"?partNumber={params['PartNumber']}&uploadId={params['UploadId']}" if 'PartNumber' in params else ''
+        return f"https://{params.get('Bucket')}.s3.fake/{params.get('Key')}{query}"
+
+    def create_multipart_upload(self, Bucket, Key, Metadata=None, ContentType=None, **kwargs):
+        self._call('CreateMultipartUpload')
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self.uploads[upload_id] = {'Bucket': Bucket, 'Key': Key, 'Metadata': Metadata,
+                                       'ContentType': ContentType, 'Parts': {}}
+        return {'UploadId': upload_id, 'Bucket': Bucket, 'Key': Key}
+
+    def _upload(self, upload_id, operation):
+        upload = self.uploads.get(upload_id)
+        if upload is None:
+            raise client_error('NoSuchUpload', operation)
+        return upload
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, **kwargs):
+        # What the browser's PUT to a presigned part URL does
+        self._call('UploadPart')
+        data = Body if isinstance(Body, bytes) else Body.read()
+        etag = '"%s"' % uuid.uuid4().hex
+        with self._lock:
+            self._upload(UploadId, 'UploadPart')['Parts'][PartNumber] = (etag, data)
+        return {'ETag': etag}
+
+    def list_parts(self, Bucket, Key, UploadId, PartNumberMarker=0, **kwargs):
+        self._call('ListParts')
+        with self._lock:
+            parts = sorted(self._upload(UploadId, 'ListParts')['Parts'].items())
+        return {'Parts': [{'PartNumber': n, 'ETag': etag, 'Size': len(data)}
+                          for n, (etag, data) in parts if n > PartNumberMarker],
+                'IsTruncated': False}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload, **kwargs):
+        self._call('CompleteMultipartUpload')
+        with self._lock:
+            upload = self._upload(UploadId, 'CompleteMultipartUpload')
+            del self.uploads[UploadId]
+        body = b''.join(upload['Parts'][part['PartNumber']][1] for part in MultipartUpload['Parts'])
+        self._store(Bucket, Key, body, upload['Metadata'], upload['ContentType'])
+        return {'Bucket': Bucket, 'Key': Key}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId, **kwargs):
+        self._call('AbortMultipartUpload')
+        with self._lock:
+            self._upload(UploadId, 'AbortMultipartUpload')
+            del self.uploads[UploadId]
+        return {}
+
+
+# -------------------------
+# DynamoDB: enough of the expression language for the statements HireFusion issues
+# -------------------------
+
+def _split_top_level(text, separator=','):
+    parts, depth, current = [], 0, ''
+    for char in text:
+        depth += char == '('
+        depth -= char == ')'
+        if char == separator and not depth:
+            parts.append(current.strip())
+            current = ''
+        else:
+            current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _resolve(token, names):
+    token = token.strip()
+    return names.get(token, token)
+
+
+def _operand(token, item, names, values):
+    token = token.strip()
+    if token.startswith(':'):
+        return values[token]
+    match = re.fullmatch(r'if_not_exists\((.+),(.+)\)', token)
+    if match:
+        path = _resolve(match.group(1), names)
+        return item[path] if path in item else _operand(match.group(2), item, names, values)
+    return item.get(_resolve(token, names))
+
+
+def _split_keyword(text, keyword):
+    # Split on a top-level AND/OR, leaving parenthesised groups whole
+    parts, depth, start = [], 0, 0
+    for match in re.finditer(rf'\(|\)|\s+{keyword}\s+', text):
+        if match.group() == '(':
+            depth += 1
+        elif match.group() == ')':
+            depth -= 1
+        elif not depth:
+            parts.append(text[start:match.start()])
+            start = match.end()
+    return parts + [text[start:]]
+
+
+def _condition_holds(expression, item, names, values):
+    expression = expression.strip()
+    while _wrapped(expression):
+        expression = expression[1:-1].strip()
+    alternatives = _split_keyword(expression, 'OR')
+    if len(alternatives) > 1:
+        return any(_condition_holds(part, item, names, values) for part in alternatives)
+    clauses = _split_keyword(expression, 'AND')
+    if len(clauses) > 1:
+        return all(_condition_holds(part, item, names, values) for part in clauses)
+    return _clause_holds(expression, item, names, values)
+
+
+COMPARISONS = {'<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+
+
+def _wrapped(text):
+    # True for "(a = b)", false for "(a) AND (b)" or "f(x)"
+    if not (text.startswith('(') and text.endswith(')')):
+        return False
+    depth = 0
+    for position, char in enumerate(text):
+        depth += char == '('
+        depth -= char == ')'
+        if not depth:
+            return position == len(text) - 1
+    return False
+
+
+def _clause_holds(clause, item, names, values):
+    clause = clause.strip()
+    while _wrapped(clause):
+        clause = clause[1:-1].strip()
+    match = re.fullmatch(r'(attribute_exists|attribute_not_exists)\((.+)\)', clause)
+    if match:
+        exists = _resolve(match.group(2), names) in item
+        return exists if match.group(1) == 'attribute_exists' else not exists
+    match = re.fullmatch(r'(.+?)\s*(<>|<=|>=|=|<|>)\s*(.+)', clause)
+    if match:
+        left = _operand(match.group(1), item, names, values)
+        right = _operand(match.group(3), item, names, values)
+        if match.group(2) == '=':
+            return left == right
+        if match.group(2) == '<>':
+            return left != right
+        # Ordering against a missing attribute is false, as in DynamoDB
+        return left is not None and COMPARISONS[match.group(2)](left, right)
+    raise ValueError(f"Unsupported condition: {clause}")
+
+
+def _apply_update(expression, item, names, values):
+    sections = re.split(r'\b(SET|ADD|REMOVE)\b', expression)
+    for action, body in zip(sections[1::2], sections[2::2]):
+        for part in _split_top_level(body):
+            if action == 'SET':
+                path, value = part.split('=', 1)
+                item[_resolve(path, names)] = _operand(value, item, names, values)
+            elif action == 'ADD':
+                path, value = part.split()
+                path, value = _resolve(path, names), values[value]
+                # Numbers add, sets union
+                item[path] = (item.get(path) or set()) | value if isinstance(value, set) else item.get(path, 0) + value
+            else:
+                item.pop(_resolve(part, names), None)
+
+
+class FakeTable:
+    PAGE_SIZE = 100
+
+    def __init__(self, service, name, key_attrs):
+        self.service = service
+        self.name = name
+        self.key_attrs = key_attrs
+        self.items = {}
+        self.meta = SimpleNamespace(client=service)
+        self._lock = threading.Lock()
+
+    def key_of(self, item):
+        return tuple(item[attr] for attr in self.key_attrs)
+
+    def _check(self, item, kwargs, operation):
+        condition = kwargs.get('ConditionExpression')
+        if condition and not _condition_holds(condition, item or {}, kwargs.get('ExpressionAttributeNames', {}),
+                                              kwargs.get('ExpressionAttributeValues', {})):
+            raise client_error('ConditionalCheckFailedException', operation, 'The conditional request failed')
+
+    def put_item(self, Item, **kwargs):
+        self.service._call('PutItem')
+        key = self.key_of(Item)
+        with self._lock:
+            self._check(self.items.get(key), kwargs, 'PutItem')
+            self.items[key] = dict(Item)
+        return {}
+
+    def get_item(self, Key, **kwargs):
+        self.service._call('GetItem')
+        item = self.items.get(self.key_of(Key))
+        if item is None:
+            return {}
+        if 'ProjectionExpression' in kwargs:
+            names = kwargs.get('ExpressionAttributeNames', {})
+            wanted = {_resolve(path, names) for path in kwargs['ProjectionExpression'].split(',')}
+            return {'Item': {k: v for k, v in item.items() if k in wanted}}
+        return {'Item': dict(item)}
+
+    def update_item(self, Key, UpdateExpression, ReturnValues='NONE', **kwargs):
+        self.service._call('UpdateItem')
+        key = self.key_of(Key)
+        with self._lock:
+            current = self.items.get(key)
+            self._check(current, kwargs, 'UpdateItem')
+            item = dict(current or Key)
+            _apply_update(UpdateExpression, item, kwargs.get('ExpressionAttributeNames', {}),
+                          kwargs.get('ExpressionAttributeValues', {}))
+            self.items[key] = item
+        return {'Attributes': dict(item)} if ReturnValues == 'ALL_NEW' else {}
+
+    def query(self, KeyConditionExpression, ExclusiveStartKey=0, ScanIndexForward=True, Limit=None, **kwargs):
+        # Hash-key equality only ("#k = :v"), which is all the skill index needs; range key order
+        self.service._call('Query')
+        names, values = kwargs.get('ExpressionAttributeNames', {}), kwargs.get('ExpressionAttributeValues', {})
+        path, value = KeyConditionExpression.split('=')
+        path, value = _resolve(path, names), values[value.strip()]
+        with self._lock:
+            matches = [dict(item) for item in self.items.values() if item.get(path) == value]
+        if len(self.key_attrs) > 1:
+            matches.sort(key=lambda item: item[self.key_attrs[1]], reverse=not ScanIndexForward)
+        size = Limit or self.PAGE_SIZE
+        page = matches[ExclusiveStartKey:ExclusiveStartKey + size]
+        response = {'Items': page, 'Count': len(page)}
+        if ExclusiveStartKey + size < len(matches):
+            response['LastEvaluatedKey'] = ExclusiveStartKey + size
+        return response
+
+    def scan(self, ExclusiveStartKey=0, **kwargs):
+        self.service._call('Scan')
+        with self._lock:
+            items = [dict(item) for item in self.items.values()]
+        page = items[ExclusiveStartKey:ExclusiveStartKey + self.PAGE_SIZE]
+        response = {'Items': page, 'Count': len(page)}
+        if ExclusiveStartKey + self.PAGE_SIZE < len(items):
+            response['LastEvaluatedKey'] = ExclusiveStartKey + self.PAGE_SIZE
+        return response
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        table = self
+
+        class Writer:
+            def __enter__(self):
+                self.items = []
+                return self
+
+            def put_item(self, Item):
+                self.items.append(Item)
+
+            def __exit__(self, *exc):
+                for start in range(0, len(self.items), FakeDynamoDB.MAX_BATCH_WRITE):
+                    chunk = self.items[start:start + FakeDynamoDB.MAX_BATCH_WRITE]
+                    table.service.batch_write_item(
+                        RequestItems={table.name: [{'PutRequest': {'Item': item}} for item in chunk]}
+                    )
+
+        return Writer()
+
+
+class FakeDynamoDB(FakeService):
+    """
+    Resource-style DynamoDB (Table(name), batch_get_item, batch_write_item)
+    over plain Python items; tables maps each table name to its key attributes.
+    unprocessed_rate leaves that share of batch requests in Unprocessed*
+    the way a throttled table does. transact_write_items takes client-style
+    typed values, as it does behind Table.meta.client.
+    """
+    THROTTLE_CODE = 'ProvisionedThroughputExceededException'
+    MAX_BATCH_GET = 100
+    MAX_BATCH_WRITE = 25
+    MAX_TRANSACT_ITEMS = 100
+
+    def __init__(self, tables, unprocessed_rate=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.unprocessed_rate = unprocessed_rate
+        self.tables = {name: FakeTable(self, name, tuple(keys)) for name, keys in tables.items()}
+        self.meta = SimpleNamespace(client=self)
+
+    def Table(self, name):
+        with self._lock:
+            if name not in self.tables:
+                raise KeyError(f"FakeDynamoDB has no table {name!r}; declare its key attributes")
+            return self.tables[name]
+
+    def _unprocessed(self):
+        with self._lock:
+            return self._rng.random() < self.unprocessed_rate
+
+    def batch_write_item(self, RequestItems):
+        self._call('BatchWriteItem')
+        unprocessed = {}
+        for name, requests in RequestItems.items():
+            table = self.tables[name]
+            if len(requests) > self.MAX_BATCH_WRITE:
+                raise client_error('ValidationException', 'BatchWriteItem', 'Too many items')
+            keys = [table.key_of(r['PutRequest']['Item'] if 'PutRequest' in r else r['DeleteRequest']['Key'])
+                    for r in requests]
+            if len(set(keys)) != len(keys):
+                raise client_error('ValidationException', 'BatchWriteItem', 'Duplicate keys')
+            for key, request in zip(keys, requests):
+                if self._unprocessed():
+                    unprocessed.setdefault(name, []).append(request)
+                    continue
+                with table._lock:
+                    if 'PutRequest' in request:
+                        table.items[key] = dict(request['PutRequest']['Item'])
+                    else:
+                        table.items.pop(key, None)
+        return {'UnprocessedItems': unprocessed}
+
+    def batch_get_item(self, RequestItems):
+        self._call('BatchGetItem')
+        responses, unprocessed = {}, {}
+        for name, request in RequestItems.items():
+            table = self.tables[name]
+            if len(request['Keys']) > self.MAX_BATCH_GET:
+                raise client_error('ValidationException', 'BatchGetItem', 'Too many keys')
+            for key in request['Keys']:
+                if self._unprocessed():
+                    unprocessed.setdefault(name, {'Keys': []})['Keys'].append(key)
+                elif table.key_of(key) in table.items:
+                    responses.setdefault(name, []).append(dict(table.items[table.key_of(key)]))
+        return {'Responses': responses, 'UnprocessedKeys': unprocessed}
+
+    def transact_write_items(self, TransactItems, **kwargs):
+        self._call('TransactWriteItems')
+        if len(TransactItems) > self.MAX_TRANSACT_ITEMS:
+            raise client_error('ValidationException', 'TransactWriteItems', 'Too many items')
+        deserialize = TypeDeserializer().deserialize
+        plain = lambda values: {k: deserialize(v) for k, v in (values or {}).items()}  # noqa: E731
+
+        actions = []
+        for entry in TransactItems:
+            (action, request), = entry.items()
+            table = self.tables[request['TableName']]
+            item = plain(request['Item']) if action == 'Put' else None
+            key = table.key_of(item if item is not None else plain(request['Key']))
+            actions.append((action, request, table, key, item))
+        if len({(table.name, key) for _, _, table, key, _ in actions}) != len(actions):
+            raise client_error('ValidationException', 'TransactWriteItems', 'Multiple operations on one item')
+
+        # All or nothing: every condition is checked before anything is written
+        tables = sorted({table.name: table for _, _, table, _, _ in actions}.values(), key=lambda t: t.name)
+        with contextlib.ExitStack() as stack:
+            for table in tables:
+                stack.enter_context(table._lock)
+            reasons = []
+            for action, request, table, key, _ in actions:
+                condition = request.get('ConditionExpression')
+                holds = not condition or _condition_holds(
+                    condition, table.items.get(key) or {}, request.get('ExpressionAttributeNames', {}),
+                    plain(request.get('ExpressionAttributeValues')))
+                reasons.append({'Code': 'None'} if holds else
+                               {'Code': 'ConditionalCheckFailed', 'Message': 'The conditional request failed'})
+            if any(reason['Code'] != 'None' for reason in reasons):
+                raise ClientError({'Error': {'Code': 'TransactionCanceledException',
+                                             'Message': 'Transaction cancelled'},
+                                   'CancellationReasons': reasons}, 'TransactWriteItems')
+
+            for action, request, table, key, item in actions:
+                if action == 'Put':
+                    table.items[key] = item
+                elif action == 'Update':
+                    item = dict(table.items.get(key) or plain(request['Key']))
+                    _apply_update(request['UpdateExpression'], item, request.get('ExpressionAttributeNames', {}),
+                                  plain(request.get('ExpressionAttributeValues')))
+                    table.items[key] = item
+                elif action == 'Delete':
+                    table.items.pop(key, None)
+        return {}
+
+
+class FakeSNS(FakeService):
+    """Keeps published messages so the caller can deliver them to the subscribed Lambda."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.messages = deque()
+
+    def publish(self, TopicArn, Message, **kwargs):
+        self._call('Publish')
+        message_id = uuid.uuid4().hex
+        with self._lock:
+            self.messages.append((TopicArn, Message))
+        return {'MessageId': message_id}
+
+    def take(self, topic_arn, predicate):
+        """Remove and return the first message on topic_arn whose decoded body matches."""
+        with self._lock:
+            for entry in self.messages:
+                if entry[0] == topic_arn and predicate(json.loads(entry[1])):
+                    self.messages.remove(entry)
+                    return entry[1]
+        return None
+
+
+class FakeTextract(FakeService):
+    """Text detection over the S3 fake: every non-empty line of the object becomes a LINE block."""
+    PAGE_SIZE = 1000
+
+    def __init__(self, s3, sns, **kwargs):
+        super().__init__(**kwargs)
+        self.s3, self.sns = s3, sns
+        self.jobs = {}
+
+    def start_document_text_detection(self, DocumentLocation, NotificationChannel=None, JobTag=None, **kwargs):
+        self._call('StartDocumentTextDetection')
+        location = DocumentLocation['S3Object']
+        body = self.s3.objects[(location['Bucket'], location['Name'])]['Body']
+        lines = [line for line in body.decode('utf-8', errors='replace').splitlines() if line.strip()]
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self.jobs[job_id] = lines
+        if NotificationChannel:
+            self.sns.publish(TopicArn=NotificationChannel['SNSTopicArn'], Message=json.dumps({
+                'JobId': job_id, 'Status': 'SUCCEEDED', 'API': 'StartDocumentTextDetection', 'JobTag': JobTag,
+                'DocumentLocation': {'S3ObjectName': location['Name'], 'S3Bucket': location['Bucket']}
+            }))
+        return {'JobId': job_id}
+
+    def get_document_text_detection(self, JobId, NextToken=None, MaxResults=PAGE_SIZE, **kwargs):
+        self._call('GetDocumentTextDetection')
+        lines = self.jobs[JobId]
+        start = int(NextToken or 0)
+        page = lines[start:start + MaxResults]
+        response = {'JobStatus': 'SUCCEEDED', 'Blocks': [{'BlockType': 'LINE', 'Text': line} for line in page]}
+        if start + MaxResults < len(lines):
+            response['NextToken'] = str(start + MaxResults)
+        return response
+
+
+class FakeRekognition(FakeService):
+    """Face detection jobs with faces_per_job synthetic detections, paged like the real API."""
+
+    def __init__(self, sns, faces_per_job=300, **kwargs):
+        super().__init__(**kwargs)
+        self.sns = sns
+        self.faces_per_job = faces_per_job
+        self.jobs = {}
+        self.tokens = {}
+
+    def start_face_detection(self, Video, NotificationChannel=None, JobTag=None, ClientRequestToken=None, **kwargs):
+        self._call('StartFaceDetection')
+        with self._lock:
+            # Same token, same job (the real API's idempotency)
+            if ClientRequestToken in self.tokens:
+                return {'JobId': self.tokens[ClientRequestToken]}
+            job_id = uuid.uuid4().hex
+            self.jobs[job_id] = self._rng.randint(0, 10 ** 9)
+            if ClientRequestToken:
+                self.tokens[ClientRequestToken] = job_id
+        if NotificationChannel:
+            self.sns.publish(TopicArn=NotificationChannel['SNSTopicArn'], Message=json.dumps({
+                'JobId': job_id, 'Status': 'SUCCEEDED', 'API': 'StartFaceDetection', 'JobTag': JobTag,
+                'Video': {'S3ObjectName': Video['S3Object']['Name'], 'S3Bucket': Video['S3Object']['Bucket']}
+            }))
+        return {'JobId': job_id}
+
+    def get_face_detection(self, JobId, MaxResults=1000, NextToken=None, **kwargs):
+        self._call('GetFaceDetection')
+        start = int(NextToken or 0)
+        end = min(self.faces_per_job, start + MaxResults)
+        faces = []
+        for n in range(start, end):
+            # Seeded per face, so a detection is the same whatever the page size
+            rng = random.Random(self.jobs[JobId] * 100003 + n)
+            faces.append({'Timestamp': n * 200, 'Face': {
+                'Emotions': [{'Type': 'HAPPY', 'Confidence': rng.uniform(40, 99)},
+                             {'Type': 'CALM', 'Confidence': rng.uniform(10, 90)}],
+                'Smile': {'Value': rng.random() < 0.5, 'Confidence': rng.uniform(50, 99)},
+            }})
+        response = {'JobStatus': 'SUCCEEDED', 'Faces': faces}
+        if end < self.faces_per_job:
+            response['NextToken'] = str(end)
+        return response
+
+
+class FakeTranscribe(FakeService):
+    """Transcription jobs whose output JSON is written to a temp dir and served as a file:// URI."""
+    WORDS = ("I built and designed a project during my internship and I am excited about the "
+             "experience with cloud certification and developed services").split()
+
+    def __init__(self, words_per_job=800, **kwargs):
+        super().__init__(**kwargs)
+        self.words_per_job = words_per_job
+        self.jobs = {}
+        self.created = {}
+        self.directory = tempfile.mkdtemp(prefix='fake-transcribe-')
+
+    def start_transcription_job(self, TranscriptionJobName, Media, **kwargs):
+        self._call('StartTranscriptionJob')
+        with self._lock:
+            if TranscriptionJobName in self.jobs:
+                raise client_error('ConflictException', 'StartTranscriptionJob',
+                                   'The requested job name already exists')
+            seed = self._rng.randint(0, 10 ** 9)
+            self.jobs[TranscriptionJobName] = None
+            self.created[TranscriptionJobName] = datetime.now(timezone.utc)
+        rng = random.Random(seed)
+        words = [rng.choice(self.WORDS) for _ in range(self.words_per_job)]
+        items = [{'start_time': f"{n * 0.4:.2f}", 'end_time': f"{n * 0.4 + 0.3:.2f}", 'type': 'pronunciation',
+                  'alternatives': [{'confidence': '0.98', 'content': word}]} for n, word in enumerate(words)]
+        path = os.path.join(self.directory, f"{uuid.uuid4().hex}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'jobName': TranscriptionJobName, 'status': 'COMPLETED',
+                       'results': {'transcripts': [{'transcript': " ".join(words) + "."}], 'items': items}}, f)
+        with self._lock:
+            self.jobs[TranscriptionJobName] = 'file://' + path
+        return {'TranscriptionJob': {'TranscriptionJobName': TranscriptionJobName,
+                                     'TranscriptionJobStatus': 'IN_PROGRESS'}}
+
+    def get_transcription_job(self, TranscriptionJobName):
+        self._call('GetTranscriptionJob')
+        uri = self.jobs.get(TranscriptionJobName)
+        if uri is None:
+            raise client_error('BadRequestException', 'GetTranscriptionJob', 'The requested job could not be found')
+        return {'TranscriptionJob': {'TranscriptionJobName': TranscriptionJobName,
+                                     'TranscriptionJobStatus': 'COMPLETED',
+                                     'CreationTime': self.created[TranscriptionJobName],
+                                     'CompletionTime': self.created[TranscriptionJobName],
+                                     'Transcript': {'TranscriptFileUri': uri}}}
+
+    def completion_event(self, job_name, status='COMPLETED'):
+        # The EventBridge "Transcribe Job State Change" event the video Lambda subscribes to
+        return {'source': 'aws.transcribe', 'detail-type': 'Transcribe Job State Change',
+                'detail': {'TranscriptionJobName': job_name, 'TranscriptionJobStatus': status}}
+
+
+class FakeAWS:
+    """
+    One fake per service behind boto3-style client(service) / resource(service).
+    latency / throttle map a service name to ms per call / error probability.
+    """
+
+    def __init__(self, tables, latency=None, throttle=None, jitter=0.2, seed=0, **options):
+        def common(service):
+            ms = (latency or {}).get(service, 0.0)
+            return {'latency_ms': ms, 'jitter_ms': ms * jitter,
+                    'throttle_rate': (throttle or {}).get(service, 0.0), 'seed': f"{seed}:{service}"}
+
+        self.sns = FakeSNS(**common('sns'))
+        self.s3 = FakeS3(**common('s3'))
+        self.services = {
+            's3': self.s3,
+            'sns': self.sns,
+            'dynamodb': FakeDynamoDB(tables, **common('dynamodb')),
+            'textract': FakeTextract(self.s3, self.sns, **common('textract')),
+            'rekognition': FakeRekognition(self.sns, options.get('faces_per_job', 300), **common('rekognition')),
+            'transcribe': FakeTranscribe(options.get('words_per_job', 800), **common('transcribe')),
+            'comprehend': FakeComprehend(**common('comprehend')),
+        }
+
+    def client(self, service, *args, **kwargs):
+        return self.services[service]
+
+    def resource(self, service, *args, **kwargs):
+        return self.services[service]
+
+    def calls(self):
+        return {service: dict(fake.calls) for service, fake in self.services.items() if fake.calls}
@@ -0,0 +1,330 @@
+"""
+End-to-end load test with in-process fakes for every AWS dependency.
+
+Concurrent synthetic users run the two HireFusion flows against app.py and
+the Lambda handlers, with boto3 pointed at benchmarks/fakes.py:
+
+  resume: presigned URL -> S3 PUT -> resume Lambda (local text or Textract
+          start + SNS completion) -> /resume_data -> /api/dashboard_stats
+  video:  multipart initiate/parts/complete -> video Lambda 1 -> Rekognition
+          SNS and Transcribe event into video Lambda 2 (either order) ->
+          /api/video_result
+
+Latency (p50/p95/p99) and throughput are reported per route, per Lambda
+stage and per whole flow, and saved as JSON so runs can be compared:
+
+    python benchmarks/load_test.py --users 8 --flows 20
+    python benchmarks/load_test.py --latency dynamodb=10 --throttle dynamodb=0.01
+    python benchmarks/load_test.py --compare benchmarks/results/load-20260101T000000.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+
+from fakes import FakeAWS  # noqa: E402
+
+RESULTS_DIR = os.path.join(HERE, 'results')
+
+TABLES = {
+    'HireFusionTable': ['email'],
+    'ResumeAnalysisResults': ['ResumeID'],
+    'InterviewAnalysisResults': ['analysis_id'],
+    'VideoAnalysisResults': ['ResumeID'],
+    'UserDashboardStats': ['email'],
+    'ResumeSkillIndex': ['Skill', 'ScoreKey'],
+    'ResumeAnalysisCache': ['ContentHash'],
+    'VideoJobLaunches': ['LaunchKey'],
+}
+
+# Rough per-call service latencies (ms); override with --latency
+DEFAULT_LATENCY = {'s3': 15, 'dynamodb': 5, 'textract': 40, 'rekognition': 40, 'transcribe': 40,
+                   'comprehend': 30, 'sns': 10}
+
+LAMBDA_ENV = {
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'SNS_TOPIC_ARN': 'arn:aws:sns:us-east-1:000000000000:video-analysis',
+    'REKOG_ROLE_ARN': 'arn:aws:iam::000000000000:role/rekognition-sns',
+    'TEXTRACT_SNS_TOPIC_ARN': 'arn:aws:sns:us-east-1:000000000000:textract-analysis',
+    'TEXTRACT_ROLE_ARN': 'arn:aws:iam::000000000000:role/textract-sns',
+    'DDB_TABLE': 'VideoAnalysisResults',
+    'RESUME_CACHE_TABLE': 'ResumeAnalysisCache',
+    'JOB_IDEMPOTENCY_TABLE': 'VideoJobLaunches',
+}
+
+RESUME_LINES = [
+    "Software engineer with Python, AWS, Docker and Kubernetes experience.",
+    "Built a data pipeline project with PostgreSQL, Redis and Terraform.",
+    "Completed an internship on the platform team using Java and Spring Boot.",
+    "AWS Solutions Architect certification; React and TypeScript front ends.",
+    "Designed REST API microservices and CI/CD with GitHub Actions.",
+]
+
+
+def parse_map(text):
+    # "s3=10,dynamodb=5" -> {'s3': 10.0, 'dynamodb': 5.0}
+    return {key: float(value) for key, value in (pair.split('=') for pair in text.split(',') if pair)}
+
+
+def load_system(aws):
+    """Import app.py and the Lambdas with every boto3 client/resource served by the fakes."""
+    os.environ.update(LAMBDA_ENV)
+    import boto3
+    import aws_clients
+
+    boto3.client = aws.client
+    boto3.resource = aws.resource
+    aws_clients._get_session = lambda: aws
+
+    import app
+    import resume_analyzer_lambda_website_integrated as resume_lambda
+    import video_resume_lambda_1_website_integrated as video_lambda_1
+    import video_resume_lambda_2_website_integrated as video_lambda_2
+
+    return SimpleNamespace(app=app, resume_lambda=resume_lambda,
+                           video_lambda_1=video_lambda_1, video_lambda_2=video_lambda_2)
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def measure(self, label):
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                if ok:
+                    self.samples[label].append(elapsed)
+                else:
+                    self.errors[label] += 1
+
+    def summary(self, wall_seconds):
+        def pct(ordered, p):
+            return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+        report = {}
+        for label in sorted(set(self.samples) | set(self.errors)):
+            ordered = sorted(self.samples[label])
+            report[label] = {
+                'count': len(ordered), 'errors': self.errors[label],
+                'per_second': round(len(ordered) / wall_seconds, 2),
+                **({'p50': round(pct(ordered, 50), 2), 'p95': round(pct(ordered, 95), 2),
+                    'p99': round(pct(ordered, 99), 2), 'mean': round(statistics.fmean(ordered), 2),
+                    'max': round(ordered[-1], 2)} if ordered else {}),
+            }
+        return report
+
+
+class LoadUser:
+    """One synthetic user; every step is timed under its route / stage label."""
+
+    def __init__(self, number, system, aws, recorder, args):
+        self.system, self.aws, self.rec, self.args = system, aws, recorder, args
+        self.client = system.app.app.test_client()
+        self.rng = random.Random(f"{args.seed}:{number}")
+        self.email = f"candidate{number}@load.test"
+
+    def route(self, method, path, expect=(200,), **kwargs):
+        label = f"{method} {path.split('?')[0]}"
+        with self.rec.measure(label):
+            response = self.client.open(path, method=method, **kwargs)
+            if response.status_code not in expect:
+                raise RuntimeError(f"{label} -> {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return response.get_json(silent=True)
+
+    def invoke(self, label, handler, event):
+        with self.rec.measure(label):
+            response = handler(event, None)
+            if response.get('statusCode') != 200:
+                raise RuntimeError(f"{label} -> {response.get('statusCode')}: {response.get('body', '')[:200]}")
+        return json.loads(response['body'])
+
+    def s3_event(self, bucket, key):
+        return {'Records': [{'eventSource': 'aws:s3', 's3': {'bucket': {'name': bucket}, 'object': {'key': key}}}]}
+
+    def resume_document(self, as_pdf):
+        lines = [self.rng.choice(RESUME_LINES) for _ in range(self.rng.randint(8, 30))]
+        if as_pdf:
+            # No text layer the local extractor can read, so this one goes through Textract
+            return "\n".join(lines).encode()
+        document = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+                    + "".join(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for line in lines)
+                    + '</w:body></w:document>')
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('word/document.xml', document)
+        return buffer.getvalue()
+
+    def resume_flow(self):
+        as_pdf = self.rng.random() < self.args.textract_share
+        filename = f"cv-{uuid.uuid4().hex[:8]}.{'pdf' if as_pdf else 'docx'}"
+        signed = self.route('POST', '/generate_presigned_url',
+                            json={'filename': filename, 'filetype': 'application/octet-stream', 'email': self.email})
+        key, resume_id = signed['key'], signed['resume_id']
+
+        with self.rec.measure('browser: S3 PUT resume'):
+            self.aws.s3.put_object(Bucket=self.system.app.BUCKET, Key=key, Body=self.resume_document(as_pdf),
+                                   Metadata={'resumeid': resume_id, 'useremail': self.email})
+
+        lambda_handler = self.system.resume_lambda.lambda_handler
+        self.invoke('resume lambda: S3 event', lambda_handler, self.s3_event(self.system.app.BUCKET, key))
+        if as_pdf:
+            message = self.aws.sns.take(LAMBDA_ENV['TEXTRACT_SNS_TOPIC_ARN'], lambda m: m['JobTag'] == resume_id)
+            if message is None:
+                raise RuntimeError("No Textract completion published")
+            self.invoke('resume lambda: Textract SNS', lambda_handler, {'Records': [{'Sns': {'Message': message}}]})
+
+        self.route('GET', f'/resume_data?resume_id={resume_id}')
+        self.route('GET', f'/api/dashboard_stats?email={self.email}')
+
+    def video_flow(self):
+        app = self.system.app
+        upload = self.route('POST', '/api/video_upload/initiate', json={
+            'filename': f"interview-{uuid.uuid4().hex[:8]}.mp4", 'filetype': 'video/mp4',
+            'size': self.args.video_parts * app.VIDEO_PART_SIZE, 'email': self.email})
+        params = {key: upload[key] for key in ('analysis_id', 'key', 'upload_id')}
+        parts = list(range(1, upload['part_count'] + 1))
+        self.route('POST', '/api/video_upload/parts', json={**params, 'part_numbers': parts})
+
+        for number in parts:
+            with self.rec.measure('browser: S3 UploadPart'):
+                self.aws.s3.upload_part(Bucket=app.VIDEO_BUCKET, Key=params['key'], UploadId=params['upload_id'],
+                                        PartNumber=number, Body=os.urandom(self.args.part_bytes))
+        self.route('POST', '/api/video_upload/complete', json={**params, 'part_count': upload['part_count']})
+
+        event = self.s3_event(app.VIDEO_BUCKET, params['key'])
+        self.invoke('video lambda 1: S3 event', self.system.video_lambda_1.lambda_handler, event)
+        if self.rng.random() < self.args.redelivery:
+            # S3 delivers at least once; a repeat must not start a second pair of jobs
+            body = self.invoke('video lambda 1: redelivered event', self.system.video_lambda_1.lambda_handler, event)
+            if not body['results'][0].get('duplicate'):
+                raise RuntimeError("Redelivered event started new jobs")
+        message = self.aws.sns.take(LAMBDA_ENV['SNS_TOPIC_ARN'],
+                                    lambda m: m['Video']['S3ObjectName'] == params['key'])
+        if message is None:
+            raise RuntimeError("No Rekognition completion published")
+        job = json.loads(message)['JobTag']
+
+        # The two completions race in production; run them in either order
+        completions = [
+            ('video lambda 2: Rekognition SNS', {'Records': [{'Sns': {'Message': message}}]}),
+            ('video lambda 2: Transcribe event', self.aws.services['transcribe'].completion_event(job)),
+        ]
+        self.rng.shuffle(completions)
+        for label, event in completions:
+            self.invoke(label, self.system.video_lambda_2.lambda_handler, event)
+
+        # What the browser sees, not the Lambda's own table
+        result = self.route('GET', f"/api/video_result?analysis_id={params['analysis_id']}")
+        if result.get('status') != 'COMPLETED' or 'total_score' not in result.get('scores', {}):
+            raise RuntimeError(f"Video analysis {params['analysis_id']} not finalized")
+
+    def run(self, flows):
+        for _ in range(flows):
+            name = 'video' if self.rng.random() < self.args.video_share else 'resume'
+            try:
+                with self.rec.measure(f"flow: {name}"):
+                    getattr(self, f"{name}_flow")()
+            except Exception as e:
+                if self.args.verbose:
+                    print(f"{name} flow failed: {e}", file=sys.__stderr__)
+
+
+def print_report(report, previous=None):
+    print(f"{'label':<42} {'count':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'/s':>7}"
+          + ("   p50 vs prev  p95 vs prev" if previous else ""))
+    for label, row in report.items():
+        if not row['count']:
+            print(f"{label:<42} {0:>6} {row['errors']:>4}")
+            continue
+        line = (f"{label:<42} {row['count']:>6} {row['errors']:>4} {row['p50']:>8.1f} {row['p95']:>8.1f} "
+                f"{row['p99']:>8.1f} {row['per_second']:>7.1f}")
+        old = (previous or {}).get(label)
+        if old and old.get('count'):
+            line += f"   {(row['p50'] / old['p50'] - 1) * 100:>+10.1f}% {(row['p95'] / old['p95'] - 1) * 100:>+10.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=8, help="concurrent synthetic users")
+    parser.add_argument('--flows', type=int, default=20, help="flows per user")
+    parser.add_argument('--video-share', type=float, default=0.4)
+    parser.add_argument('--textract-share', type=float, default=0.3, help="resumes that need OCR")
+    parser.add_argument('--video-parts', type=int, default=3)
+    parser.add_argument('--part-bytes', type=int, default=64 * 1024)
+    parser.add_argument('--redelivery', type=float, default=0.1, help="video events S3 delivers twice")
+    parser.add_argument('--faces', type=int, default=300, help="Rekognition faces per video")
+    parser.add_argument('--words', type=int, default=800, help="transcript words per video")
+    parser.add_argument('--latency', default='', help="per-service ms, e.g. s3=20,dynamodb=8")
+    parser.add_argument('--throttle', default='', help="per-service error rate, e.g. dynamodb=0.01")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', help="results file (default benchmarks/results/load-<time>.json)")
+    parser.add_argument('--compare', help="earlier results file to diff against")
+    parser.add_argument('--verbose', action='store_true', help="print why flows failed")
+    args = parser.parse_args()
+
+    latency = {**DEFAULT_LATENCY, **parse_map(args.latency)}
+    throttle = parse_map(args.throttle)
+    aws = FakeAWS(TABLES, latency=latency, throttle=throttle, seed=args.seed,
+                  faces_per_job=args.faces, words_per_job=args.words)
+    system = load_system(aws)
+    recorder = Recorder()
+    users = [LoadUser(n, system, aws, recorder, args) for n in range(args.users)]
+
+    started = time.perf_counter()
+    # The handlers log every step; keep that out of the report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            list(pool.map(lambda user: user.run(args.flows), users))
+    wall = time.perf_counter() - started
+
+    report = recorder.summary(wall)
+    results = {
+        'started_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'config': {**{k: v for k, v in vars(args).items() if k not in ('out', 'compare', 'verbose')},
+                   'latency_ms': latency, 'throttle': throttle},
+        'wall_seconds': round(wall, 2),
+        'results': report,
+        'service_calls': aws.calls(),
+    }
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)['results']
+
+    print(f"{args.users} users x {args.flows} flows in {wall:.1f}s")
+    print_report(report, previous)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"load-{datetime.utcnow():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved {out}")
+
+
+if __name__ == '__main__':
+    main()
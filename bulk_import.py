@@ -0,0 +1,191 @@
+"""
+Bulk candidate import.
+
+Reads candidates from CSV (header row) or JSONL and writes them to the
+users table in small batches, a few in flight, so memory stays flat
+whatever the file size. Each batch is one conditional transaction, so an
+email that is already registered is reported as a conflict rather than
+overwritten (at twice the write capacity of a plain batched put). Every
+input row gets a result line:
+
+    python bulk_import.py candidates.csv
+    python bulk_import.py candidates.jsonl --results results.jsonl
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from botocore.exceptions import ClientError
+
+from aws_clients import get_resource
+from dynamo_batch import put_new_items
+
+USERS_TABLE = 'HireFusionTable'
+# Rows per conditional transaction, well under the 100-item TransactWriteItems
+# limit: a taken email cancels the whole transaction and the rest is resent
+IMPORT_BATCH_SIZE = 25
+IMPORT_WORKERS = int(os.environ.get('IMPORT_WORKERS', '4'))  # TransactWriteItems calls in flight
+
+# Same attributes /register stores
+USER_FIELDS = ('full_name', 'username', 'date_of_birth', 'phone', 'gender', 'password')
+
+
+def detect_format(filename=None, content_type=None):
+    name, content_type = (filename or '').lower(), content_type or ''
+    if name.endswith(('.jsonl', '.ndjson')) or 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'jsonl'
+    return 'csv'
+
+
+def read_rows(stream, fmt):
+    """Yield (row_number, record or None, error or None) from a text stream."""
+    if fmt == 'jsonl':
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield number, None, f"Invalid JSON: {e}"
+                continue
+            if isinstance(record, dict):
+                yield number, record, None
+            else:
+                yield number, None, "Expected a JSON object"
+    else:
+        # Row numbers count the header as row 1, like a spreadsheet
+        for number, record in enumerate(csv.DictReader(stream), start=2):
+            yield number, record, None
+
+
+def user_item(record, created_at):
+    """Build the users-table item for one input record; raises ValueError if it is unusable."""
+    email = (record.get('email') or '').strip()
+    if not email or '@' not in email:
+        raise ValueError("Missing or invalid email")
+    item = {'email': email, 'created_at': created_at}
+    for field in USER_FIELDS:
+        value = record.get(field)
+        if value not in (None, ''):
+            item[field] = str(value).strip()
+    return item
+
+
+def write_batch(dynamodb, table_name, batch):
+    """Write one batch of (row_number, item) for new emails only; return its per-row results."""
+    try:
+        existing, leftover = put_new_items(dynamodb, table_name, [item for _, item in batch], 'email')
+        existing, unwritten = {item['email'] for item in existing}, {item['email'] for item in leftover}
+        failure = 'Throttled, not written'
+    except ClientError as e:
+        existing, unwritten, failure = set(), {item['email'] for _, item in batch}, str(e)
+
+    results = []
+    for number, item in batch:
+        result = {'row': number, 'email': item['email'], 'status': 'ok'}
+        if item['email'] in existing:
+            result.update(status='conflict', error='Email already registered')
+        elif item['email'] in unwritten:
+            result.update(status='error', error=failure)
+        results.append(result)
+    return results
+
+
+def import_rows(rows, dynamodb, table_name=USERS_TABLE, workers=IMPORT_WORKERS):
+    """
+    Write rows from read_rows() in batches and yield one result dict per row:
+    {"row", "email", "status": "ok" | "conflict" | "error", "error"}.
+    "conflict" means the email was already in the table (or earlier in the
+    input) and the row was not written.
+    At most `workers` batches are in flight, so memory stays bounded.
+    Invalid rows are reported straight away, written rows once their batch
+    returns, so results can arrive ahead of row order.
+    """
+    created_at = datetime.utcnow().isoformat()
+    batch = {}  # email -> (row_number, item) for the batch being filled
+    in_flight = deque()  # (emails, future) in submission order
+    flying = set()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def drain(keep):
+            # Batches are reported in the order they were submitted
+            while len(in_flight) > keep:
+                emails, future = in_flight.popleft()
+                flying.difference_update(emails)
+                yield from future.result()
+
+        def submit():
+            emails = set(batch)
+            in_flight.append((emails, pool.submit(write_batch, dynamodb, table_name, list(batch.values()))))
+            flying.update(emails)
+            batch.clear()
+
+        for number, record, error in rows:
+            if error is None:
+                try:
+                    item = user_item(record, created_at)
+                except ValueError as e:
+                    error = str(e)
+            if error is not None:
+                yield {'row': number, 'email': (record or {}).get('email'), 'status': 'error', 'error': error}
+                continue
+
+            email = item['email']
+            # A batch can't hold the same key twice, and the earlier row must land first
+            # so the later one is the conflict
+            if email in batch:
+                submit()
+            if email in flying:
+                yield from drain(0)
+            batch[email] = (number, item)
+            if len(batch) == IMPORT_BATCH_SIZE:
+                submit()
+                yield from drain(workers)
+
+        if batch:
+            submit()
+        yield from drain(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import candidates from CSV or JSONL")
+    parser.add_argument('path', help="input file, or - for stdin")
+    parser.add_argument('--format', choices=['csv', 'jsonl'])
+    parser.add_argument('--table', default=USERS_TABLE)
+    parser.add_argument('--results', help="write per-row results as JSONL here")
+    parser.add_argument('--workers', type=int, default=IMPORT_WORKERS)
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    source = sys.stdin if args.path == '-' else io.open(args.path, newline='', encoding='utf-8-sig')
+    results = io.open(args.results, 'w', encoding='utf-8') if args.results else None
+    counts = {'ok': 0, 'conflict': 0, 'error': 0}
+    start = time.perf_counter()
+    try:
+        for result in import_rows(read_rows(source, fmt), get_resource('dynamodb'), args.table, args.workers):
+            counts[result['status']] += 1
+            if results:
+                results.write(json.dumps(result) + '\n')
+            elif result['status'] != 'ok':
+                print(f"row {result['row']}: {result['error']}", file=sys.stderr)
+    finally:
+        if results:
+            results.close()
+        if source is not sys.stdin:
+            source.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"Imported {counts['ok']} candidate(s), {counts['conflict']} already registered, "
+          f"{counts['error']} error(s) in {elapsed:.1f}s")
+    return 1 if counts['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""
+Offline bulk resume analysis.
+
+Streams resumes from a directory, a zip archive or an S3 prefix, runs text
+extraction and scoring across a process pool, and writes the results to
+ResumeAnalysisResults (and the skill index) in BatchWriteItem batches.
+Re-analysing an upload that already has a row updates it in place: the
+uploader and the original extraction details are kept, the old skill
+postings are removed and the uploader's dashboard score sum follows the
+new score. Extraction is pluggable, so a run can stay fully local:
+
+    python bulk_resume_pipeline.py ./archive --dry-run
+    python bulk_resume_pipeline.py resumes-2023.zip --workers 8
+    python bulk_resume_pipeline.py s3://hirefusionai-resumes/2023/ --extractor mypkg.ocr:extract
+
+An extractor is a "module:function" taking (data: bytes, name: str) and
+returning the text, or "" when it can't read the file.
+"""
+import argparse
+import functools
+import importlib
+import json
+import os
+import re
+import sys
+import time
+import uuid
+import zipfile
+from collections import deque
+from decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor
+
+from aws_clients import get_client, get_resource
+from dashboard_stats import STATS_TABLE, add_score_change
+from dynamo_batch import batch_get_items, batch_write_requests
+from local_extract import extract_local_text
+from resume_scoring import analyze_resume_text, generate_score, result_item
+from skill_index import SKILL_INDEX_TABLE, resume_postings
+
+RESUME_TABLE = 'ResumeAnalysisResults'
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+PIPELINE_WORKERS = int(os.environ.get('PIPELINE_WORKERS', str(os.cpu_count() or 2)))
+WRITE_BATCH_SIZE = 25
+
+# Uploads are stored as "{resume_id}_{filename}"; re-analysing them updates the same row
+RESUME_ID_PREFIX = re.compile(r'^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})_')
+# Taken from the stored row on re-analysis: who uploaded the resume and how it was first read
+PRESERVED_ATTRIBUTES = ('UserEmail', 'ResumeFile', 'ExtractionMethod', 'ExtractionMs')
+
+
+# -------------------------
+# Sources: yield (name, bytes) one file at a time
+# -------------------------
+
+def iter_directory(path):
+    for root, _, files in os.walk(path):
+        for filename in sorted(files):
+            if filename.lower().endswith(RESUME_EXTENSIONS):
+                full = os.path.join(root, filename)
+                with open(full, 'rb') as f:
+                    yield os.path.relpath(full, path), f.read()
+
+
+def iter_zip(path):
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and info.filename.lower().endswith(RESUME_EXTENSIONS):
+                yield info.filename, archive.read(info)
+
+
+def iter_s3(uri):
+    bucket, _, prefix = uri[len('s3://'):].partition('/')
+    s3 = get_client('s3')
+    for page in s3.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get('Contents', []):
+            if obj['Key'].lower().endswith(RESUME_EXTENSIONS):
+                yield obj['Key'], s3.get_object(Bucket=bucket, Key=obj['Key'])['Body'].read()
+
+
+def open_source(source):
+    if source.startswith('s3://'):
+        return iter_s3(source)
+    if zipfile.is_zipfile(source):
+        return iter_zip(source)
+    return iter_directory(source)
+
+
+# -------------------------
+# Extraction + scoring (runs in the worker processes)
+# -------------------------
+
+def local_extractor(data, name):
+    """Default extractor: plain text, DOCX XML or the PDF text layer; no OCR."""
+    if name.lower().endswith('.txt'):
+        return data.decode('utf-8', errors='replace')
+    text, _ = extract_local_text(data, name)
+    return text
+
+
+@functools.lru_cache(maxsize=None)
+def load_extractor(spec):
+    if spec == 'local':
+        return local_extractor
+    module, _, function = spec.partition(':')
+    return getattr(importlib.import_module(module), function)
+
+
+def resume_id_for(source, name):
+    match = RESUME_ID_PREFIX.match(os.path.basename(name))
+    if match:
+        return match.group(1)
+    # Stable per source file, so a re-run overwrites instead of duplicating
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{source}/{name}"))
+
+
+def analyze_document(extractor_spec, source, name, data):
+    """Extract and score one resume; returns a result dict (never raises)."""
+    result = {'name': name, 'resume_id': resume_id_for(source, name)}
+    try:
+        started = time.perf_counter()
+        text = load_extractor(extractor_spec)(data, name)
+        extracted = time.perf_counter()
+        if not text or not text.strip():
+            result['error'] = 'No text extracted'
+            return result
+
+        skills = analyze_resume_text(text)
+        score, proj, intern, intern_type, certs = generate_score(skills, text)
+        finished = time.perf_counter()
+
+        extract_ms = round((extracted - started) * 1000)
+        result.update(
+            item=result_item(result['resume_id'], name, score, skills, proj, intern, intern_type, certs,
+                             {'method': f'bulk:{extractor_spec}', 'ms': extract_ms}),
+            skills=skills,
+            extract_ms=extract_ms,
+            analyze_ms=(finished - extracted) * 1000
+        )
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+# -------------------------
+# Batched writes (main process)
+# -------------------------
+
+class BatchedWrites:
+    """Buffers puts and deletes per table and writes them 25 at a time; collects the ResumeIDs left unwritten."""
+
+    def __init__(self, dynamodb, key_attrs):
+        self.dynamodb = dynamodb
+        self.key_attrs = key_attrs  # table -> key attribute names
+        self.pending = {table: {} for table in key_attrs}
+        self.failed = {table: set() for table in key_attrs}
+        self.calls = 0
+
+    def key_of(self, table, item):
+        return tuple(item[attr] for attr in self.key_attrs[table])
+
+    def add(self, table, item):
+        self._queue(table, item, {'PutRequest': {'Item': item}})
+
+    def delete(self, table, item):
+        key = {attr: item[attr] for attr in self.key_attrs[table]}
+        self._queue(table, item, {'DeleteRequest': {'Key': key}})
+
+    def _queue(self, table, item, request):
+        key = self.key_of(table, item)
+        batch = self.pending[table]
+        if key in batch:
+            self.flush(table)
+        batch[key] = (item['ResumeID'], request)
+        if len(batch) == WRITE_BATCH_SIZE:
+            self.flush(table)
+
+    def flush(self, table=None):
+        for name in [table] if table else list(self.pending):
+            batch = self.pending[name]
+            if not batch:
+                continue
+            self.calls += 1
+            for request in batch_write_requests(self.dynamodb, name, [request for _, request in batch.values()]):
+                written = request['PutRequest']['Item'] if 'PutRequest' in request else request['DeleteRequest']['Key']
+                self.failed[name].add(batch[self.key_of(name, written)][0])
+            batch.clear()
+
+
+def store_results(writer, results, table, index_table=None, stats_table=None):
+    """
+    Write one batch of analysed results (unique ResumeIDs). Rows that
+    already exist are merged rather than replaced, their stale postings
+    are deleted, and once a merged row is written its uploader's
+    ResumeScoreSum moves by the score change.
+    """
+    found, unread = batch_get_items(writer.dynamodb, table, [{'ResumeID': r['resume_id']} for r in results])
+    # Without the stored row there is nothing safe to merge with: count it as unwritten
+    unread = {key['ResumeID'] for key in unread}
+    writer.failed[table].update(unread)
+    stored = {item['ResumeID']: item for item in found}
+
+    score_changes = []
+    for result in results:
+        resume_id = result['resume_id']
+        if resume_id in unread:
+            continue
+        old = stored.get(resume_id, {})
+        item = {**old, **result['item'], **{name: old[name] for name in PRESERVED_ATTRIBUTES if name in old}}
+        writer.add(table, item)
+        if index_table:
+            stale = resume_postings(resume_id, json.loads(old['Skills']), old['Score']) if 'Skills' in old else {}
+            fresh = resume_postings(resume_id, result['skills'], item['Score'])
+            for key in stale.keys() - fresh.keys():
+                writer.delete(index_table, stale[key])
+            for row in fresh.values():
+                writer.add(index_table, row)
+        if stats_table is not None and old.get('UserEmail'):
+            score_changes.append((resume_id, old['UserEmail'],
+                                  Decimal(str(item['Score'])) - Decimal(str(old.get('Score', 0)))))
+
+    writer.flush()
+    for resume_id, email, change in score_changes:
+        if change and resume_id not in writer.failed[table]:
+            add_score_change(stats_table, 'resume', email, change)
+
+
+# -------------------------
+# Runner
+# -------------------------
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run(source, extractor='local', workers=PIPELINE_WORKERS, writer=None, output=None,
+        table=RESUME_TABLE, index_table=None, stats_table=None):
+    """
+    Analyse every resume in source. Results go to writer (BatchedWrites:
+    table, plus postings in index_table; stats_table gets the score changes
+    of re-analysed uploads) and/or output (a JSONL file object). Returns
+    the summary dict.
+    """
+    load_extractor(extractor)  # fail fast on a bad --extractor
+    stats = {'files': 0, 'ok': 0, 'failed': 0, 'bytes': 0}
+    extract_ms, analyze_ms, latency_ms = [], [], []
+    ready = {}  # ResumeID -> result, stored WRITE_BATCH_SIZE at a time
+    started = time.perf_counter()
+
+    def store():
+        if ready:
+            store_results(writer, list(ready.values()), table, index_table, stats_table)
+            ready.clear()
+
+    def finished(future):
+        future.finished_at = time.perf_counter()
+
+    def collect(future, submitted):
+        result = future.result()
+        # Submit-to-done, not counting the time the result waited in the queue
+        latency_ms.append(((getattr(future, 'finished_at', None) or time.perf_counter()) - submitted) * 1000)
+        if 'error' in result:
+            stats['failed'] += 1
+            print(f"{result['name']}: {result['error']}", file=sys.stderr)
+            return
+        stats['ok'] += 1
+        extract_ms.append(result['extract_ms'])
+        analyze_ms.append(result['analyze_ms'])
+        if writer:
+            # The same upload twice in one batch would merge with a row read before the first write
+            if result['resume_id'] in ready:
+                store()
+            ready[result['resume_id']] = result
+            if len(ready) == WRITE_BATCH_SIZE:
+                store()
+        if output:
+            output.write(json.dumps(result['item']) + '\n')
+
+    # Bounded queue: at most 2 files per worker are read ahead of the pool
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name, data in open_source(source):
+            stats['files'] += 1
+            stats['bytes'] += len(data)
+            submitted = time.perf_counter()
+            future = pool.submit(analyze_document, extractor, source, name, data)
+            future.add_done_callback(finished)
+            in_flight.append((future, submitted))
+            while len(in_flight) >= workers * 2:
+                collect(*in_flight.popleft())
+        while in_flight:
+            collect(*in_flight.popleft())
+
+    if writer:
+        store()
+        stats['failed'] += len(writer.failed[table])
+        stats['ok'] -= len(writer.failed[table])
+        if index_table:
+            stats['index_failed'] = len(writer.failed[index_table])
+
+    elapsed = time.perf_counter() - started
+    stats.update(
+        seconds=round(elapsed, 2),
+        per_second=round(stats['files'] / elapsed, 1) if elapsed else 0.0,
+        extract_ms_p50=percentile(extract_ms, 50), extract_ms_p95=percentile(extract_ms, 95),
+        analyze_ms_p50=round(percentile(analyze_ms, 50), 2), analyze_ms_p95=round(percentile(analyze_ms, 95), 2),
+        latency_ms_p50=round(percentile(latency_ms, 50), 1), latency_ms_p95=round(percentile(latency_ms, 95), 1),
+        write_calls=writer.calls if writer else 0
+    )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-analyse a resume archive in bulk")
+    parser.add_argument('source', help="directory, .zip file or s3://bucket/prefix")
+    parser.add_argument('--extractor', default='local', help="'local' or module:function")
+    parser.add_argument('--workers', type=int, default=PIPELINE_WORKERS)
+    parser.add_argument('--table', default=RESUME_TABLE)
+    parser.add_argument('--no-index', action='store_true', help="don't update the skill index")
+    parser.add_argument('--output', help="also write result items as JSONL here")
+    parser.add_argument('--dry-run', action='store_true', help="don't write to DynamoDB")
+    args = parser.parse_args()
+
+    writer, index_table, stats_table = None, None, None
+    if not args.dry_run:
+        index_table = None if args.no_index else SKILL_INDEX_TABLE
+        key_attrs = {args.table: ['ResumeID']}
+        if index_table:
+            key_attrs[index_table] = ['Skill', 'ScoreKey']
+        dynamodb = get_resource('dynamodb')
+        writer = BatchedWrites(dynamodb, key_attrs)
+        stats_table = dynamodb.Table(STATS_TABLE)
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        stats = run(args.source, args.extractor, args.workers, writer, output, args.table, index_table, stats_table)
+    finally:
+        if output:
+            output.close()
+
+    print(f"{stats['files']} file(s), {stats['ok']} analysed, {stats['failed']} failed "
+          f"in {stats['seconds']}s ({stats['per_second']} files/s, {args.workers} workers)")
+    print(f"  extract ms  p50 {stats['extract_ms_p50']}  p95 {stats['extract_ms_p95']}")
+    print(f"  analyze ms  p50 {stats['analyze_ms_p50']}  p95 {stats['analyze_ms_p95']}")
+    print(f"  end-to-end ms  p50 {stats['latency_ms_p50']}  p95 {stats['latency_ms_p95']}")
+    if writer:
+        print(f"  {writer.calls} BatchWriteItem call(s), {stats.get('index_failed', 0)} skill index write(s) failed")
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
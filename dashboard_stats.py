@@ -0,0 +1,199 @@
+"""
+Per-user dashboard aggregates.
+
+Each analysis write adds to a single stats record per email (counts and
+score sums), so /api/dashboard_stats is one key lookup. Run this module
+as a script to rebuild the records from existing data:
+
+    python dashboard_stats.py --all --video-table <Lambda 2 DDB_TABLE>
+    python dashboard_stats.py --email someone@example.com
+
+Live writers may keep running: a record that changes while the rebuild
+is scanning is rebuilt again rather than overwritten.
+"""
+import argparse
+import os
+from collections import defaultdict
+from decimal import Decimal
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+
+from aws_clients import get_table
+from dynamo_batch import scan_all
+
+STATS_TABLE = os.environ.get('DASHBOARD_STATS_TABLE', 'UserDashboardStats')
+USERS_TABLE = 'HireFusionTable'
+RESUME_TABLE = 'ResumeAnalysisResults'
+# Video Lambda 2's results table (its DDB_TABLE); the app's
+# InterviewAnalysisResults rows carry no UserEmail and are never counted
+VIDEO_TABLE = os.environ.get('DDB_TABLE')
+RECOMPUTE_ATTEMPTS = 5
+
+KIND_PREFIX = {'resume': 'Resume', 'video': 'Video'}
+
+
+def put_counted_result(table, item, stats_table, kind, score):
+    """
+    Write an analysis result row and add it to the uploader's stats record
+    in one transaction. The row is marked StatsCounted, so a redelivered
+    event or a retried record rewrites it without counting the analysis
+    again. Returns True if this call counted it.
+    """
+    email = item.get('UserEmail')
+    if not email:
+        table.put_item(Item=item)
+        return False
+
+    item = {**item, 'StatsCounted': True}
+    serialize = TypeSerializer().serialize
+    prefix = KIND_PREFIX[kind]
+    try:
+        table.meta.client.transact_write_items(TransactItems=[
+            {'Put': {
+                'TableName': table.name,
+                'Item': {name: serialize(value) for name, value in item.items()},
+                'ConditionExpression': 'attribute_not_exists(StatsCounted)'
+            }},
+            {'Update': {
+                'TableName': stats_table.name,
+                'Key': {'email': serialize(email)},
+                'UpdateExpression': f"ADD {prefix}Count :one, {prefix}ScoreSum :score",
+                'ExpressionAttributeValues': {':one': serialize(1), ':score': serialize(Decimal(str(score)))}
+            }}
+        ])
+        return True
+    except ClientError as e:
+        reasons = e.response.get('CancellationReasons') or [{}]
+        if (e.response['Error']['Code'] != 'TransactionCanceledException'
+                or reasons[0].get('Code') != 'ConditionalCheckFailed'):
+            raise
+
+    # Counted by an earlier delivery: refresh the row, keep the marker
+    table.put_item(Item=item)
+    return False
+
+
+def add_score_change(stats_table, kind, email, change):
+    """Move an already counted analysis's score within its uploader's sum, e.g. after a re-analysis."""
+    stats_table.update_item(
+        Key={'email': email},
+        UpdateExpression=f"ADD {KIND_PREFIX[kind]}ScoreSum :change",
+        ExpressionAttributeValues={':change': Decimal(str(change))}
+    )
+
+
+def stats_from_record(item):
+    """Shape a stats record (or None) into the dashboard response."""
+    item = item or {}
+    stats = {}
+    for kind, prefix in KIND_PREFIX.items():
+        count = int(item.get(f'{prefix}Count', 0))
+        total = float(item.get(f'{prefix}ScoreSum', 0))
+        stats[f'{kind}Count'] = count
+        stats[f'{kind}AvgScore'] = total / count if count else 0
+    return stats
+
+
+def classify(item):
+    """Return (email, kind, score) for an item that counts towards the stats, else None."""
+    # Legacy records in the users table tagged with type/score
+    if item.get('type') in KIND_PREFIX and item.get('email'):
+        return item['email'], item['type'], int(item.get('score', 0))
+    # Analysis results written with the uploader's email
+    if item.get('UserEmail'):
+        if 'ResumeFile' in item:
+            return item['UserEmail'], 'resume', item.get('Score', 0)
+        if item.get('Status') == 'COMPLETED':
+            return item['UserEmail'], 'video', item.get('TotalScore', 0)
+    return None
+
+
+STAT_ATTRS = [f'{prefix}{field}' for prefix in KIND_PREFIX.values() for field in ('Count', 'ScoreSum')]
+
+
+def _tally(source_tables, users=None):
+    totals = defaultdict(lambda: defaultdict(Decimal))
+    for table in source_tables:
+        for item in scan_all(table):
+            entry = classify(item)
+            if not entry or (users and entry[0] not in users):
+                continue
+            user, kind, score = entry
+            totals[user][f'{KIND_PREFIX[kind]}Count'] += 1
+            totals[user][f'{KIND_PREFIX[kind]}ScoreSum'] += Decimal(str(score))
+    return totals
+
+
+def _unchanged_condition(record):
+    # Put only if no live ADD has touched the record since it was read
+    names, values, clauses = {}, {}, []
+    for n, attr in enumerate(STAT_ATTRS):
+        names[f'#a{n}'] = attr
+        if attr in record:
+            values[f':a{n}'] = record[attr]
+            clauses.append(f'#a{n} = :a{n}')
+        else:
+            clauses.append(f'attribute_not_exists(#a{n})')
+    condition = {'ConditionExpression': ' AND '.join(clauses), 'ExpressionAttributeNames': names}
+    if values:
+        condition['ExpressionAttributeValues'] = values
+    return condition
+
+
+def recompute(source_tables, stats_table, email=None):
+    """
+    Rebuild stats records from the source tables; returns the number of users written.
+    Each stats record is read before the scan and replaced only if it is
+    still unchanged, so an analysis counted by a live writer during the
+    scan is not lost: those users are scanned again.
+    """
+    users = {email} if email else None
+    written = 0
+    for _ in range(RECOMPUTE_ATTEMPTS):
+        if users:
+            before = {user: stats_table.get_item(Key={'email': user}).get('Item', {}) for user in users}
+        else:
+            before = {record['email']: record for record in scan_all(stats_table)}
+        totals = _tally(source_tables, users)
+        for user in users or ():
+            # A user with no analyses left gets a zeroed record
+            totals.setdefault(user, defaultdict(Decimal))
+
+        changed = set()
+        for user, values in totals.items():
+            record = {'email': user}
+            for prefix in KIND_PREFIX.values():
+                record[f'{prefix}Count'] = int(values[f'{prefix}Count'])
+                record[f'{prefix}ScoreSum'] = values[f'{prefix}ScoreSum']
+            try:
+                stats_table.put_item(Item=record, **_unchanged_condition(before.get(user, {})))
+                written += 1
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                changed.add(user)
+        if not changed:
+            return written
+        users = changed
+    raise RuntimeError(f"Stats kept changing during the rebuild for: {', '.join(sorted(users))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill per-user dashboard stats records")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--email', help="recompute a single user")
+    target.add_argument('--all', action='store_true', help="recompute every user")
+    parser.add_argument('--stats-table', default=STATS_TABLE)
+    parser.add_argument('--video-table', default=VIDEO_TABLE, required=VIDEO_TABLE is None,
+                        help="video Lambda 2's results table (default: $DDB_TABLE)")
+    parser.add_argument('--source-tables', nargs='+', help="override every source table")
+    args = parser.parse_args()
+
+    source_tables = args.source_tables or [USERS_TABLE, RESUME_TABLE, args.video_table]
+    written = recompute([get_table(name) for name in source_tables], get_table(args.stats_table), args.email)
+    print(f"Recomputed dashboard stats for {written} user(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import random
+import time
+
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+
+BATCH_GET_MAX_KEYS = 100  # DynamoDB BatchGetItem limit per request
+BATCH_WRITE_MAX_ITEMS = 25  # DynamoDB BatchWriteItem limit per request
+TRANSACT_MAX_ITEMS = 100  # DynamoDB TransactWriteItems limit per request
+THROTTLE_CODES = {'ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded'}
+# Cancellation reasons worth another attempt: capacity, or a concurrent transaction on the same item
+RETRYABLE_CANCEL_CODES = {'ProvisionedThroughputExceeded', 'ThrottlingError', 'TransactionConflict'}
+MAX_ATTEMPTS = 8
+BASE_DELAY = 0.05  # seconds, doubled on every retry
+
+
+def backoff_delay(attempt, base_delay=BASE_DELAY, cap=2.0):
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(cap, base_delay * (2 ** attempt)))
+
+
+def scan_all(table, **kwargs):
+    # Follows LastEvaluatedKey so no page is skipped
+    while True:
+        response = table.scan(**kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def batch_get_items(dynamodb, table_name, keys, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY):
+    """
+    Fetch many items from one table with BatchGetItem in chunks of 100 keys.
+    UnprocessedKeys (throttling, 16 MB response cap) are retried with
+    backoff. Returns (items, unprocessed_keys); the second list is empty
+    unless the retries ran out.
+    """
+    unique = list({tuple(sorted(key.items())): key for key in keys}.values())
+    items, unprocessed = [], []
+
+    for start in range(0, len(unique), BATCH_GET_MAX_KEYS):
+        pending = {table_name: {'Keys': unique[start:start + BATCH_GET_MAX_KEYS]}}
+        for attempt in range(max_attempts):
+            response = dynamodb.batch_get_item(RequestItems=pending)
+            items.extend(response.get('Responses', {}).get(table_name, []))
+            pending = response.get('UnprocessedKeys') or {}
+            if not pending:
+                break
+            if attempt + 1 < max_attempts:
+                time.sleep(backoff_delay(attempt, base_delay))
+        if pending:
+            unprocessed.extend(pending[table_name]['Keys'])
+
+    return items, unprocessed
+
+
+def batch_write_requests(dynamodb, table_name, requests, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY):
+    """
+    Send up to 25 PutRequest/DeleteRequest entries with one BatchWriteItem
+    call. UnprocessedItems and whole-request throttling are retried with
+    backoff. Returns the requests still unprocessed when the retries ran
+    out (empty on success). Keys must be unique within the call.
+    """
+    if len(requests) > BATCH_WRITE_MAX_ITEMS:
+        raise ValueError(f"At most {BATCH_WRITE_MAX_ITEMS} items per BatchWriteItem call")
+
+    pending = {table_name: list(requests)}
+    for attempt in range(max_attempts):
+        try:
+            response = dynamodb.batch_write_item(RequestItems=pending)
+            pending = response.get('UnprocessedItems') or {}
+        except ClientError as e:
+            if e.response['Error']['Code'] not in THROTTLE_CODES:
+                raise
+        if not pending:
+            return []
+        if attempt + 1 < max_attempts:
+            time.sleep(backoff_delay(attempt, base_delay))
+    return pending[table_name]
+
+
+def put_new_items(dynamodb, table_name, items, key_attr, max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY):
+    """
+    Put up to 100 items with one TransactWriteItems call, each conditioned
+    on attribute_not_exists(key_attr), so rows already in the table are
+    left alone. A transaction is all or nothing: when it is cancelled, the
+    items whose key is taken are set aside and the rest are sent again;
+    throttling and transaction conflicts are retried with backoff.
+    Returns (existing, unwritten): the items skipped because their key was
+    taken, and those still unwritten when the retries ran out.
+    Keys must be unique within the call.
+    A transactional put costs twice the write capacity of a batched one
+    (2 WCU per KB instead of 1); that is the price of never overwriting.
+    """
+    if len(items) > TRANSACT_MAX_ITEMS:
+        raise ValueError(f"At most {TRANSACT_MAX_ITEMS} items per TransactWriteItems call")
+
+    serialize = TypeSerializer().serialize
+    pending, existing = list(items), []
+    for attempt in range(max_attempts):
+        if not pending:
+            break
+        try:
+            dynamodb.meta.client.transact_write_items(TransactItems=[{'Put': {
+                'TableName': table_name,
+                'Item': {name: serialize(value) for name, value in item.items()},
+                'ConditionExpression': 'attribute_not_exists(#key)',
+                'ExpressionAttributeNames': {'#key': key_attr}
+            }} for item in pending])
+            return existing, []
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            reasons = [reason.get('Code') for reason in e.response.get('CancellationReasons') or []]
+            if code == 'TransactionCanceledException' and len(reasons) == len(pending):
+                if set(reasons) - {'None', 'ConditionalCheckFailed'} - RETRYABLE_CANCEL_CODES:
+                    raise
+                existing.extend(item for item, reason in zip(pending, reasons) if reason == 'ConditionalCheckFailed')
+                pending = [item for item, reason in zip(pending, reasons) if reason != 'ConditionalCheckFailed']
+                if not set(reasons) & RETRYABLE_CANCEL_CODES:
+                    continue  # only taken keys: send the rest straight away
+            elif code not in THROTTLE_CODES:
+                raise
+        if attempt + 1 < max_attempts:
+            time.sleep(backoff_delay(attempt, base_delay))
+    return existing, pending
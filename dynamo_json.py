@@ -0,0 +1,33 @@
+import base64
+from decimal import Decimal
+
+from boto3.dynamodb.types import Binary
+from flask.json.provider import DefaultJSONProvider
+
+
+def dynamo_default(obj):
+    """
+    json.dumps hook for the types boto3 hands back from DynamoDB.
+    Called by the encoder only for values it can't serialize itself, so
+    items are written out as they are, without a converted copy first.
+    """
+    if isinstance(obj, Decimal):
+        # Integral numbers stay integers ("Score": 85, not 85.0)
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        # String/number sets (SS/NS) are sorted so responses are stable
+        try:
+            return sorted(obj)
+        except TypeError:
+            return list(obj)
+    if isinstance(obj, Binary):
+        obj = obj.value
+    if isinstance(obj, (bytes, bytearray)):
+        return base64.b64encode(obj).decode('ascii')
+    return DefaultJSONProvider.default(obj)
+
+
+class DynamoJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes DynamoDB items (Decimal, sets, Binary) directly."""
+
+    default = staticmethod(dynamo_default)
@@ -0,0 +1,56 @@
+import io
+import zipfile
+from xml.etree import ElementTree
+
+# pypdf is optional: without it PDFs always go to Textract
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def extract_docx_text(data):
+    """Read paragraph text straight out of word/document.xml."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        xml = archive.read('word/document.xml')
+
+    lines = []
+    for paragraph in ElementTree.fromstring(xml).iter(f'{WORD_NS}p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f'{WORD_NS}t' and node.text:
+                parts.append(node.text)
+            elif node.tag == f'{WORD_NS}tab':
+                parts.append('\t')
+            elif node.tag in (f'{WORD_NS}br', f'{WORD_NS}cr'):
+                parts.append('\n')
+        lines.append(''.join(parts))
+    return '\n'.join(lines)
+
+
+def extract_pdf_text(data):
+    """Read the embedded text layer of a born-digital PDF (empty for scans)."""
+    if PdfReader is None:
+        return ""
+    reader = PdfReader(io.BytesIO(data))
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def extract_local_text(data, filename):
+    """
+    Try to get resume text without OCR.
+    Returns (text, method); method is None when nothing usable was found
+    and the caller should fall back to Textract.
+    """
+    ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    try:
+        if ext == 'docx':
+            return extract_docx_text(data), 'docx-xml'
+        if ext == 'pdf' and PdfReader is not None:
+            return extract_pdf_text(data), 'pdf-text-layer'
+    except Exception as e:
+        # Corrupt or encrypted files are left to Textract
+        print(f"Local extraction failed for {filename}: {str(e)}")
+    return "", None
@@ -0,0 +1,92 @@
+import contextvars
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from stage_timing import log
+
+# Upper bound on records handled at once inside a single invocation
+MAX_RECORD_WORKERS = int(os.environ.get('MAX_RECORD_WORKERS', '8'))
+
+
+class RecordsFailed(Exception):
+    """Raised for a failed record outside SQS, so Lambda retries the event."""
+
+    def __init__(self, results):
+        self.results = results
+        failed = [r for r in results if r['status'] == 'FAILED']
+        super().__init__(f"{len(failed)} of {len(results)} record(s) failed: "
+                         + "; ".join(f"{r['recordId']}: {r['error']}" for r in failed))
+
+
+def iter_records(event):
+    """
+    Yield (record_id, record, error) for every record in a Lambda event.
+    SQS messages that wrap an S3 notification are unwrapped, and their
+    messageId is used as the id so a failed record can be retried alone;
+    a message whose body can't be read comes back with the error instead.
+    """
+    for index, record in enumerate(event.get('Records', [])):
+        if record.get('eventSource') == 'aws:sqs':
+            try:
+                # s3:TestEvent messages carry no Records
+                inner_records = json.loads(record['body']).get('Records', [])
+            except (ValueError, AttributeError) as e:
+                yield record['messageId'], None, f"Malformed message body: {e}"
+                continue
+            for inner in inner_records:
+                yield record['messageId'], inner, None
+        else:
+            yield str(index), record, None
+
+
+def from_sqs(event):
+    return any(record.get('eventSource') == 'aws:sqs' for record in event.get('Records', []))
+
+
+def process_records(event, handle_record, max_workers=None):
+    """
+    Run handle_record over every record through a bounded thread pool.
+    handle_record returns a dict of result fields or raises on failure.
+    For SQS the response reports each record and lists failed ids under
+    batchItemFailures (the partial-batch response format), so only those
+    messages come back. Direct S3 and SNS invocations have no such format:
+    any failed record raises RecordsFailed and Lambda retries the whole
+    event, which the idempotent writes downstream make safe.
+    """
+    records = list(iter_records(event))
+    if not records:
+        return {'statusCode': 200, 'body': json.dumps({'results': []}), 'batchItemFailures': []}
+
+    def run(entry):
+        record_id, record, error = entry
+        try:
+            if error:
+                raise ValueError(error)
+            result = handle_record(record) or {}
+            return {'recordId': record_id, 'status': 'SUCCEEDED', **result}
+        except Exception as e:
+            log('ERROR', 'Record failed', record_id=record_id, error=str(e))
+            return {'recordId': record_id, 'status': 'FAILED', 'error': str(e)}
+
+    workers = max(1, min(max_workers or MAX_RECORD_WORKERS, len(records)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Each record runs in its own copy of the caller's context (request id for stage_timing)
+        contexts = [contextvars.copy_context() for _ in records]
+        results = list(pool.map(lambda context, entry: context.run(run, entry), contexts, records))
+
+    failed = list(dict.fromkeys(r['recordId'] for r in results if r['status'] == 'FAILED'))
+    if failed and not from_sqs(event):
+        raise RecordsFailed(results)
+    if not failed:
+        status_code = 200
+    elif len(failed) == len(set(r['recordId'] for r in results)):
+        status_code = 500
+    else:
+        status_code = 207
+
+    return {
+        'statusCode': status_code,
+        'body': json.dumps({'results': results}),
+        'batchItemFailures': [{'itemIdentifier': record_id} for record_id in failed]
+    }
@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+
+from dynamo_json import dynamo_default
+
+# redis is optional: only needed for the shared cross-worker backend
+try:
+    import redis
+except ImportError:
+    redis = None
+
+RESULT_CACHE_BACKEND = os.environ.get('RESULT_CACHE_BACKEND', 'memory')
+RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+
+_MISSING = object()
+
+
+def estimate_size(value):
+    # Rough serialized footprint, good enough to keep the cache within its budget
+    return len(json.dumps(value, default=repr))
+
+
+class InMemoryLRUCache:
+    """Per-process LRU bounded by an estimated byte budget, with optional per-entry TTL."""
+
+    def __init__(self, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, size, expires_at or None)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.size -= size
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = (value, size, expires_at)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'entries': len(self._entries), 'bytes': self.size,
+                    'max_bytes': self.max_bytes, 'evictions': self.evictions}
+
+
+class RedisCache:
+    """Shared backend so every gunicorn worker sees the same entries; eviction is Redis' own policy."""
+
+    def __init__(self, url=REDIS_URL, prefix='hirefusion:'):
+        if redis is None:
+            raise RuntimeError("RESULT_CACHE_BACKEND=redis needs the redis package")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        data = self.client.get(self.prefix + key)
+        # Non-integral numbers come back as Decimal, the way boto3 returns them
+        return _MISSING if data is None else json.loads(data, parse_float=Decimal)
+
+    def set(self, key, value, ttl=None):
+        # JSON rather than pickle: anyone able to write to Redis could otherwise run code here
+        data = json.dumps(value, default=dynamo_default)
+        if ttl is None:
+            self.client.set(self.prefix + key, data)
+        else:
+            self.client.set(self.prefix + key, data, px=max(1, int(ttl * 1000)))
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def stats(self):
+        return {'backend': 'redis'}
+
+
+class ReadThroughCache:
+    """
+    get(key, loader, ttl_for): return the cached value or call loader() and
+    cache its result for ttl_for(value) seconds (None = forever, 0 = don't cache).
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, loader, ttl_for):
+        value = self.backend.get(key)
+        if value is not _MISSING:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._lock:
+            self.misses += 1
+        value = loader()
+        ttl = ttl_for(value)
+        if ttl != 0:
+            self.backend.set(key, value, ttl)
+        return value
+
+    def invalidate(self, key):
+        self.backend.delete(key)
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {'hits': hits, 'misses': misses,
+                'hit_rate': round(hits / total, 4) if total else 0.0, **self.backend.stats()}
+
+
+def make_cache(backend=RESULT_CACHE_BACKEND):
+    if backend == 'redis':
+        return ReadThroughCache(RedisCache())
+    return ReadThroughCache(InMemoryLRUCache())
@@ -0,0 +1,108 @@
+import threading
+import time
+
+
+class _Watch:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.waiters = 0
+        self.idle_since = None
+        self.thread = None
+
+
+class ResultWatcher:
+    """
+    Collapses many waits on the same analysis id into one backend read loop.
+
+    fetch(key) reads the current item (or None); is_complete(item) decides
+    when to stop. Each key gets one polling thread with exponential backoff,
+    shared by every request waiting on it; the thread exits once the result
+    is in, the deadline passes, or nobody has been waiting for idle_grace s.
+    close() stops every thread and releases their waiters.
+    """
+
+    def __init__(self, fetch, is_complete, interval=1.0, max_interval=5.0, max_watch=300.0, idle_grace=10.0):
+        self.fetch = fetch
+        self.is_complete = is_complete
+        self.interval = interval
+        self.max_interval = max_interval
+        self.max_watch = max_watch
+        self.idle_grace = idle_grace
+        self._lock = threading.Lock()
+        self._watches = {}
+        self._closed = threading.Event()
+        self.backend_reads = 0
+
+    def wait(self, key, timeout):
+        """Block up to timeout seconds; return the completed item or None."""
+        with self._lock:
+            if self._closed.is_set():
+                return None
+            watch = self._watches.get(key)
+            if watch is None:
+                watch = self._watches[key] = _Watch()
+                watch.thread = threading.Thread(target=self._run, args=(key, watch), daemon=True)
+                watch.thread.start()
+            watch.waiters += 1
+            watch.idle_since = None
+
+        try:
+            watch.done.wait(timeout)
+            return watch.result
+        finally:
+            with self._lock:
+                watch.waiters -= 1
+                if not watch.waiters:
+                    watch.idle_since = time.monotonic()
+
+    def active(self):
+        with self._lock:
+            return len(self._watches)
+
+    def close(self, timeout=5.0):
+        """Stop every read loop (waiters get None) and wait for the threads to exit."""
+        with self._lock:
+            self._closed.set()
+            watches = list(self._watches.values())
+            self._watches.clear()
+        for watch in watches:
+            watch.done.set()
+        for watch in watches:
+            watch.thread.join(timeout)
+
+    def _finish(self, key, watch, result=None):
+        with self._lock:
+            watch.result = result
+            if self._watches.get(key) is watch:
+                del self._watches[key]
+        watch.done.set()
+
+    def _run(self, key, watch):
+        deadline = time.monotonic() + self.max_watch
+        delay = self.interval
+        while True:
+            try:
+                with self._lock:
+                    self.backend_reads += 1
+                item = self.fetch(key)
+                if item is not None and self.is_complete(item):
+                    return self._finish(key, watch, item)
+            except Exception as e:
+                print(f"Result watch for {key} failed to read: {str(e)}")
+
+            # Decide and unregister under one lock so a new waiter can't join a dying watch
+            now = time.monotonic()
+            with self._lock:
+                abandoned = watch.idle_since is not None and now - watch.idle_since >= self.idle_grace
+                stop = abandoned or now >= deadline or self._closed.is_set()
+                if stop and self._watches.get(key) is watch:
+                    del self._watches[key]
+            if stop:
+                watch.done.set()
+                return
+
+            if self._closed.wait(delay):
+                watch.done.set()
+                return
+            delay = min(delay * 1.5, self.max_interval)
@@ -1,127 +1,274 @@
 import json
+import os
 import boto3
+import threading
 import time
+import urllib.parse
+from dashboard_stats import STATS_TABLE, put_counted_result
+from local_extract import extract_local_text
+from record_batch import process_records
+from resume_scoring import analyze_resume_text, generate_score, result_item
+from skill_index import SKILL_INDEX_TABLE, index_resume
+from stage_timing import bind, log, request_context, span
 
 # AWS Clients
 s3 = boto3.client('s3')
 textract = boto3.client('textract')
 dynamodb = boto3.resource('dynamodb')
 table = dynamodb.Table('ResumeAnalysisResults')
+stats_table = dynamodb.Table(STATS_TABLE)
+skill_index_table = dynamodb.Table(SKILL_INDEX_TABLE)
 
-# Skills list
-SKILL_KEYWORDS = [
-    "AWS", "Azure", "GCP", "Google Cloud", "Cloud Computing", "Docker", "Kubernetes", "Terraform",
-    "Ansible", "CI/CD", "Jenkins", "GitHub Actions", "CloudFormation", "Python", "Java", "JavaScript",
-    "TypeScript", "C++", "C#", "Go", "Ruby", "PHP", "Swift", "React", "Angular", "Vue", "Next.js", "Nuxt.js",
-    "Spring Boot", "Django", "Flask", "Express", "SQL", "MySQL", "PostgreSQL", "NoSQL", "MongoDB", "DynamoDB",
-    "Redis", "Elasticsearch", "Machine Learning", "Deep Learning", "TensorFlow", "Keras", "PyTorch",
-    "Scikit-learn", "Pandas", "NumPy", "Data Science", "NLP", "Computer Vision", "Git", "GitHub", "Bitbucket",
-    "Linux", "Networking", "REST API", "GraphQL", "Microservices", "Agile", "Scrum"
-]
+# Two-phase Textract: when a topic is configured the S3 invocation only starts
+# the job and the SNS completion notification finishes the analysis.
+TEXTRACT_SNS_TOPIC_ARN = os.environ.get('TEXTRACT_SNS_TOPIC_ARN')
+TEXTRACT_ROLE_ARN = os.environ.get('TEXTRACT_ROLE_ARN')
+
+# Content-hash dedup cache: identical re-uploads reuse the earlier analysis.
+# Entries expire through the table's DynamoDB TTL attribute (ExpiresAt).
+RESUME_CACHE_TABLE = os.environ.get('RESUME_CACHE_TABLE')
+RESUME_CACHE_TTL_DAYS = int(os.environ.get('RESUME_CACHE_TTL_DAYS', '30'))
+RESUME_CACHE_MAX_TEXT = 300_000  # keep cache items under the 400 KB item limit
+cache_table = dynamodb.Table(RESUME_CACHE_TABLE) if RESUME_CACHE_TABLE else None
+cache_stats = {'hits': 0, 'misses': 0}
+cache_stats_lock = threading.Lock()
+
+# Born-digital PDF/DOCX files are read in-process before falling back to Textract
+LOCAL_EXTRACT_MAX_BYTES = int(os.environ.get('LOCAL_EXTRACT_MAX_BYTES', str(20 * 1024 * 1024)))
+LOCAL_EXTRACT_MIN_CHARS = int(os.environ.get('LOCAL_EXTRACT_MIN_CHARS', '100'))
 
 def lambda_handler(event, context):
-    try:
-        # Get S3 file details
-        bucket_name = event['Records'][0]['s3']['bucket']['name']
-        resume_file = event['Records'][0]['s3']['object']['key']
-        print(f"Processing: {resume_file} from {bucket_name}")
+    # Every record of a batched S3/SQS/SNS notification is processed
+    with request_context(getattr(context, 'aws_request_id', None)):
+        return process_records(event, process_record)
+
+def process_record(record):
+    # Phase two: Textract finished and published to SNS
+    if 'Sns' in record:
+        return handle_textract_completion(json.loads(record['Sns']['Message']))
 
-        # ⬇ Retrieve resume_id from metadata
+    # Get S3 file details
+    bucket_name = record['s3']['bucket']['name']
+    resume_file = urllib.parse.unquote_plus(record['s3']['object']['key'])
+    log('INFO', 'Processing resume', bucket=bucket_name, key=resume_file)
+
+    # ⬇ Retrieve resume_id from metadata
+    with span('s3_head'):
         head = s3.head_object(Bucket=bucket_name, Key=resume_file)
-        resume_id = head['Metadata'].get('resumeid')
-        if not resume_id:
-            raise Exception(" resumeid metadata missing from S3 object.")
+    resume_id = head['Metadata'].get('resumeid')
+    if not resume_id:
+        raise Exception(" resumeid metadata missing from S3 object.")
+    bind(analysis_id=resume_id)
+    email = head['Metadata'].get('useremail')
+
+    # Same bytes uploaded before: write the cached analysis, skip Textract
+    content_hash = content_hash_of(head)
+    with span('cache_lookup') as stage:
+        cached = lookup_cached_analysis(content_hash)
+        stage['hit'] = bool(cached)
+    if cached:
+        store_in_dynamodb(
+            resume_id, resume_file, cached['Score'], json.loads(cached['Skills']),
+            cached['ProjectDetected'], cached['InternshipDetected'],
+            cached['InternshipType'], cached['CertificationsCount'],
+            extraction={'method': 'cache'}, email=email
+        )
+        return {'message': 'Success', 'resume_id': resume_id, 'cache': 'HIT'}
+
+    # Fast path: embedded text layer / DOCX XML, no OCR needed
+    text, extraction = extract_text_locally(bucket_name, resume_file, head)
+    if extraction:
+        analyze_and_store(resume_id, resume_file, text, content_hash, extraction, email)
+        return {'message': 'Success', 'resume_id': resume_id, 'extraction': extraction['method']}
+
+    # Phase one: hand the job to Textract and return straight away
+    if TEXTRACT_SNS_TOPIC_ARN:
+        with span('textract_start'):
+            job_id = start_text_detection(bucket_name, resume_file, resume_id)
+        return {'message': 'Textract job started', 'resume_id': resume_id, 'job_id': job_id}
+
+    # Inline fallback: wait for Textract inside this invocation
+    started = time.perf_counter()
+    text = extract_text_from_pdf_s3(bucket_name, resume_file)
+    extraction = {'method': 'textract-inline', 'ms': round((time.perf_counter() - started) * 1000)}
+    analyze_and_store(resume_id, resume_file, text, content_hash, extraction, email)
+
+    return {'message': 'Success', 'resume_id': resume_id}
+
+def handle_textract_completion(message):
+    resume_id = message['JobTag']
+    resume_file = message['DocumentLocation']['S3ObjectName']
+    bind(analysis_id=resume_id)
+    log('INFO', 'Textract job finished', job_id=message['JobId'], key=resume_file, status=message['Status'])
+
+    if message['Status'] != 'SUCCEEDED':
+        raise Exception(f"Textract job {message['JobId']} ended with status {message['Status']}")
+
+    text = read_text_detection(message['JobId'])
+    with span('s3_head'):
+        head = s3.head_object(Bucket=message['DocumentLocation']['S3Bucket'], Key=resume_file)
+    analyze_and_store(
+        resume_id, resume_file, text, content_hash_of(head), {'method': 'textract-async'},
+        head['Metadata'].get('useremail')
+    )
+
+    return {'message': 'Success', 'resume_id': resume_id}
+
+def extract_text_locally(bucket_name, key, head):
+    # Returns (text, extraction) or ("", None) when Textract is still needed
+    if head.get('ContentLength', 0) > LOCAL_EXTRACT_MAX_BYTES:
+        return "", None
+    if not key.lower().endswith(('.pdf', '.docx')):
+        return "", None
+
+    started = time.perf_counter()
+    with span('local_extract') as stage:
+        data = s3.get_object(Bucket=bucket_name, Key=key)['Body'].read()
+        text, method = extract_local_text(data, key)
+        stage.update(bytes=len(data), chars=len(text), method=method)
+    elapsed_ms = round((time.perf_counter() - started) * 1000)
 
-        # Extract text using Textract
-        text = extract_text_from_pdf_s3(bucket_name, resume_file)
+    # Scanned PDFs have no (or a token) text layer
+    if not method or len(text.strip()) < LOCAL_EXTRACT_MIN_CHARS:
+        log('INFO', 'Local extraction not usable, using Textract', key=key, chars=len(text.strip()))
+        return "", None
+
+    return text, {'method': method, 'ms': elapsed_ms}
+
+def analyze_and_store(resume_id, resume_file, text, content_hash=None, extraction=None, email=None):
+    with span('skill_matching') as stage:
         skills = analyze_resume_text(text)
+        stage['skills'] = len(skills)
+    with span('scoring'):
         score, proj, intern, intern_type, certs = generate_score(skills, text)
 
-        # Store result with correct resume_id
-        store_in_dynamodb(
-            resume_id, resume_file, score, skills, proj, intern, intern_type, certs
-        )
+    # Store result with correct resume_id
+    store_in_dynamodb(
+        resume_id, resume_file, score, skills, proj, intern, intern_type, certs, extraction, email
+    )
 
-        return {
-            'statusCode': 200,
-            'body': json.dumps({'message': 'Success', 'resume_id': resume_id})
-        }
+    # Only cache real extractions; an empty text usually means Textract failed
+    if content_hash and text:
+        cache_analysis(content_hash, text, score, skills, proj, intern, intern_type, certs)
 
-    except Exception as e:
-        print(f"Lambda Error: {str(e)}")
-        return {'statusCode': 500, 'body': json.dumps({'error': str(e)})}
+def content_hash_of(head):
+    # S3 ETag is the MD5 of single-part uploads (presigned PUT) and stable per content
+    etag = head.get('ETag', '').strip('"')
+    return f"etag:{etag}" if etag else None
+
+def count_cache(hit):
+    with cache_stats_lock:
+        cache_stats['hits' if hit else 'misses'] += 1
+        hits, misses = cache_stats['hits'], cache_stats['misses']
+    log('DEBUG', f"Resume cache {'hit' if hit else 'miss'}", hits=hits, misses=misses)
+
+def lookup_cached_analysis(content_hash):
+    if not cache_table or not content_hash:
+        return None
+
+    item = cache_table.get_item(Key={'ContentHash': content_hash}).get('Item')
+    # TTL deletion is lazy, so expired entries can still be returned for a while
+    if not item or int(item.get('ExpiresAt', 0)) < time.time():
+        count_cache(False)
+        return None
+
+    count_cache(True)
+    return item
+
+def cache_analysis(content_hash, text, score, skills, project_flag, internship_flag, internship_type, cert_count):
+    if not cache_table:
+        return
+
+    item = {
+        'ContentHash': content_hash,
+        'Score': score,
+        'Skills': json.dumps(skills),
+        'ProjectDetected': project_flag,
+        'InternshipDetected': internship_flag,
+        'InternshipType': internship_type or "None",
+        'CertificationsCount': cert_count,
+        'ExpiresAt': int(time.time()) + RESUME_CACHE_TTL_DAYS * 86400
+    }
+    if len(text) <= RESUME_CACHE_MAX_TEXT:
+        item['Text'] = text
 
-def extract_text_from_pdf_s3(bucket_name, key):
     try:
-        response = textract.start_document_text_detection(
-            DocumentLocation={'S3Object': {'Bucket': bucket_name, 'Name': key}}
-        )
-        job_id = response['JobId']
+        with span('dynamodb_write', op='cache'):
+            cache_table.put_item(Item=item)
+    except Exception as e:
+        # The analysis is already stored; a cache write failure is not fatal
+        log('WARNING', 'Resume cache write failed', error=str(e))
 
-        # Wait for Textract to complete
-        while True:
-            result = textract.get_document_text_detection(JobId=job_id)
-            if result['JobStatus'] in ['SUCCEEDED', 'FAILED']:
-                break
-            time.sleep(2)
+def start_text_detection(bucket_name, key, resume_id):
+    response = textract.start_document_text_detection(
+        DocumentLocation={'S3Object': {'Bucket': bucket_name, 'Name': key}},
+        NotificationChannel={
+            'SNSTopicArn': TEXTRACT_SNS_TOPIC_ARN,
+            'RoleArn': TEXTRACT_ROLE_ARN
+        },
+        JobTag=resume_id  # links the completion notification back
+    )
+    return response['JobId']
 
-        if result['JobStatus'] == 'FAILED':
-            return ""
+def read_text_detection(job_id, result=None):
+    with span('textract_paging', job_id=job_id) as stage:
+        if result is None:
+            result = textract.get_document_text_detection(JobId=job_id)
 
-        text = ""
+        lines = []
+        pages = 1
         while True:
             for block in result['Blocks']:
                 if block['BlockType'] == 'LINE':
-                    text += block['Text'] + '\n'
+                    lines.append(block['Text'] + '\n')
 
             if 'NextToken' in result:
                 result = textract.get_document_text_detection(JobId=job_id, NextToken=result['NextToken'])
+                pages += 1
             else:
                 break
 
-        return text
+        stage.update(pages=pages, lines=len(lines))
+    return "".join(lines)
+
+def extract_text_from_pdf_s3(bucket_name, key):
+    try:
+        response = textract.start_document_text_detection(
+            DocumentLocation={'S3Object': {'Bucket': bucket_name, 'Name': key}}
+        )
+        job_id = response['JobId']
+
+        # Wait for Textract to complete
+        with span('textract_wait', job_id=job_id):
+            while True:
+                result = textract.get_document_text_detection(JobId=job_id)
+                if result['JobStatus'] in ['SUCCEEDED', 'FAILED']:
+                    break
+                time.sleep(2)
+
+        if result['JobStatus'] == 'FAILED':
+            return ""
+
+        return read_text_detection(job_id, result)
     except Exception as e:
-        print(f"Textract Error: {str(e)}")
+        log('ERROR', 'Textract error', error=str(e))
         return ""
 
-def analyze_resume_text(text):
-    return list(set(skill for skill in SKILL_KEYWORDS if skill.lower() in text.lower()))
-
-def generate_score(skills, text):
-    text_lower = text.lower()
-    project_flag = "project" in text_lower
-    internship_flag = False
-    internship_type = None
-
-    if "internship" in text_lower:
-        internship_flag = True
-        internship_type = "internship"
-    elif "industry experience" in text_lower:
-        internship_flag = True
-        internship_type = "industry experience"
-
-    cert_count = text_lower.count("certificate") + text_lower.count("certification")
-
-    score = 10 + len(skills) * 3
-    if project_flag:
-        score += 10
-    if internship_flag:
-        score += 10
-    score += cert_count * 5
-
-    return min(score, 100), project_flag, internship_flag, internship_type, cert_count
-
-def store_in_dynamodb(resume_id, resume_file, score, skills, project_flag, internship_flag, internship_type, cert_count):
-    table.put_item(
-        Item={
-            'ResumeID': resume_id,
-            'ResumeFile': resume_file,
-            'Score': score,
-            'Skills': json.dumps(skills),
-            'ProjectDetected': project_flag,
-            'InternshipDetected': internship_flag,
-            'InternshipType': internship_type or "None",
-            'CertificationsCount': cert_count
-        }
+def store_in_dynamodb(resume_id, resume_file, score, skills, project_flag, internship_flag, internship_type, cert_count,
+                      extraction=None, email=None):
+    item = result_item(
+        resume_id, resume_file, score, skills, project_flag, internship_flag, internship_type, cert_count, extraction
     )
+    if email:
+        item['UserEmail'] = email
+
+    # Result row and the uploader's dashboard aggregates in one transaction;
+    # a redelivered record or a cache hit on the same ResumeID is not counted twice
+    with span('dynamodb_write', op='result'):
+        put_counted_result(table, item, stats_table, 'resume', score)
+
+    # Postings for the skill search; Skills above stays the source of truth
+    if skills:
+        with span('dynamodb_write', op='skill_index'):
+            index_resume(skill_index_table, resume_id, skills, score)
 
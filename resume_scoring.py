@@ -0,0 +1,73 @@
+"""
+Resume scoring with no AWS dependencies, shared by the S3-triggered Lambda
+and the offline bulk pipeline (bulk_resume_pipeline.py).
+"""
+import json
+
+from skill_matcher import SkillMatcher
+from text_features import extract_text_features
+
+# Skills list
+SKILL_KEYWORDS = [
+    "AWS", "Azure", "GCP", "Google Cloud", "Cloud Computing", "Docker", "Kubernetes", "Terraform",
+    "Ansible", "CI/CD", "Jenkins", "GitHub Actions", "CloudFormation", "Python", "Java", "JavaScript",
+    "TypeScript", "C++", "C#", "Go", "Ruby", "PHP", "Swift", "React", "Angular", "Vue", "Next.js", "Nuxt.js",
+    "Spring Boot", "Django", "Flask", "Express", "SQL", "MySQL", "PostgreSQL", "NoSQL", "MongoDB", "DynamoDB",
+    "Redis", "Elasticsearch", "Machine Learning", "Deep Learning", "TensorFlow", "Keras", "PyTorch",
+    "Scikit-learn", "Pandas", "NumPy", "Data Science", "NLP", "Computer Vision", "Git", "GitHub", "Bitbucket",
+    "Linux", "Networking", "REST API", "GraphQL", "Microservices", "Agile", "Scrum"
+]
+
+# Compiled once per process (Lambda container or pipeline worker)
+SKILL_MATCHER = SkillMatcher(SKILL_KEYWORDS)
+
+
+def analyze_resume_text(text):
+    return SKILL_MATCHER.find_all(text)
+
+
+def generate_score(skills, text):
+    features = extract_text_features(text)
+    project_flag = features["project"] > 0
+    internship_flag = False
+    internship_type = None
+
+    if features["internship"]:
+        internship_flag = True
+        internship_type = "internship"
+    elif features["industry experience"]:
+        internship_flag = True
+        internship_type = "industry experience"
+
+    cert_count = features["certificate"] + features["certification"]
+
+    score = 10 + len(skills) * 3
+    if project_flag:
+        score += 10
+    if internship_flag:
+        score += 10
+    score += cert_count * 5
+
+    return min(score, 100), project_flag, internship_flag, internship_type, cert_count
+
+
+def result_item(resume_id, resume_file, score, skills, project_flag, internship_flag, internship_type, cert_count,
+                extraction=None):
+    """The ResumeAnalysisResults item for one analysed resume."""
+    item = {
+        'ResumeID': resume_id,
+        'ResumeFile': resume_file,
+        'Score': score,
+        'Skills': json.dumps(skills),
+        'ProjectDetected': project_flag,
+        'InternshipDetected': internship_flag,
+        'InternshipType': internship_type or "None",
+        'CertificationsCount': cert_count
+    }
+    # Which extractor produced the text, so the latency saved can be measured
+    if extraction:
+        item['ExtractionMethod'] = extraction['method']
+        if 'ms' in extraction:
+            item['ExtractionMs'] = extraction['ms']
+
+    return item
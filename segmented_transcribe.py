@@ -0,0 +1,220 @@
+"""
+Segmented parallel transcription for long interviews.
+
+The audio track is cut into segments of about SEGMENT_TARGET_SECONDS at
+silence boundaries. Each segment is transcribed as its own job, and the
+results are merged back into one Transcribe-format transcript, with each
+word's start_time/end_time shifted by its segment's offset.
+
+Splitting and merging work on 16-bit mono PCM WAV and take the transcriber
+as a function, so the whole path runs locally:
+
+    python segmented_transcribe.py interview.wav          # print the segment plan
+    python segmented_transcribe.py interview.mp4 --target 120
+
+Video Lambda 1 starts one Transcribe job per segment, named
+"{job_id}__seg000", "{job_id}__seg001", ..., and writes a manifest next to
+the segment audio. Video Lambda 2 merges once every segment has finished.
+"""
+import argparse
+import array
+import json
+import operator
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+FFMPEG_PATH = os.environ.get('FFMPEG_PATH', 'ffmpeg')  # e.g. /opt/bin/ffmpeg from a Lambda layer
+SAMPLE_RATE = 16000
+
+SEGMENT_TARGET_SECONDS = float(os.environ.get('SEGMENT_TARGET_SECONDS', '300'))
+SEGMENT_MAX_SECONDS = float(os.environ.get('SEGMENT_MAX_SECONDS', '420'))
+SEGMENT_MIN_SECONDS = float(os.environ.get('SEGMENT_MIN_SECONDS', '60'))
+SEGMENT_WORKERS = int(os.environ.get('SEGMENT_WORKERS', '8'))
+
+SILENCE_THRESHOLD = int(os.environ.get('SILENCE_THRESHOLD', '500'))  # RMS, 16-bit sample scale
+SILENCE_MIN_MS = 300
+FRAME_MS = 20
+ENERGY_STRIDE = 4  # every 4th sample is plenty for a frame's energy
+
+# Where Lambda 1 puts segment audio, the manifest and the merged transcript
+SEGMENT_BUCKET = os.environ.get('SEGMENT_BUCKET', 'hirefusion-interview-segments')
+SEGMENT_JOB_NAME = re.compile(r'^(.+)__seg(\d{3})$')
+
+
+def segment_job_name(job_id, index):
+    return f"{job_id}__seg{index:03d}"
+
+
+def parse_segment_job_name(name):
+    """(job_id, index) for a segment job name, None for a whole-file job."""
+    match = SEGMENT_JOB_NAME.match(name)
+    return (match.group(1), int(match.group(2))) if match else None
+
+
+def segment_prefix(job_id):
+    return f"segments/{job_id}/"
+
+
+def manifest_key(job_id):
+    return f"{segment_prefix(job_id)}manifest.json"
+
+
+# -------------------------
+# Audio
+# -------------------------
+
+def extract_audio(video_path, wav_path, ffmpeg=FFMPEG_PATH):
+    """Decode the audio track to 16 kHz mono 16-bit PCM WAV."""
+    subprocess.run(
+        [ffmpeg, '-nostdin', '-loglevel', 'error', '-y', '-i', video_path,
+         '-vn', '-ac', '1', '-ar', str(SAMPLE_RATE), '-acodec', 'pcm_s16le', wav_path],
+        check=True
+    )
+
+
+def read_wav(path):
+    """Return (samples, rate) for a 16-bit mono PCM WAV file."""
+    with wave.open(path, 'rb') as f:
+        if f.getsampwidth() != 2 or f.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono PCM")
+        samples = array.array('h')
+        samples.frombytes(f.readframes(f.getnframes()))
+        rate = f.getframerate()
+    if sys.byteorder == 'big':
+        samples.byteswap()  # WAV is little-endian
+    return samples, rate
+
+
+def write_wav(path, samples, rate):
+    if sys.byteorder == 'big':
+        samples = array.array('h', samples)
+        samples.byteswap()
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(samples.tobytes())
+
+
+def find_silences(samples, rate, threshold=SILENCE_THRESHOLD, min_ms=SILENCE_MIN_MS, frame_ms=FRAME_MS):
+    """(start, end) in seconds of every run of quiet frames at least min_ms long."""
+    frame = max(1, rate * frame_ms // 1000)
+    limit = threshold * threshold
+    silences = []
+    run_start = None
+    for position in range(0, len(samples), frame):
+        window = samples[position:position + frame:ENERGY_STRIDE]
+        quiet = sum(map(operator.mul, window, window)) <= limit * len(window)
+        if quiet and run_start is None:
+            run_start = position
+        elif not quiet and run_start is not None:
+            if (position - run_start) * 1000 >= min_ms * rate:
+                silences.append((run_start / rate, position / rate))
+            run_start = None
+    if run_start is not None and (len(samples) - run_start) * 1000 >= min_ms * rate:
+        silences.append((run_start / rate, len(samples) / rate))
+    return silences
+
+
+def plan_segments(duration, silences, target=SEGMENT_TARGET_SECONDS, max_length=SEGMENT_MAX_SECONDS,
+                  min_length=SEGMENT_MIN_SECONDS):
+    """
+    Cut points for [0, duration]: each cut is the middle of the silence
+    closest to `target` seconds into the segment, between min_length and
+    max_length; with no silence in that window the cut falls at max_length.
+    Returns [(start, end), ...] covering the whole duration.
+    """
+    middles = [(start + end) / 2 for start, end in silences]
+    cuts = []
+    start = 0.0
+    while duration - start > max_length:
+        goal = start + target
+        candidates = [m for m in middles if start + min_length <= m <= start + max_length]
+        cut = min(candidates, key=lambda m: abs(m - goal)) if candidates else start + max_length
+        cuts.append(cut)
+        start = cut
+    return list(zip([0.0] + cuts, cuts + [duration]))
+
+
+def split_audio(wav_path, out_dir, **plan_options):
+    """Write one WAV per planned segment; returns [{"index", "start", "end", "path"}, ...]."""
+    samples, rate = read_wav(wav_path)
+    bounds = plan_segments(len(samples) / rate, find_silences(samples, rate), **plan_options)
+    segments = []
+    for index, (start, end) in enumerate(bounds):
+        path = os.path.join(out_dir, f"seg{index:03d}.wav")
+        write_wav(path, samples[round(start * rate):round(end * rate)], rate)
+        segments.append({'index': index, 'start': start, 'end': end, 'path': path})
+    return segments
+
+
+# -------------------------
+# Transcription and merge
+# -------------------------
+
+def transcribe_segments(segments, transcribe, workers=SEGMENT_WORKERS):
+    """Run transcribe(segment) over every segment concurrently; results come back in segment order."""
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(segments)))) as pool:
+        return list(pool.map(transcribe, segments))
+
+
+def merge_transcripts(transcripts, offsets):
+    """
+    Merge Transcribe-format outputs ({"results": {"transcripts", "items"}})
+    into one, shifting each segment's item times by its offset in seconds.
+    """
+    texts, items = [], []
+    for transcript, offset in zip(transcripts, offsets):
+        results = transcript.get('results', {})
+        text = " ".join(t['transcript'] for t in results.get('transcripts', []) if t.get('transcript'))
+        if text:
+            texts.append(text)
+        for item in results.get('items', []):
+            item = dict(item)
+            # Punctuation items carry no times
+            for field in ('start_time', 'end_time'):
+                if field in item:
+                    item[field] = f"{float(item[field]) + offset:.3f}"
+            items.append(item)
+    return {'results': {'transcripts': [{'transcript': " ".join(texts)}], 'items': items}}
+
+
+def transcribe_wav(wav_path, transcribe, workers=SEGMENT_WORKERS, **plan_options):
+    """Split, transcribe concurrently and merge; returns (merged transcript, segments)."""
+    with tempfile.TemporaryDirectory() as work:
+        segments = split_audio(wav_path, work, **plan_options)
+        transcripts = transcribe_segments(segments, transcribe, workers)
+    return merge_transcripts(transcripts, [s['start'] for s in segments]), segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show how an interview's audio would be segmented")
+    parser.add_argument('path', help="16-bit mono WAV, or any video/audio file ffmpeg can read")
+    parser.add_argument('--target', type=float, default=SEGMENT_TARGET_SECONDS)
+    parser.add_argument('--max', type=float, default=SEGMENT_MAX_SECONDS)
+    parser.add_argument('--min', type=float, default=SEGMENT_MIN_SECONDS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work:
+        wav_path = args.path
+        if not wav_path.lower().endswith('.wav'):
+            wav_path = os.path.join(work, 'audio.wav')
+            extract_audio(args.path, wav_path)
+        samples, rate = read_wav(wav_path)
+
+    silences = find_silences(samples, rate)
+    bounds = plan_segments(len(samples) / rate, silences, args.target, args.max, args.min)
+    print(json.dumps({
+        'duration': round(len(samples) / rate, 2),
+        'silences': len(silences),
+        'segments': [{'start': round(start, 2), 'end': round(end, 2)} for start, end in bounds]
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Skill -> resume inverted index.
+
+Every resume analysis writes one row per detected skill: Skill hash key
+and a ScoreKey range key ("0087.000#<ResumeID>", the zero-padded Score
+then the ResumeID), so each posting list reads best score first. "Best
+candidates for Python + Kubernetes + AWS" then reads the top of a few
+posting lists instead of scanning and JSON-decoding the whole results
+table. Run this module as a script to index existing rows:
+
+    python skill_index.py --rebuild
+"""
+import argparse
+import heapq
+import json
+import os
+from decimal import Decimal
+
+from aws_clients import get_table
+from dynamo_batch import scan_all
+
+SKILL_INDEX_TABLE = os.environ.get('SKILL_INDEX_TABLE', 'ResumeSkillIndex')
+RESUME_TABLE = 'ResumeAnalysisResults'
+POSTINGS_PAGE_SIZE = 200  # per Query; a search that stops early reads no further pages
+SCORE_PLACES = Decimal('0.001')
+
+
+def skill_key(skill):
+    # Case-insensitive lookups: "aws", "AWS" and " Aws " share one posting list
+    return skill.strip().lower()
+
+
+def posting(skill, resume_id, score):
+    """The index row for one skill of one resume; ScoreKey sorts like (Score, ResumeID)."""
+    score = max(Decimal(str(score)), Decimal(0)).quantize(SCORE_PLACES)
+    return {'Skill': skill_key(skill), 'ScoreKey': f"{score:08.3f}#{resume_id}", 'ResumeID': resume_id,
+            'Score': score}
+
+
+def resume_postings(resume_id, skills, score):
+    """One resume's index rows, by (Skill, ScoreKey)."""
+    rows = (posting(skill, resume_id, score) for skill in {skill_key(s) for s in skills if s.strip()})
+    return {(row['Skill'], row['ScoreKey']): row for row in rows}
+
+
+def index_resume(index_table, resume_id, skills, score):
+    """Add (or refresh) one resume's postings."""
+    with index_table.batch_writer(overwrite_by_pkeys=['Skill', 'ScoreKey']) as batch:
+        for row in resume_postings(resume_id, skills, score).values():
+            batch.put_item(Item=row)
+
+
+def query_postings(index_table, skill, page_size=POSTINGS_PAGE_SIZE):
+    """
+    Yield (resume_id, score) for every resume indexed under skill, best
+    score first (ties by ResumeID, descending). Pages are only read as the
+    caller gets to them.
+    """
+    kwargs = {
+        'KeyConditionExpression': '#skill = :skill',
+        'ProjectionExpression': 'ResumeID, #score',
+        'ExpressionAttributeNames': {'#skill': 'Skill', '#score': 'Score'},
+        'ExpressionAttributeValues': {':skill': skill_key(skill)},
+        'ScanIndexForward': False,
+        'Limit': page_size,
+    }
+    while True:
+        response = index_table.query(**kwargs)
+        for item in response.get('Items', []):
+            yield item['ResumeID'], item.get('Score', 0)
+        if 'LastEvaluatedKey' not in response:
+            return
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def top_candidates(postings, skills, k):
+    """
+    Rank resumes by (number of requested skills matched, Score, ResumeID) and
+    return the best k.
+
+    postings(skill) yields (resume_id, score) best first, as query_postings
+    does. The lists are merged in that order, so a resume's match count is
+    final once every list has moved past it, and the rest can score no
+    higher. Reading stops as soon as the k-th best matches as many skills as
+    there are lists left, which for common skill sets is near the top of
+    each list. Selection is a k-sized heap rather than a full sort.
+    """
+    skills = list(dict.fromkeys(skill_key(s) for s in skills if s.strip()))
+    streams = [iter(postings(skill)) for skill in skills]
+    heads = {}
+
+    def advance(bit):
+        entry = next(streams[bit], None)
+        if entry is None:
+            heads.pop(bit, None)  # list exhausted
+        else:
+            heads[bit] = (entry[1], entry[0])
+
+    for bit in range(len(streams)):
+        advance(bit)
+
+    best = []  # min-heap of (matches, score, resume_id, mask)
+    while heads and (len(best) < k or best[0][0] < len(heads)):
+        score, resume_id = head = max(heads.values())
+        mask = 0
+        for bit in [bit for bit, entry in heads.items() if entry == head]:
+            mask |= 1 << bit
+            advance(bit)
+        entry = (bin(mask).count('1'), score, resume_id, mask)
+        if len(best) < k:
+            heapq.heappush(best, entry)
+        elif entry > best[0]:
+            heapq.heapreplace(best, entry)
+
+    return [{
+        'ResumeID': resume_id,
+        'Score': float(score),
+        'Matches': matches,
+        'MatchedSkills': [skill for bit, skill in enumerate(skills) if mask >> bit & 1],
+    } for matches, score, resume_id, mask in sorted(best, reverse=True)]
+
+
+def rebuild(source_table, index_table):
+    """Index every analysed resume in the results table; returns the number indexed."""
+    indexed = 0
+    for item in scan_all(source_table, ProjectionExpression='ResumeID, Skills, #score',
+                         ExpressionAttributeNames={'#score': 'Score'}):
+        skills = json.loads(item.get('Skills', '[]'))
+        if skills:
+            index_resume(index_table, item['ResumeID'], skills, item.get('Score', 0))
+            indexed += 1
+    return indexed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the skill inverted index")
+    parser.add_argument('--rebuild', action='store_true', required=True, help="index every stored resume")
+    parser.add_argument('--source-table', default=RESUME_TABLE)
+    parser.add_argument('--index-table', default=SKILL_INDEX_TABLE)
+    args = parser.parse_args()
+
+    indexed = rebuild(get_table(args.source_table), get_table(args.index_table))
+    print(f"Indexed {indexed} resume(s) into {args.index_table}")
+
+
+if __name__ == '__main__':
+    main()
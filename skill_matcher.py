@@ -0,0 +1,78 @@
+from collections import deque
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skill taxonomy.
+    Built once (at Lambda cold start) and finds every skill in a single pass
+    over the text. A match only counts when it is not glued to other word
+    characters, so "Go" does not fire inside "Google" nor "Java" inside "JavaScript".
+    Edges that are punctuation (the "++" of "C++") need no boundary.
+    """
+
+    def __init__(self, skills):
+        self.skills = list(dict.fromkeys(skills))
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for index, skill in enumerate(self.skills):
+            if not skill:
+                continue
+            lowered = skill.lower()
+            node = 0
+            for ch in lowered:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((
+                index, len(lowered), _is_word_char(lowered[0]), _is_word_char(lowered[-1])
+            ))
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text):
+        """Return the skills found in text, in taxonomy order."""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(text)
+        found = set()
+        node = 0
+
+        for pos, ch in enumerate(text):
+            edges = goto[node]
+            while node and ch not in edges:
+                node = fail[node]
+                edges = goto[node]
+            node = edges.get(ch, 0)
+            if not out[node]:
+                continue
+            end_free = pos + 1 >= length or not _is_word_char(text[pos + 1])
+            for index, size, word_start, word_end in out[node]:
+                if index in found or (word_end and not end_free):
+                    continue
+                start = pos - size + 1
+                if word_start and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                found.add(index)
+
+        return [self.skills[i] for i in sorted(found)]
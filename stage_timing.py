@@ -0,0 +1,92 @@
+"""
+Per-stage timing and structured logs for the analysis Lambdas.
+
+Each stage runs inside span(), which writes one compact JSON line to
+stdout (CloudWatch) when it ends. The line is tagged with the ambient
+request and analysis ids:
+
+    {"type":"span","stage":"comprehend","ms":412.7,"ok":true,"request_id":"...","analysis_id":"...","chunks":3}
+
+LOG_LEVEL (DEBUG, INFO, WARNING or ERROR; default INFO) gates everything;
+span lines are INFO. METRICS_SAMPLE_RATE keeps span lines for that share
+of requests, decided once per request. Failed spans are always written
+unless LOG_LEVEL is above ERROR.
+"""
+import contextlib
+import contextvars
+import json
+import os
+import random
+import time
+import uuid
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40}
+LOG_LEVEL = LEVELS.get(os.environ.get('LOG_LEVEL', 'INFO').upper(), LEVELS['INFO'])
+METRICS_SAMPLE_RATE = float(os.environ.get('METRICS_SAMPLE_RATE', '1.0'))
+
+# Ids attached to every line, plus the request's sampling decision
+_context = contextvars.ContextVar('stage_timing_context', default=None)
+
+
+def enabled(level):
+    return LEVELS[level] >= LOG_LEVEL
+
+
+def _write(record):
+    print(json.dumps(record, separators=(',', ':'), default=str))
+
+
+def _tags():
+    return {k: v for k, v in (_context.get() or {}).items() if not k.startswith('_')}
+
+
+@contextlib.contextmanager
+def request_context(request_id=None, **ids):
+    """Tag everything emitted inside the block; Lambda passes context.aws_request_id."""
+    token = _context.set({
+        'request_id': request_id or uuid.uuid4().hex,
+        **ids,
+        '_sampled': random.random() < METRICS_SAMPLE_RATE
+    })
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def bind(**ids):
+    """Add ids (e.g. analysis_id once it is known) to the current context."""
+    _context.set({**(_context.get() or {}), **ids})
+
+
+def emit(stage, ms, /, ok=True, **fields):
+    """Write one span line; also used for durations measured elsewhere (e.g. by AWS)."""
+    if not enabled('INFO' if ok else 'ERROR'):
+        return
+    sampled = (_context.get() or {}).get('_sampled')
+    if sampled is None:
+        sampled = random.random() < METRICS_SAMPLE_RATE
+    if ok and not sampled:
+        return
+    _write({'type': 'span', 'stage': stage, 'ms': round(ms, 1), 'ok': ok, **_tags(), **fields})
+
+
+@contextlib.contextmanager
+def span(stage, /, **fields):
+    """
+    Time the block as one stage. The yielded dict can be filled with
+    details known only at the end (page count, item size...).
+    """
+    started = time.perf_counter()
+    ok = False
+    try:
+        yield fields
+        ok = True
+    finally:
+        emit(stage, (time.perf_counter() - started) * 1000, ok, **fields)
+
+
+def log(level, msg, /, **fields):
+    """Structured replacement for the print() debugging; arguments are only serialized when enabled."""
+    if enabled(level):
+        _write({'type': 'log', 'level': level, 'msg': msg, **_tags(), **fields})
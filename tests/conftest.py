@@ -0,0 +1,96 @@
+"""
+The Lambdas create their boto3 clients at import time, so every test gets
+a fresh FakeAWS (benchmarks/fakes.py) and imports the module under test
+again with boto3 pointed at it.
+"""
+import importlib
+import os
+import sys
+
+import boto3
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'benchmarks')]
+
+from fakes import FakeAWS  # noqa: E402
+
+TABLES = {
+    'HireFusionTable': ['email'],
+    'ResumeAnalysisResults': ['ResumeID'],
+    'InterviewAnalysisResults': ['analysis_id'],
+    'VideoAnalysisResults': ['ResumeID'],
+    'UserDashboardStats': ['email'],
+    'ResumeSkillIndex': ['Skill', 'ScoreKey'],
+    'ResumeAnalysisCache': ['ContentHash'],
+    'VideoJobLaunches': ['LaunchKey'],
+}
+
+LAMBDA_ENV = {
+    'AWS_DEFAULT_REGION': 'us-east-1',
+    'SNS_TOPIC_ARN': 'arn:aws:sns:us-east-1:000000000000:video-analysis',
+    'REKOG_ROLE_ARN': 'arn:aws:iam::000000000000:role/rekognition-sns',
+    'DDB_TABLE': 'VideoAnalysisResults',
+}
+VIDEO_BUCKET = 'hirefusion-interview-videos'
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    fake = FakeAWS(TABLES)
+    monkeypatch.setattr(boto3, 'client', fake.client)
+    monkeypatch.setattr(boto3, 'resource', fake.resource)
+    return fake
+
+
+@pytest.fixture
+def load_lambda(aws, monkeypatch):
+    """load_lambda(module, **env) imports a fresh copy of module against the fakes."""
+    def load(module, **env):
+        for name, value in {**LAMBDA_ENV, **env}.items():
+            monkeypatch.setenv(name, value)
+        sys.modules.pop(module, None)
+        return importlib.import_module(module)
+
+    return load
+
+
+@pytest.fixture
+def app_module(aws, monkeypatch):
+    """A fresh import of app.py whose shared AWS clients come from the fakes."""
+    import aws_clients
+
+    monkeypatch.setattr(aws_clients, '_get_session', lambda: aws)
+    for registry in ('_clients', '_resources', '_tables'):
+        monkeypatch.setattr(aws_clients, registry, {})
+    sys.modules.pop('app', None)
+    app = importlib.import_module('app')
+    yield app
+    # Background watch threads outlive the test: stop them before the fakes go away
+    for watcher, _ in app.RESULT_WATCHERS.values():
+        watcher.close()
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def video_jobs(aws):
+    """
+    video_jobs(job_id, metadata) uploads a video and starts its Rekognition and
+    Transcribe jobs; returns the two completion events for video Lambda 2.
+    """
+    def start(job_id, metadata=None):
+        key = f"videos/{job_id}_interview.mp4"
+        aws.s3.put_object(Bucket=VIDEO_BUCKET, Key=key, Body=b'video', Metadata=metadata or {})
+        aws.services['rekognition'].start_face_detection(
+            Video={'S3Object': {'Bucket': VIDEO_BUCKET, 'Name': key}},
+            NotificationChannel={'SNSTopicArn': LAMBDA_ENV['SNS_TOPIC_ARN']}, JobTag=job_id)
+        aws.services['transcribe'].start_transcription_job(
+            TranscriptionJobName=job_id, Media={'MediaFileUri': f"s3://{VIDEO_BUCKET}/{key}"})
+        message = aws.sns.take(LAMBDA_ENV['SNS_TOPIC_ARN'], lambda m: m['JobTag'] == job_id)
+        return {'Records': [{'Sns': {'Message': message}}]}, aws.services['transcribe'].completion_event(job_id)
+
+    return start
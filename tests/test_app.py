@@ -0,0 +1,177 @@
+import gzip
+import io
+import json
+
+import pytest
+
+import result_cache
+
+
+@pytest.mark.parametrize('timeout', ['soon', 'nan', '-1'])
+def test_wait_result_rejects_a_bad_timeout(client, timeout):
+    response = client.get(f'/api/wait_result?kind=video&id=a1&timeout={timeout}')
+
+    assert response.status_code == 400
+    assert 'timeout' in response.get_json()['error']
+
+
+def test_wait_result_times_out_as_pending(client):
+    response = client.get('/api/wait_result?kind=video&id=a1&timeout=0')
+
+    assert response.status_code == 202
+    assert response.get_json() == {'status': 'PENDING'}
+
+
+def test_cache_stats_needs_the_admin_token(client, app_module, monkeypatch):
+    assert client.get('/api/cache_stats').status_code == 401
+
+    monkeypatch.setattr(app_module, 'ADMIN_API_TOKEN', 'secret')
+    assert client.get('/api/cache_stats', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = client.get('/api/cache_stats', headers={'Authorization': 'Bearer secret'})
+    assert response.status_code == 200
+    assert response.get_json()['backend'] == 'memory'
+
+
+@pytest.mark.parametrize('body', [{'resume_ids': [['r1']]}, {'analysis_ids': [{'id': 'a1'}]},
+                                  {'resume_ids': 'r1'}, {'resume_ids': ['r1', 7]}, ['r1']])
+def test_candidates_batch_rejects_ids_that_are_not_strings(client, body):
+    response = client.post('/api/candidates/batch', json=body)
+
+    assert response.status_code == 400
+
+
+def test_candidates_batch_reports_missing_ids_as_null(client, aws):
+    aws.services['dynamodb'].Table('ResumeAnalysisResults').put_item(
+        Item={'ResumeID': 'r1', 'ResumeFile': 'cv.pdf', 'Score': 80, 'Skills': '["Python"]'})
+    response = client.post('/api/candidates/batch', json={'resume_ids': ['r1', 'r2', 'r1'], 'analysis_ids': ['a1']})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['resumes']['r1']['ResumeID'] == 'r1'
+    assert body['resumes']['r2'] is None
+    assert body['videos'] == {'a1': None}
+
+
+def started_upload(client, aws, parts):
+    upload = client.post('/api/video_upload/initiate',
+                         json={'filename': 'talk.mp4', 'filetype': 'video/mp4', 'size': 100}).get_json()
+    for number in parts:
+        aws.s3.upload_part(Bucket='bucket', Key=upload['key'], UploadId=upload['upload_id'], PartNumber=number,
+                           Body=b'part')
+    return {'key': upload['key'], 'upload_id': upload['upload_id'], 'analysis_id': upload['analysis_id']}
+
+
+@pytest.mark.parametrize('part_count', [0, -3, 10001, 10 ** 12, True, 2.0, '2', [2]])
+def test_complete_rejects_a_bad_part_count(client, aws, part_count):
+    body = started_upload(client, aws, [1, 2])
+    response = client.post('/api/video_upload/complete', json={**body, 'part_count': part_count})
+
+    assert response.status_code == 400
+    assert 'part_count' in response.get_json()['error']
+    assert aws.services['s3'].calls.get('ListParts', 0) == 0
+
+
+def test_complete_reports_missing_parts(client, aws):
+    body = started_upload(client, aws, [1, 3])
+    response = client.post('/api/video_upload/complete', json={**body, 'part_count': 3})
+
+    assert response.status_code == 409
+    assert response.get_json()['missing'] == [2]
+
+
+def test_complete_with_every_part(client, aws):
+    body = started_upload(client, aws, [1, 2])
+    response = client.post('/api/video_upload/complete', json={**body, 'part_count': 2})
+
+    assert response.status_code == 200
+    assert response.get_json() == {'analysis_id': body['analysis_id'], 'status': 'PROCESSING'}
+
+
+def test_bulk_import_needs_the_admin_token(client, aws):
+    response = client.post('/api/users/bulk_import?format=csv', data="email\nada@example.com\n")
+
+    assert response.status_code == 401
+    assert aws.services['dynamodb'].Table('HireFusionTable').items == {}
+
+
+def test_bulk_import_streams_results_and_conflicts(client, app_module, aws, monkeypatch):
+    monkeypatch.setattr(app_module, 'ADMIN_API_TOKEN', 'secret')
+    aws.services['dynamodb'].Table('HireFusionTable').put_item(Item={'email': 'grace@example.com', 'password': 'kept'})
+
+    response = client.post('/api/users/bulk_import?format=csv', headers={'Authorization': 'Bearer secret'},
+                           data="email,username\nada@example.com,ada\ngrace@example.com,grace\n")
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines[-1] == {'summary': {'ok': 1, 'conflict': 1, 'error': 0}}
+    assert aws.services['dynamodb'].Table('HireFusionTable').items[('grace@example.com',)]['password'] == 'kept'
+
+
+def test_bulk_import_refuses_an_oversized_upload(client, app_module, aws, monkeypatch):
+    monkeypatch.setattr(app_module, 'ADMIN_API_TOKEN', 'secret')
+    monkeypatch.setattr(app_module, 'MAX_IMPORT_BYTES', 64)
+    body = "email\n" + "".join(f"user{n}@example.com\n" for n in range(10))
+
+    response = client.post('/api/users/bulk_import?format=csv', headers={'Authorization': 'Bearer secret'}, data=body)
+    assert response.status_code == 413
+    assert aws.services['dynamodb'].Table('HireFusionTable').items == {}
+
+
+def test_spool_stops_copying_past_the_limit(app_module):
+    # What guards a body sent without a Content-Length
+    assert app_module.spool_upload(io.BytesIO(b"x" * 65), 64) is None
+    with app_module.spool_upload(io.BytesIO(b"x" * 64), 64) as spool:
+        assert spool.read() == b"x" * 64
+
+
+@pytest.fixture
+def offloaded_result(aws):
+    text = "I built a data pipeline during my internship. " * 50
+    aws.s3.put_object(Bucket='transcripts', Key='a1.txt.gz', Body=gzip.compress(text.encode()))
+    aws.services['dynamodb'].Table('InterviewAnalysisResults').put_item(Item={
+        'analysis_id': 'a1', 'status': 'COMPLETED', 'scores': {'total_score': 80}, 'transcript': text[:40],
+        'transcript_s3': 's3://transcripts/a1.txt.gz', 'transcript_length': len(text)})
+    return text
+
+
+def test_video_result_fields_come_from_one_cached_read(client, aws, offloaded_result):
+    first = client.get('/api/video_result?analysis_id=a1&fields=status,scores').get_json()
+    second = client.get('/api/video_result?analysis_id=a1&fields=scores').get_json()
+    whole = client.get('/api/video_result?analysis_id=a1').get_json()
+
+    assert first == {'status': 'COMPLETED', 'scores': {'total_score': 80}}
+    assert second == {'scores': {'total_score': 80}}
+    assert whole['transcript'] == offloaded_result[:40]
+    assert aws.services['dynamodb'].calls['GetItem'] == 1
+
+
+def test_video_result_rehydrates_an_offloaded_transcript(client, aws, offloaded_result):
+    for _ in range(2):
+        response = client.get('/api/video_result?analysis_id=a1&fields=transcript')
+        assert response.get_json() == {'transcript': offloaded_result}
+    assert aws.services['s3'].calls['GetObject'] == 1
+
+
+def test_rewritten_resume_and_user_rows_expire_from_the_cache(client, aws, monkeypatch):
+    dynamodb = aws.services['dynamodb']
+    dynamodb.Table('ResumeAnalysisResults').put_item(Item={'ResumeID': 'r1', 'ResumeFile': 'cv.pdf', 'Score': 60})
+    dynamodb.Table('HireFusionTable').put_item(Item={'email': 'c@example.com', 'full_name': 'Old Name'})
+    assert client.get('/resume_data?resume_id=r1').get_json()['Score'] == 60
+    assert client.get('/api/user_details?email=c@example.com').get_json()['full_name'] == 'Old Name'
+
+    # Rewritten elsewhere (the bulk resume pipeline, /register on another worker)
+    dynamodb.Table('ResumeAnalysisResults').put_item(Item={'ResumeID': 'r1', 'ResumeFile': 'cv.pdf', 'Score': 75})
+    dynamodb.Table('HireFusionTable').put_item(Item={'email': 'c@example.com', 'full_name': 'New Name'})
+    assert client.get('/resume_data?resume_id=r1').get_json()['Score'] == 60
+
+    later = result_cache.time.monotonic() + 61
+    monkeypatch.setattr(result_cache.time, 'monotonic', lambda: later)
+    assert client.get('/resume_data?resume_id=r1').get_json()['Score'] == 75
+    assert client.get('/api/user_details?email=c@example.com').get_json()['full_name'] == 'New Name'
+
+
+def test_result_stream_asks_the_client_to_reconnect(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, 'RESULT_STREAM_SECONDS', 0.05)
+    response = client.get('/api/result_stream?kind=video&id=a1')
+
+    assert response.mimetype == 'text/event-stream'
+    assert response.get_data(as_text=True).endswith('event: reconnect\ndata: {}\n\n')
@@ -0,0 +1,33 @@
+import io
+
+from bulk_import import import_rows, read_rows
+from fakes import FakeDynamoDB
+
+CSV = """email,full_name,username
+ada@example.com,Ada,ada
+not-an-email,Broken,broken
+grace@example.com,Grace,grace
+ada@example.com,Ada Again,ada2
+"""
+
+
+def test_import_reports_invalid_rows_and_repeated_emails():
+    dynamodb = FakeDynamoDB({'Users': ['email']})
+    results = sorted(import_rows(read_rows(io.StringIO(CSV), 'csv'), dynamodb, 'Users'), key=lambda r: r['row'])
+
+    assert [(r['row'], r['status']) for r in results] == [(2, 'ok'), (3, 'error'), (4, 'ok'), (5, 'conflict')]
+    assert dynamodb.Table('Users').items[('ada@example.com',)]['username'] == 'ada'
+
+
+def test_import_leaves_registered_users_alone():
+    dynamodb = FakeDynamoDB({'Users': ['email']})
+    dynamodb.Table('Users').put_item(Item={'email': 'grace@example.com', 'password': 'kept'})
+    records = ({'email': f"user{n}@example.com"} for n in range(60))
+    rows = [(n, record, None) for n, record in enumerate(records, start=2)]
+    rows.insert(30, (1000, {'email': 'grace@example.com', 'password': 'imported'}, None))
+
+    results = list(import_rows(iter(rows), dynamodb, 'Users', workers=2))
+
+    assert [r['row'] for r in results if r['status'] == 'conflict'] == [1000]
+    assert sum(r['status'] == 'ok' for r in results) == 60
+    assert dynamodb.Table('Users').items[('grace@example.com',)]['password'] == 'kept'
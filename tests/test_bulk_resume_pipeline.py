@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from bulk_resume_pipeline import BatchedWrites, run
+from fakes import FakeDynamoDB
+from skill_index import index_resume
+
+RESUME_ID = '0f8fad5b-d9cb-469f-a165-70867728950e'
+EMAIL = 'candidate@example.com'
+RESUME_TEXT = """Software engineer with Python, AWS, Docker and Kubernetes experience.
+Built a data pipeline project with PostgreSQL and Redis during an internship.
+"""
+
+
+@pytest.fixture
+def dynamodb():
+    return FakeDynamoDB({'ResumeAnalysisResults': ['ResumeID'], 'ResumeSkillIndex': ['Skill', 'ScoreKey'],
+                         'UserDashboardStats': ['email']})
+
+
+def reanalyse(dynamodb, directory):
+    writer = BatchedWrites(dynamodb, {'ResumeAnalysisResults': ['ResumeID'],
+                                      'ResumeSkillIndex': ['Skill', 'ScoreKey']})
+    return run(str(directory), workers=1, writer=writer, index_table='ResumeSkillIndex',
+               stats_table=dynamodb.Table('UserDashboardStats'))
+
+
+def test_reanalysis_merges_the_row_and_replaces_its_postings(dynamodb, tmp_path):
+    results, index = dynamodb.Table('ResumeAnalysisResults'), dynamodb.Table('ResumeSkillIndex')
+    results.put_item(Item={'ResumeID': RESUME_ID, 'ResumeFile': f'resumes/{RESUME_ID}_cv.pdf', 'Score': 20,
+                           'Skills': '["COBOL", "Python"]', 'UserEmail': EMAIL, 'StatsCounted': True,
+                           'ExtractionMethod': 'textract-async', 'ExtractionMs': 2400})
+    index_resume(index, RESUME_ID, ['COBOL', 'Python'], 20)
+    dynamodb.Table('UserDashboardStats').put_item(Item={'email': EMAIL, 'ResumeCount': 2, 'ResumeScoreSum': 70})
+    (tmp_path / f'{RESUME_ID}_cv.txt').write_text(RESUME_TEXT)
+
+    stats = reanalyse(dynamodb, tmp_path)
+
+    assert stats['ok'] == 1 and stats['failed'] == 0
+    item = results.items[(RESUME_ID,)]
+    assert item['Score'] > 20
+    assert 'Docker' in json.loads(item['Skills'])
+    assert {name: item[name] for name in ('ResumeFile', 'UserEmail', 'StatsCounted', 'ExtractionMethod')} == {
+        'ResumeFile': f'resumes/{RESUME_ID}_cv.pdf', 'UserEmail': EMAIL, 'StatsCounted': True,
+        'ExtractionMethod': 'textract-async'}
+    postings = index.items.values()
+    assert {row['Skill'] for row in postings} == {s.lower() for s in json.loads(item['Skills'])}
+    assert all(row['Score'] == item['Score'] for row in postings)
+    assert dynamodb.Table('UserDashboardStats').items[(EMAIL,)] == {
+        'email': EMAIL, 'ResumeCount': 2, 'ResumeScoreSum': 50 + item['Score']}
+
+
+def test_new_resume_is_written_without_touching_stats(dynamodb, tmp_path):
+    (tmp_path / 'cv.txt').write_text(RESUME_TEXT)
+
+    assert reanalyse(dynamodb, tmp_path)['ok'] == 1
+    [item] = dynamodb.Table('ResumeAnalysisResults').items.values()
+    assert item['ExtractionMethod'] == 'bulk:local'
+    assert 'UserEmail' not in item
+    assert dynamodb.Table('UserDashboardStats').items == {}
@@ -0,0 +1,122 @@
+import pytest
+from botocore.exceptions import ClientError
+
+import dashboard_stats
+from dashboard_stats import put_counted_result, recompute
+from fakes import client_error
+
+EMAIL = 'candidate@example.com'
+RESUME_TEXT = b"""Software engineer with Python, AWS, Docker and Kubernetes experience.
+Built a data pipeline project with PostgreSQL and Redis during an internship.
+"""
+
+
+def stats_record(aws):
+    return aws.services['dynamodb'].Table('UserDashboardStats').items.get((EMAIL,), {})
+
+
+def test_put_counted_result_counts_once(aws):
+    dynamodb = aws.resource('dynamodb')
+    table, stats_table = dynamodb.Table('ResumeAnalysisResults'), dynamodb.Table('UserDashboardStats')
+    item = {'ResumeID': 'r1', 'ResumeFile': 'cv.pdf', 'Score': 70, 'UserEmail': EMAIL}
+
+    assert put_counted_result(table, item, stats_table, 'resume', 70)
+    assert not put_counted_result(table, item, stats_table, 'resume', 70)
+
+    assert stats_record(aws) == {'email': EMAIL, 'ResumeCount': 1, 'ResumeScoreSum': 70}
+    assert table.items[('r1',)]['StatsCounted'] is True
+
+
+def test_put_counted_result_without_email_writes_the_row_only(aws):
+    dynamodb = aws.resource('dynamodb')
+    table = dynamodb.Table('ResumeAnalysisResults')
+
+    assert not put_counted_result(table, {'ResumeID': 'r1', 'Score': 70}, dynamodb.Table('UserDashboardStats'),
+                                  'resume', 70)
+    assert table.items[('r1',)] == {'ResumeID': 'r1', 'Score': 70}
+    assert stats_record(aws) == {}
+
+
+def test_redelivered_resume_record_is_counted_once(aws, load_lambda):
+    resume_lambda = load_lambda('resume_analyzer_lambda_website_integrated', RESUME_CACHE_TABLE='ResumeAnalysisCache')
+    aws.s3.put_object(Bucket='resumes', Key='cv.pdf', Body=RESUME_TEXT,
+                      Metadata={'resumeid': 'r1', 'useremail': EMAIL})
+    event = {'Records': [{'s3': {'bucket': {'name': 'resumes'}, 'object': {'key': 'cv.pdf'}}}]}
+
+    # The second delivery is served from the content-hash cache
+    for _ in range(2):
+        assert resume_lambda.lambda_handler(event, None)['statusCode'] == 200
+
+    score = aws.services['dynamodb'].Table('ResumeAnalysisResults').items[('r1',)]['Score']
+    assert stats_record(aws)['ResumeCount'] == 1
+    assert stats_record(aws)['ResumeScoreSum'] == score
+
+
+def test_failed_video_finalization_keeps_its_error(aws, load_lambda, video_jobs, monkeypatch):
+    video_lambda = load_lambda('video_resume_lambda_2_website_integrated')
+    rekognition_event, transcribe_event = video_jobs('job-1', {'useremail': EMAIL})
+    video_lambda.handle_event(rekognition_event)
+
+    def unavailable(**kwargs):
+        raise client_error('InternalServerError', 'TransactWriteItems')
+    monkeypatch.setattr(aws.services['dynamodb'], 'transact_write_items', unavailable)
+
+    with pytest.raises(ClientError) as error:
+        video_lambda.handle_transcribe_completion(transcribe_event['detail'])
+    assert error.value.response['Error']['Code'] == 'InternalServerError'
+    assert aws.services['dynamodb'].Table('VideoAnalysisResults').items[('job-1',)]['Status'] == 'PROCESSING'
+    assert stats_record(aws) == {}
+
+
+def seed_results(dynamodb):
+    dynamodb.Table('ResumeAnalysisResults').put_item(
+        Item={'ResumeID': 'r1', 'ResumeFile': 'cv.pdf', 'Score': 60, 'UserEmail': EMAIL})
+    dynamodb.Table('VideoAnalysisResults').put_item(
+        Item={'ResumeID': 'v1', 'Status': 'COMPLETED', 'TotalScore': 80, 'UserEmail': EMAIL})
+    # The app's row for the same interview has no email and is not counted
+    dynamodb.Table('InterviewAnalysisResults').put_item(Item={'analysis_id': 'v1', 'status': 'COMPLETED'})
+
+
+def test_recompute_rebuilds_from_the_video_results_table(aws):
+    dynamodb = aws.resource('dynamodb')
+    seed_results(dynamodb)
+    stats_table = dynamodb.Table('UserDashboardStats')
+    stats_table.put_item(Item={'email': EMAIL, 'ResumeCount': 7, 'ResumeScoreSum': 1})
+
+    sources = [dynamodb.Table(name) for name in ('ResumeAnalysisResults', 'VideoAnalysisResults',
+                                                  'InterviewAnalysisResults')]
+    assert recompute(sources, stats_table) == 1
+    assert stats_record(aws) == {'email': EMAIL, 'ResumeCount': 1, 'ResumeScoreSum': 60,
+                                 'VideoCount': 1, 'VideoScoreSum': 80}
+
+
+def test_recompute_keeps_an_analysis_counted_during_the_scan(aws, monkeypatch):
+    dynamodb = aws.resource('dynamodb')
+    seed_results(dynamodb)
+    results, stats_table = dynamodb.Table('ResumeAnalysisResults'), dynamodb.Table('UserDashboardStats')
+    scan_all, scans = dashboard_stats.scan_all, []
+
+    def scan_then_write(table):
+        items = list(scan_all(table))
+        if table is results and not scans:
+            # A live writer counts a new resume after the scan has passed it
+            put_counted_result(results, {'ResumeID': 'r2', 'ResumeFile': 'b.pdf', 'Score': 40, 'UserEmail': EMAIL},
+                               stats_table, 'resume', 40)
+        scans.append(table.name)
+        return items
+    monkeypatch.setattr(dashboard_stats, 'scan_all', scan_then_write)
+
+    assert recompute([results, dynamodb.Table('VideoAnalysisResults')], stats_table, EMAIL) == 1
+    assert stats_record(aws) == {'email': EMAIL, 'ResumeCount': 2, 'ResumeScoreSum': 100,
+                                 'VideoCount': 1, 'VideoScoreSum': 80}
+    assert scans.count('ResumeAnalysisResults') == 2
+
+
+def test_recompute_zeroes_a_user_without_analyses(aws):
+    dynamodb = aws.resource('dynamodb')
+    stats_table = dynamodb.Table('UserDashboardStats')
+    stats_table.put_item(Item={'email': EMAIL, 'ResumeCount': 2, 'ResumeScoreSum': 90})
+
+    assert recompute([dynamodb.Table('ResumeAnalysisResults')], stats_table, EMAIL) == 1
+    assert stats_record(aws) == {'email': EMAIL, 'ResumeCount': 0, 'ResumeScoreSum': 0,
+                                 'VideoCount': 0, 'VideoScoreSum': 0}
@@ -0,0 +1,63 @@
+import pytest
+
+import dynamo_batch
+from fakes import FakeDynamoDB
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(dynamo_batch.time, 'sleep', delays.append)
+    return delays
+
+
+def test_batch_get_gives_up_without_a_final_sleep(sleeps):
+    dynamodb = FakeDynamoDB({'T': ['id']}, unprocessed_rate=1.0)
+    items, unprocessed = dynamo_batch.batch_get_items(dynamodb, 'T', [{'id': 'a'}, {'id': 'b'}], max_attempts=3)
+
+    assert items == []
+    assert unprocessed == [{'id': 'a'}, {'id': 'b'}]
+    assert len(sleeps) == 2
+
+
+def test_batch_write_gives_up_without_a_final_sleep(sleeps):
+    dynamodb = FakeDynamoDB({'T': ['id']}, unprocessed_rate=1.0)
+    requests = [{'PutRequest': {'Item': {'id': 'a'}}}, {'DeleteRequest': {'Key': {'id': 'b'}}}]
+    unwritten = dynamo_batch.batch_write_requests(dynamodb, 'T', requests, max_attempts=3)
+
+    assert unwritten == requests
+    assert len(sleeps) == 2
+
+
+def test_batch_get_deduplicates_and_chunks_keys(sleeps):
+    dynamodb = FakeDynamoDB({'T': ['id']})
+    for n in range(150):
+        dynamodb.Table('T').put_item(Item={'id': str(n)})
+    items, unprocessed = dynamo_batch.batch_get_items(dynamodb, 'T', [{'id': str(n % 150)} for n in range(300)])
+
+    assert sorted(int(item['id']) for item in items) == list(range(150))
+    assert unprocessed == [] and sleeps == []
+    assert dynamodb.calls['BatchGetItem'] == 2
+
+
+def test_put_new_items_skips_taken_keys_and_writes_the_rest(sleeps):
+    dynamodb = FakeDynamoDB({'T': ['id']})
+    dynamodb.Table('T').put_item(Item={'id': 'b', 'name': 'original'})
+
+    existing, unwritten = dynamo_batch.put_new_items(
+        dynamodb, 'T', [{'id': 'a', 'name': 'new'}, {'id': 'b', 'name': 'new'}, {'id': 'c', 'name': 'new'}], 'id')
+
+    assert existing == [{'id': 'b', 'name': 'new'}]
+    assert unwritten == []
+    assert {key: item['name'] for key, item in dynamodb.Table('T').items.items()} == {
+        ('a',): 'new', ('b',): 'original', ('c',): 'new'}
+    assert dynamodb.calls == {'PutItem': 1, 'TransactWriteItems': 2}
+    assert sleeps == []
+
+
+def test_put_new_items_retries_throttling_then_gives_up(sleeps):
+    dynamodb = FakeDynamoDB({'T': ['id']}, throttle_rate=1.0)
+    existing, unwritten = dynamo_batch.put_new_items(dynamodb, 'T', [{'id': 'a'}], 'id', max_attempts=3)
+
+    assert (existing, unwritten) == ([], [{'id': 'a'}])
+    assert len(sleeps) == 2
@@ -0,0 +1,54 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import Binary
+from flask import Flask, jsonify
+
+from dynamo_json import DynamoJSONProvider
+
+
+def serve(value):
+    # Through a route, the way app.py returns DynamoDB items
+    app = Flask(__name__)
+    app.json = DynamoJSONProvider(app)
+    app.testing = True
+    app.add_url_rule('/item', 'item', lambda: jsonify(value))
+    response = app.test_client().get('/item')
+    assert response.status_code == 200
+    return json.loads(response.get_data())
+
+
+def test_decimal_integers_and_fractions():
+    body = serve({'Score': Decimal('85'), 'Exp': Decimal('1E+2'), 'Avg': Decimal('72.5'), 'Neg': Decimal('-0.25')})
+
+    assert body == {'Score': 85, 'Exp': 100, 'Avg': 72.5, 'Neg': -0.25}
+    assert isinstance(body['Score'], int) and isinstance(body['Exp'], int)
+
+
+def test_sets_come_out_sorted():
+    body = serve({'SS': {'Python', 'AWS', 'Go'}, 'NS': {Decimal('3'), Decimal('1.5')},
+                  'Mixed': frozenset({'a', 1})})
+
+    assert body['SS'] == ['AWS', 'Go', 'Python']
+    assert body['NS'] == [1.5, 3]
+    assert sorted(body['Mixed'], key=str) == [1, 'a']
+
+
+def test_binary_is_base64():
+    assert serve({'B': Binary(b'\x00\xffhi'), 'raw': b'hi'}) == {'B': 'AP9oaQ==', 'raw': 'aGk='}
+
+
+def test_nested_maps_and_lists():
+    item = {'analysis_id': 'a1', 'scores': {'total_score': Decimal('80.25'), 'detail': {'grammar': Decimal('90')}},
+            'segments': [{'start': Decimal('0.5'), 'skills': {'SQL'}}], 'status': 'COMPLETED', 'missing': None}
+
+    assert serve(item) == {'analysis_id': 'a1', 'scores': {'total_score': 80.25, 'detail': {'grammar': 90}},
+                           'segments': [{'start': 0.5, 'skills': ['SQL']}], 'status': 'COMPLETED', 'missing': None}
+
+
+def test_other_types_keep_flask_behaviour():
+    assert serve({'at': datetime(2024, 1, 2, tzinfo=timezone.utc)}) == {'at': 'Tue, 02 Jan 2024 00:00:00 GMT'}
+    with pytest.raises(TypeError):
+        serve({'obj': object()})
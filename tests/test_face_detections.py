@@ -0,0 +1,58 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from fakes import client_error
+
+
+@pytest.fixture
+def video_lambda(load_lambda):
+    return load_lambda('video_resume_lambda_2_website_integrated')
+
+
+@pytest.fixture
+def face_job(aws):
+    rekognition = aws.services['rekognition']
+    rekognition.faces_per_job = 25
+    video = {'S3Object': {'Bucket': 'videos', 'Name': 'talk.mp4'}}
+    return rekognition.start_face_detection(Video=video)['JobId']
+
+
+def test_faces_are_aggregated_across_pages(aws, video_lambda, face_job, monkeypatch):
+    rekognition = aws.services['rekognition']
+    whole = rekognition.get_face_detection(JobId=face_job, MaxResults=1000)['Faces']
+    monkeypatch.setattr(video_lambda, 'FACE_PAGE_SIZE', 10)
+    rekognition.calls.clear()
+
+    faces = list(video_lambda.iter_face_detections(face_job))
+
+    assert faces == whole
+    assert rekognition.calls['GetFaceDetection'] == 3
+    happy = [e['Confidence'] for f in whole for e in f['Face']['Emotions'] if e['Type'] == 'HAPPY']
+    smiles = [f['Face']['Smile']['Confidence'] for f in whole if f['Face']['Smile']['Value']]
+    assert video_lambda.aggregate_face_scores(iter(faces)) == (
+        round(sum(happy) / len(happy), 2), round(sum(smiles) / len(smiles), 2), 25)
+
+
+def test_no_faces_score_neutral(video_lambda):
+    assert video_lambda.aggregate_face_scores(iter([])) == (50.0, 50.0, 0)
+
+
+def test_a_later_page_failure_reaches_the_caller(aws, video_lambda, face_job, monkeypatch):
+    rekognition = aws.services['rekognition']
+    get_page = rekognition.get_face_detection
+
+    def failing_third_page(**kwargs):
+        if kwargs.get('NextToken') == '20':
+            raise client_error('ThrottlingException', 'GetFaceDetection')
+        return get_page(**kwargs)
+    monkeypatch.setattr(rekognition, 'get_face_detection', failing_third_page)
+    monkeypatch.setattr(video_lambda, 'FACE_PAGE_SIZE', 10)
+
+    seen = []
+    with pytest.raises(ClientError) as error:
+        for face in video_lambda.iter_face_detections(face_job):
+            seen.append(face)
+
+    assert error.value.response['Error']['Code'] == 'ThrottlingException'
+    # Both pages fetched before the failure were handed over first
+    assert len(seen) == 20
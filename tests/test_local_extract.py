@@ -0,0 +1,108 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+from local_extract import extract_docx_text, extract_local_text
+
+BUCKET = 'hirefusion-resumes'
+RESUME_LINES = ["Software engineer with Python, Docker and Kubernetes experience.",
+                "Built a data pipeline project with PostgreSQL during an internship."]
+
+
+def make_docx(paragraphs):
+    body = ''.join(f'<w:p>{paragraph}</w:p>' for paragraph in paragraphs)
+    document = ('<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{body}</w:body></w:document>')
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('[Content_Types].xml', '<Types/>')
+        archive.writestr('word/document.xml', document)
+    return buffer.getvalue()
+
+
+def make_pdf(lines):
+    # One page with a Helvetica text layer, the way a word processor exports it
+    text = ''.join(f"BT /F1 11 Tf 72 {720 - 16 * n} Td ({line}) Tj ET\n" for n, line in enumerate(lines))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text.encode()),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+
+def test_docx_paragraphs_tabs_and_breaks():
+    data = make_docx(['<w:r><w:t>Skills:</w:t><w:tab/><w:t>Python</w:t></w:r>',
+                      '<w:r><w:t>Line one</w:t><w:br/><w:t>line two</w:t></w:r>',
+                      ''])
+
+    assert extract_docx_text(data) == "Skills:\tPython\nLine one\nline two\n"
+    assert extract_local_text(data, 'cv.DOCX') == ("Skills:\tPython\nLine one\nline two\n", 'docx-xml')
+
+
+def test_unreadable_or_unsupported_files_go_to_textract():
+    assert extract_local_text(b'not a zip', 'cv.docx') == ("", None)
+    assert extract_local_text(make_docx(['<w:r><w:t>x</w:t></w:r>']), 'cv.doc') == ("", None)
+
+
+def test_pdf_text_layer_is_read():
+    pytest.importorskip('pypdf')
+    text, method = extract_local_text(make_pdf(RESUME_LINES), 'cv.pdf')
+
+    assert method == 'pdf-text-layer'
+    assert text.split() == ' '.join(RESUME_LINES).split()
+
+
+@pytest.fixture
+def resume_lambda(load_lambda):
+    return load_lambda('resume_analyzer_lambda_website_integrated')
+
+
+def handle(aws, resume_lambda, key, body):
+    aws.s3.put_object(Bucket=BUCKET, Key=key, Body=body, Metadata={'resumeid': 'r1'})
+    event = {'Records': [{'s3': {'bucket': {'name': BUCKET}, 'object': {'key': key}}}]}
+    [result] = json.loads(resume_lambda.lambda_handler(event, None)['body'])['results']
+    return result, aws.services['dynamodb'].Table('ResumeAnalysisResults').items[('r1',)]
+
+
+def test_docx_upload_skips_textract(aws, resume_lambda):
+    paragraphs = [f'<w:r><w:t>{line}</w:t></w:r>' for line in RESUME_LINES]
+    result, item = handle(aws, resume_lambda, 'resumes/r1_cv.docx', make_docx(paragraphs))
+
+    assert result['extraction'] == 'docx-xml'
+    assert item['ExtractionMethod'] == 'docx-xml'
+    assert {'Python', 'Docker', 'Kubernetes', 'PostgreSQL'} <= set(json.loads(item['Skills']))
+    assert aws.services['textract'].calls == {}
+
+
+def test_born_digital_pdf_skips_textract(aws, resume_lambda):
+    pytest.importorskip('pypdf')
+    result, item = handle(aws, resume_lambda, 'resumes/r1_cv.pdf', make_pdf(RESUME_LINES))
+
+    assert result['extraction'] == 'pdf-text-layer'
+    assert item['ProjectDetected'] and item['InternshipDetected']
+    assert aws.services['textract'].calls == {}
+
+
+def test_short_text_layer_falls_back_to_textract(aws, resume_lambda):
+    # A scan with a page number or OCR stub for a text layer
+    data = make_pdf(["Page 1"])
+    assert len(extract_local_text(data, 'cv.pdf')[0].strip()) < resume_lambda.LOCAL_EXTRACT_MIN_CHARS
+
+    _, item = handle(aws, resume_lambda, 'resumes/r1_cv.pdf', data)
+
+    assert item['ExtractionMethod'] == 'textract-inline'
+    assert aws.services['textract'].calls['StartDocumentTextDetection'] == 1
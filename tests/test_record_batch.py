@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from record_batch import RecordsFailed, process_records
+
+
+def s3_record(key):
+    return {'s3': {'bucket': {'name': 'resumes'}, 'object': {'key': key}}}
+
+
+def sqs_message(message_id, *keys, body=None):
+    body = body if body is not None else json.dumps({'Records': [s3_record(key) for key in keys]})
+    return {'eventSource': 'aws:sqs', 'messageId': message_id, 'body': body}
+
+
+def handle(record):
+    key = record['s3']['object']['key']
+    if key.startswith('bad'):
+        raise RuntimeError(f"cannot read {key}")
+    return {'key': key}
+
+
+def test_sqs_failures_are_reported_per_message():
+    event = {'Records': [sqs_message('m1', 'a.pdf', 'b.pdf'), sqs_message('m2', 'bad.pdf'),
+                         sqs_message('m3', body='{not json'), sqs_message('m4', body='[]')]}
+
+    response = process_records(event, handle)
+
+    assert response['statusCode'] == 207
+    assert response['batchItemFailures'] == [{'itemIdentifier': 'm2'}, {'itemIdentifier': 'm3'},
+                                             {'itemIdentifier': 'm4'}]
+    results = json.loads(response['body'])['results']
+    assert [r['key'] for r in results if r['status'] == 'SUCCEEDED'] == ['a.pdf', 'b.pdf']
+
+
+def test_sqs_batch_with_every_message_failing_is_a_500():
+    response = process_records({'Records': [sqs_message('m1', 'bad.pdf')]}, handle)
+
+    assert response['statusCode'] == 500
+    assert response['batchItemFailures'] == [{'itemIdentifier': 'm1'}]
+
+
+def test_test_event_without_records_succeeds():
+    response = process_records({'Records': [sqs_message('m1', body='{"Event": "s3:TestEvent"}')]}, handle)
+
+    assert response == {'statusCode': 200, 'body': json.dumps({'results': []}), 'batchItemFailures': []}
+
+
+def test_direct_invocation_raises_so_lambda_retries():
+    event = {'Records': [s3_record('a.pdf'), s3_record('bad.pdf')]}
+
+    with pytest.raises(RecordsFailed) as error:
+        process_records(event, handle)
+
+    assert [r['status'] for r in error.value.results] == ['SUCCEEDED', 'FAILED']
+    assert 'cannot read bad.pdf' in str(error.value)
+
+
+def test_direct_invocation_that_succeeds_reports_every_record():
+    response = process_records({'Records': [s3_record('a.pdf'), s3_record('b.pdf')]}, handle)
+
+    assert response['statusCode'] == 200
+    assert [r['recordId'] for r in json.loads(response['body'])['results']] == ['0', '1']
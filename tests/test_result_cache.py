@@ -0,0 +1,47 @@
+import json
+import pickle
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+import result_cache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, px=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis_cache(monkeypatch):
+    server = FakeRedis()
+    monkeypatch.setattr(result_cache, 'redis', SimpleNamespace(Redis=SimpleNamespace(from_url=lambda url: server)))
+    return result_cache.RedisCache()
+
+
+def test_redis_entries_round_trip_as_json(redis_cache):
+    item = {'analysis_id': 'a1', 'scores': {'total_score': Decimal('72.5'), 'grammar': Decimal('90')},
+            'skills': {'Python', 'AWS'}, 'status': 'COMPLETED'}
+    redis_cache.set('video:a1', item)
+
+    assert json.loads(redis_cache.client.data['hirefusion:video:a1'])['skills'] == ['AWS', 'Python']
+    assert redis_cache.get('video:a1') == {'analysis_id': 'a1', 'scores': {'total_score': Decimal('72.5'),
+                                                                         'grammar': 90},
+                                           'skills': ['AWS', 'Python'], 'status': 'COMPLETED'}
+    assert redis_cache.get('video:missing') is result_cache._MISSING
+
+
+def test_redis_entries_are_never_unpickled(redis_cache):
+    redis_cache.client.data['hirefusion:user:x'] = pickle.dumps({'email': 'x'})
+    with pytest.raises(ValueError):
+        redis_cache.get('user:x')
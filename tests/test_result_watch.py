@@ -0,0 +1,52 @@
+import threading
+import time
+
+from result_watch import ResultWatcher
+
+
+def test_concurrent_waits_share_one_read_loop():
+    release = threading.Event()
+    reads = []
+
+    def fetch(key):
+        reads.append(threading.current_thread().name)
+        return {'id': key} if release.is_set() else None
+
+    watcher = ResultWatcher(fetch, lambda item: True, interval=0.01, max_interval=0.01)
+    results = []
+    waiters = [threading.Thread(target=lambda: results.append(watcher.wait('a1', 5))) for _ in range(8)]
+    for waiter in waiters:
+        waiter.start()
+    # Everyone is waiting and the loop has polled a few times before the result lands
+    while len(reads) < 3 or watcher._watches['a1'].waiters < 8:
+        time.sleep(0.01)
+    release.set()
+    for waiter in waiters:
+        waiter.join()
+
+    assert results == [{'id': 'a1'}] * 8
+    assert len(set(reads)) == 1
+    assert watcher.backend_reads == len(reads)
+    assert watcher.active() == 0
+
+
+def test_close_releases_waiters_and_stops_the_loop():
+    reads = []
+    watcher = ResultWatcher(lambda key: reads.append(key), lambda item: True, interval=0.01, max_interval=0.01)
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(watcher.wait('a1', 30)))
+    waiter.start()
+    while not reads:
+        time.sleep(0.01)
+
+    watcher.close()
+    waiter.join(1)
+    stopped_at = len(reads)
+    time.sleep(0.05)
+
+    assert results == [None]
+    assert watcher.active() == 0
+    assert len(reads) == stopped_at
+    # A closed watcher starts no new loops
+    assert watcher.wait('a2', 30) is None
+    assert len(reads) == stopped_at
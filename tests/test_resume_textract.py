@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from record_batch import RecordsFailed
+
+EMAIL = 'candidate@example.com'
+TOPIC_ARN = 'arn:aws:sns:us-east-1:000000000000:textract-analysis'
+BUCKET = 'hirefusion-resumes'
+# Plain text under a .pdf name: no text layer for the local extractor, so it goes to Textract
+RESUME_LINES = ["Software engineer with Python and Docker experience.",
+                "Built a data pipeline project during an internship."]
+
+
+@pytest.fixture
+def resume_lambda(load_lambda):
+    return load_lambda('resume_analyzer_lambda_website_integrated', TEXTRACT_SNS_TOPIC_ARN=TOPIC_ARN,
+                       TEXTRACT_ROLE_ARN='arn:aws:iam::000000000000:role/textract-sns')
+
+
+def upload(aws, resume_id, lines=RESUME_LINES):
+    key = f"resumes/{resume_id}_cv.pdf"
+    aws.s3.put_object(Bucket=BUCKET, Key=key, Body="\n".join(lines).encode(),
+                      Metadata={'resumeid': resume_id, 'useremail': EMAIL})
+    return {'Records': [{'s3': {'bucket': {'name': BUCKET}, 'object': {'key': key}}}]}
+
+
+def results(response):
+    assert response['statusCode'] == 200
+    return json.loads(response['body'])['results']
+
+
+def completion(aws, resume_id):
+    message = aws.sns.take(TOPIC_ARN, lambda m: m['JobTag'] == resume_id)
+    assert message is not None, "no Textract completion published"
+    return {'Records': [{'Sns': {'Message': message}}]}
+
+
+def test_start_phase_only_starts_the_job(aws, resume_lambda):
+    [result] = results(resume_lambda.lambda_handler(upload(aws, 'r1'), None))
+
+    assert result['message'] == 'Textract job started'
+    assert result['job_id'] in aws.services['textract'].jobs
+    assert aws.services['textract'].calls == {'StartDocumentTextDetection': 1}
+    assert aws.services['dynamodb'].Table('ResumeAnalysisResults').items == {}
+
+
+def test_completion_phase_stores_the_analysis(aws, resume_lambda):
+    resume_lambda.lambda_handler(upload(aws, 'r1'), None)
+    [result] = results(resume_lambda.lambda_handler(completion(aws, 'r1'), None))
+
+    assert result == {'recordId': '0', 'status': 'SUCCEEDED', 'message': 'Success', 'resume_id': 'r1'}
+    item = aws.services['dynamodb'].Table('ResumeAnalysisResults').items[('r1',)]
+    assert item['ResumeFile'] == 'resumes/r1_cv.pdf'
+    assert item['ExtractionMethod'] == 'textract-async'
+    assert item['UserEmail'] == EMAIL
+    assert {'Python', 'Docker'} <= set(json.loads(item['Skills']))
+    assert aws.services['dynamodb'].Table('UserDashboardStats').items[(EMAIL,)]['ResumeCount'] == 1
+
+
+def test_completion_reads_every_result_page(aws, resume_lambda):
+    page = aws.services['textract'].PAGE_SIZE
+    # The only skill sits on the third page of LINE blocks
+    lines = [f"Line {n} of the work history." for n in range(2 * page)] + ["Kubernetes administrator."]
+    resume_lambda.lambda_handler(upload(aws, 'r1', lines), None)
+    resume_lambda.lambda_handler(completion(aws, 'r1'), None)
+
+    assert aws.services['textract'].calls['GetDocumentTextDetection'] == 3
+    item = aws.services['dynamodb'].Table('ResumeAnalysisResults').items[('r1',)]
+    assert 'Kubernetes' in json.loads(item['Skills'])
+
+
+def test_failed_job_fails_the_record(aws, resume_lambda):
+    resume_lambda.lambda_handler(upload(aws, 'r1'), None)
+    event = completion(aws, 'r1')
+    message = json.loads(event['Records'][0]['Sns']['Message'])
+    event['Records'][0]['Sns']['Message'] = json.dumps({**message, 'Status': 'FAILED'})
+
+    # An SNS invocation is only retried if the handler raises
+    with pytest.raises(RecordsFailed, match='ended with status FAILED'):
+        resume_lambda.lambda_handler(event, None)
+    assert aws.services['dynamodb'].Table('ResumeAnalysisResults').items == {}
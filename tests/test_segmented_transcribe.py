@@ -0,0 +1,76 @@
+import os
+import random
+from collections import namedtuple
+
+import pytest
+
+from bench_segmented_transcribe import RATE, check, fake_transcribe_file, generate_audio
+from segmented_transcribe import (merge_transcripts, parse_segment_job_name, segment_job_name, transcribe_wav,
+                                  write_wav)
+
+TARGET = 20  # seconds, so two minutes of audio make several segments
+
+
+@pytest.fixture(scope='module')
+def interview(tmp_path_factory):
+    samples, words = generate_audio(2, random.Random(5))
+    path = str(tmp_path_factory.mktemp('audio') / 'interview.wav')
+    write_wav(path, samples, RATE)
+    return path, words
+
+
+def test_segments_are_cut_between_words_and_merge_back(interview):
+    path, words = interview
+    merged, segments = transcribe_wav(path, lambda segment: fake_transcribe_file(segment['path'], 0, 0), 4,
+                                      target=TARGET, max_length=TARGET * 1.4, min_length=TARGET * 0.2)
+
+    assert len(segments) > 2
+    cuts = [segment['start'] for segment in segments[1:]]
+    assert not [word for word in words for cut in cuts if word[1] < cut < word[2]]
+    found, matched, drift = check(merged, words)
+    assert found == matched == len(words)
+    assert drift < 0.05
+    assert merged['results']['transcripts'][0]['transcript'] == " ".join(word for word, _, _ in words)
+
+
+def test_merge_shifts_times_by_the_segment_offset():
+    def transcript(word, start):
+        return {'results': {'transcripts': [{'transcript': word}], 'items': [
+            {'start_time': f"{start:.3f}", 'end_time': f"{start + 0.5:.3f}", 'type': 'pronunciation',
+             'alternatives': [{'confidence': '0.99', 'content': word}]}]}}
+
+    merged = merge_transcripts([transcript('first', 1.0), transcript('second', 0.25)], [0.0, 300.0])
+
+    assert [(item['alternatives'][0]['content'], float(item['start_time'])) for item in
+            merged['results']['items']] == [('first', 1.0), ('second', 300.25)]
+
+
+def test_segment_job_names_round_trip():
+    assert parse_segment_job_name(segment_job_name('job-1', 7)) == ('job-1', 7)
+    assert parse_segment_job_name('job-1') is None
+
+
+DiskUsage = namedtuple('DiskUsage', 'total used free')
+
+
+@pytest.mark.parametrize('size, free', [(3 * 1024 ** 3, 10 * 1024 ** 3), (100 * 1024 ** 2, 300 * 1024 ** 2)])
+def test_large_video_or_full_tmp_falls_back_to_one_job(load_lambda, monkeypatch, size, free):
+    video_lambda = load_lambda('video_resume_lambda_1_website_integrated', TRANSCRIBE_SEGMENTED='true')
+    downloads = []
+    monkeypatch.setattr(video_lambda.s3, 'download_file', lambda *args: downloads.append(args), raising=False)
+    monkeypatch.setattr(video_lambda.shutil, 'disk_usage', lambda path: DiskUsage(free, 0, free))
+
+    assert video_lambda.start_segmented_transcription('job-1', 'videos', 'videos/a1_talk.mp4', size) == 0
+    assert downloads == []
+
+
+def test_start_passes_the_object_size(aws, load_lambda, monkeypatch):
+    video_lambda = load_lambda('video_resume_lambda_1_website_integrated', TRANSCRIBE_SEGMENTED='true')
+    sizes = []
+    monkeypatch.setattr(video_lambda, 'start_segmented_transcription',
+                        lambda job_id, bucket, key, size: sizes.append(size) or 0)
+    aws.s3.put_object(Bucket='videos', Key='videos/a1_talk.mp4', Body=os.urandom(1234))
+
+    event = {'Records': [{'s3': {'bucket': {'name': 'videos'}, 'object': {'key': 'videos/a1_talk.mp4'}}}]}
+    assert video_lambda.lambda_handler(event, None)['statusCode'] == 200
+    assert sizes == [1234]
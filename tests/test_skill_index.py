@@ -0,0 +1,72 @@
+import random
+from decimal import Decimal
+
+from skill_index import index_resume, posting, query_postings, rebuild, top_candidates
+
+SKILLS = ['python', 'aws', 'docker', 'kubernetes', 'go']
+
+
+def brute_force(resumes, skills, k):
+    ranked = sorted(((len(skills & owned), Decimal(str(score)).quantize(Decimal('0.001')), resume_id)
+                     for resume_id, (owned, score) in resumes.items() if skills & owned), reverse=True)
+    return ranked[:k]
+
+
+def in_memory(resumes):
+    lists = {}
+    for resume_id, (owned, score) in resumes.items():
+        for skill in owned:
+            lists.setdefault(skill, []).append(posting(skill, resume_id, score))
+    for entries in lists.values():
+        entries.sort(key=lambda row: row['ScoreKey'], reverse=True)
+    read = []
+
+    def postings(skill):
+        for row in lists.get(skill, ()):
+            read.append(row)
+            yield row['ResumeID'], row['Score']
+    return postings, read
+
+
+def test_top_candidates_matches_a_full_ranking():
+    rng = random.Random(7)
+    resumes = {f"r{n:03d}": ({s for s in SKILLS if rng.random() < 0.4}, rng.choice([50, 61.5, 70, 88.25, 99]))
+               for n in range(300)}
+    postings, _ = in_memory(resumes)
+
+    for skills in (['Python'], ['python', 'AWS', 'docker'], SKILLS, ['go', 'rust']):
+        ranked = top_candidates(postings, skills, 10)
+        expected = brute_force(resumes, {s.lower() for s in skills}, 10)
+        assert [(c['Matches'], Decimal(str(c['Score'])), c['ResumeID']) for c in ranked] == expected
+        assert all(len(c['MatchedSkills']) == c['Matches'] for c in ranked)
+
+
+def test_search_stops_once_the_top_k_is_settled():
+    resumes = {f"r{n:03d}": ({'python', 'aws'}, 100 - n / 10) for n in range(200)}
+    postings, read = in_memory(resumes)
+
+    ranked = top_candidates(postings, ['python', 'aws'], 5)
+
+    assert [c['ResumeID'] for c in ranked] == ['r000', 'r001', 'r002', 'r003', 'r004']
+    assert len(read) < 20
+
+
+def test_query_postings_reads_best_score_first_across_pages(aws):
+    index_table = aws.resource('dynamodb').Table('ResumeSkillIndex')
+    for n, score in enumerate([40, 95.5, 7, 95.5, 100, 62]):
+        index_resume(index_table, f"r{n}", ['Python', ' python '], score)
+
+    entries = list(query_postings(index_table, 'PYTHON', page_size=4))
+
+    assert [resume_id for resume_id, _ in entries] == ['r4', 'r3', 'r1', 'r5', 'r0', 'r2']
+    assert entries[1][1] == Decimal('95.5')
+
+
+def test_rebuild_indexes_every_stored_resume(aws):
+    dynamodb = aws.resource('dynamodb')
+    results, index_table = dynamodb.Table('ResumeAnalysisResults'), dynamodb.Table('ResumeSkillIndex')
+    results.put_item(Item={'ResumeID': 'r1', 'Skills': '["Python", "AWS"]', 'Score': 80})
+    results.put_item(Item={'ResumeID': 'r2', 'Skills': '[]', 'Score': 90})
+
+    assert rebuild(results, index_table) == 1
+    assert [row['ScoreKey'] for row in index_table.items.values()] == ['0080.000#r1'] * 2
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from resume_scoring import SKILL_KEYWORDS, analyze_resume_text
+from skill_matcher import SkillMatcher
+
+
+def substring_scan(text):
+    # The original per-keyword scan, in taxonomy order
+    return [skill for skill in SKILL_KEYWORDS if skill.lower() in text.lower()]
+
+
+@pytest.mark.parametrize('text, found, not_found', [
+    ("Search quality intern at Google", [], ['Go']),
+    ("Backend services in Go and Python", ['Python', 'Go'], []),
+    ("Frontend work in JavaScript only", ['JavaScript'], ['Java']),
+    ("Java, JavaScript", ['Java', 'JavaScript'], []),
+    ("Systems code in C++; tooling in C#.", ['C++', 'C#'], []),
+    ("Sites built with Next.js and Nuxt.js", ['Next.js', 'Nuxt.js'], []),
+    ("Owned the CI/CD pipeline (GitHub Actions)", ['CI/CD', 'GitHub Actions', 'GitHub'], ['Git']),
+    ("Go-to person for REST API design", ['Go', 'REST API'], []),
+])
+def test_skills_need_word_boundaries(text, found, not_found):
+    skills = analyze_resume_text(text)
+
+    assert set(found) <= set(skills)
+    assert not set(not_found) & set(skills)
+
+
+def test_matching_ignores_case():
+    assert analyze_resume_text("PYTHON, docker and KuBeRnEtEs on aws") == ['AWS', 'Docker', 'Kubernetes', 'Python']
+
+
+def test_standalone_skills_match_the_substring_scan():
+    rng = random.Random(7)
+    for _ in range(200):
+        picked = rng.sample(SKILL_KEYWORDS, rng.randint(1, 12))
+        text = ' | '.join(skill.upper() if rng.random() < 0.3 else skill for skill in picked)
+        skills = analyze_resume_text(text)
+        assert set(picked) <= set(skills)
+        # Word boundaries only ever remove matches the substring scan would make
+        assert set(skills) <= set(substring_scan(text))
+
+
+def test_results_follow_taxonomy_order_without_duplicates():
+    matcher = SkillMatcher(['SQL', 'MySQL', 'Python', 'SQL'])
+
+    assert matcher.skills == ['SQL', 'MySQL', 'Python']
+    assert matcher.find_all("python, mysql, sql, python") == ['SQL', 'MySQL', 'Python']
+    assert matcher.find_all("") == []
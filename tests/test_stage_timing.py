@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+import stage_timing
+from stage_timing import bind, emit, log, request_context, span
+
+
+@pytest.fixture
+def lines(capsys):
+    def read():
+        return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return read
+
+
+def test_span_line_carries_timing_ids_and_late_fields(lines):
+    with request_context('request-1'):
+        bind(analysis_id='a1')
+        with span('comprehend', model='standard') as stage:
+            stage['chunks'] = 3
+
+    [line] = lines()
+    assert line.pop('ms') >= 0
+    assert line == {'type': 'span', 'stage': 'comprehend', 'ok': True, 'request_id': 'request-1',
+                    'analysis_id': 'a1', 'model': 'standard', 'chunks': 3}
+
+
+def test_failed_span_is_marked_and_reraised(lines):
+    with request_context('request-1'), pytest.raises(ValueError):
+        with span('textract'):
+            raise ValueError('no text')
+
+    [line] = lines()
+    assert (line['stage'], line['ok']) == ('textract', False)
+
+
+def test_log_level_gates_lines(lines, monkeypatch):
+    monkeypatch.setattr(stage_timing, 'LOG_LEVEL', stage_timing.LEVELS['WARNING'])
+    with request_context('request-1'):
+        log('INFO', 'hidden')
+        log('ERROR', 'shown', key='cv.pdf')
+        with span('hidden'):
+            pass
+
+    assert lines() == [{'type': 'log', 'level': 'ERROR', 'msg': 'shown', 'request_id': 'request-1',
+                        'key': 'cv.pdf'}]
+
+
+@pytest.mark.parametrize('rate, written', [(0.0, 0), (1.0, 20)])
+def test_sampling_is_decided_per_request(lines, monkeypatch, rate, written):
+    monkeypatch.setattr(stage_timing, 'METRICS_SAMPLE_RATE', rate)
+    for n in range(10):
+        with request_context(f"request-{n}"):
+            emit('s3_head', 1.0)
+            emit('dynamodb_write', 2.0)
+
+    assert len(lines()) == written
+
+
+def test_unsampled_request_keeps_failures_and_its_decision(lines, monkeypatch):
+    monkeypatch.setattr(stage_timing, 'METRICS_SAMPLE_RATE', 0.5)
+    decisions = iter([0.9, 0.1])  # first request out of the sample, second in
+    monkeypatch.setattr(stage_timing.random, 'random', lambda: next(decisions))
+
+    with request_context('out'):
+        emit('s3_head', 1.0)
+        emit('textract', 5.0, ok=False)
+    with request_context('in'):
+        emit('s3_head', 1.0)
+        emit('comprehend', 2.0)
+
+    assert [(line['request_id'], line['stage']) for line in lines()] == [
+        ('out', 'textract'), ('in', 's3_head'), ('in', 'comprehend')]
@@ -0,0 +1,89 @@
+import random
+import re
+
+import pytest
+
+from resume_scoring import generate_score
+from text_features import FEATURE_TERMS, extract_text_features
+
+TRANSCRIPT_KEYWORDS = ["experience", "project", "internship", "developed", "built", "designed", "certification"]
+
+TEXTS = [
+    "",
+    "Projects: built a CI pipeline. PROJECT lead on two more projects.",
+    "Summer Internship at Acme; a second internship in 2023.",
+    "Five years of Industry Experience, no internship listed.",
+    "Certifications: AWS certificate, Azure Certification, certificates x2, certificationcertificate.",
+    "I developed and designed systems; I built tools with my experience in projects and internships.",
+    "  spaced\tout\nwords   everywhere  ",
+]
+
+
+def baseline_resume_score(skills, text):
+    # generate_score as it was before the shared feature counts
+    text_lower = text.lower()
+    project_flag = "project" in text_lower
+    internship_flag, internship_type = False, None
+    if "internship" in text_lower:
+        internship_flag, internship_type = True, "internship"
+    elif "industry experience" in text_lower:
+        internship_flag, internship_type = True, "industry experience"
+    cert_count = text_lower.count("certificate") + text_lower.count("certification")
+    score = 10 + len(skills) * 3 + (10 if project_flag else 0) + (10 if internship_flag else 0) + cert_count * 5
+    return min(score, 100), project_flag, internship_flag, internship_type, cert_count
+
+
+def baseline_transcript_counts(text):
+    # The transcript scoring inputs as video Lambda 2 first computed them
+    return {
+        'word_count': len(text.split()),
+        'keyword_hits': sum(text.lower().count(word) for word in TRANSCRIPT_KEYWORDS),
+        'project': text.lower().count("project"),
+        'internship': text.lower().count("internship"),
+        'certifications': len(re.findall(r"certification|certificate", text.lower())),
+    }
+
+
+def transcript_counts(text):
+    features = extract_text_features(text)
+    return {
+        'word_count': features['word_count'],
+        'keyword_hits': sum(features[word] for word in TRANSCRIPT_KEYWORDS),
+        'project': features['project'],
+        'internship': features['internship'],
+        'certifications': features['certification'] + features['certificate'],
+    }
+
+
+def random_texts(count=200):
+    rng = random.Random(3)
+    vocabulary = list(FEATURE_TERMS) + ['Projects', 'CERTIFICATES', 'the', 'and', 'Python', '.', ',', '\n']
+    for _ in range(count):
+        words = rng.choices(vocabulary, k=rng.randint(0, 40))
+        yield rng.choice([' ', '', '  ']).join(words)
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_resume_score_matches_the_original_formula(text):
+    for skills in ([], ['Python'], ['AWS'] * 30):
+        assert generate_score(skills, text) == baseline_resume_score(skills, text)
+
+
+@pytest.mark.parametrize('text', TEXTS)
+def test_transcript_counts_match_the_original_formulas(text):
+    assert transcript_counts(text) == baseline_transcript_counts(text)
+
+
+def test_counts_match_on_generated_text():
+    for text in random_texts():
+        assert generate_score(['Go'], text) == baseline_resume_score(['Go'], text)
+        assert transcript_counts(text) == baseline_transcript_counts(text)
+
+
+def test_project_internship_and_certificate_counts():
+    features = extract_text_features(TEXTS[4] + " " + TEXTS[5])
+
+    assert features['project'] == 1
+    assert features['internship'] == 1
+    assert features['certificate'] + features['certification'] == 6
+    assert generate_score([], TEXTS[4]) == (40, False, False, None, 6)
@@ -0,0 +1,92 @@
+import pytest
+
+from fakes import FakeComprehend
+from transcript_sentiment import BATCH_SIZE, chunk_text, combine_sentiments, detect_transcript_sentiment
+
+
+def scores(positive, negative, neutral, mixed=0.0):
+    return {'SentimentScore': {'Positive': positive, 'Negative': negative, 'Neutral': neutral, 'Mixed': mixed}}
+
+
+def test_chunks_break_at_sentence_ends():
+    sentences = [f"Sentence number {n} talks about the project." for n in range(40)]
+    chunks = chunk_text(" ".join(sentences), max_bytes=200)
+
+    assert len(chunks) > 1
+    assert all(len(chunk.encode('utf-8')) <= 200 for chunk in chunks)
+    assert all(chunk.endswith('.') for chunk in chunks)
+    assert " ".join(chunks) == " ".join(sentences)
+
+
+def test_chunks_respect_the_byte_limit_for_multibyte_text():
+    text = " ".join(["Résumé détaillé, très réussi à Zürich."] * 60)
+    chunks = chunk_text(text, max_bytes=100)
+
+    assert all(len(chunk.encode('utf-8')) <= 100 for chunk in chunks)
+    assert " ".join(chunks) == text
+
+
+def test_run_on_sentence_is_cut_at_words_and_long_tokens_are_sliced():
+    words = ["word"] * 100 + ["é" * 80]
+    chunks = chunk_text(" ".join(words), max_bytes=50)
+
+    assert all(len(chunk.encode('utf-8')) <= 50 for chunk in chunks)
+    assert "".join(chunks).replace(" ", "") == "".join(words)
+    # Whole words stay whole; only the oversized token is cut, on character boundaries
+    assert all(token == "word" or set(token) == {"é"} for chunk in chunks for token in chunk.split())
+
+
+def test_combined_scores_are_weighted_by_chunk_length():
+    combined = combine_sentiments([scores(0.8, 0.1, 0.1), scores(0.0, 0.9, 0.1)], [3, 1])
+
+    assert combined['SentimentScore'] == pytest.approx({'Positive': 0.6, 'Negative': 0.3, 'Neutral': 0.1,
+                                                        'Mixed': 0.0})
+    assert combined['Sentiment'] == 'POSITIVE'
+
+
+@pytest.mark.parametrize('text', ["", "   \n "])
+def test_empty_transcript_is_one_neutral_call(text):
+    comprehend = FakeComprehend()
+    result = detect_transcript_sentiment(comprehend, text)
+
+    assert result['Sentiment'] == 'NEUTRAL'
+    assert result['ChunkCount'] == 1
+    assert comprehend.calls == {'DetectSentiment': 1}
+
+
+def test_short_transcript_is_one_detect_sentiment_call():
+    comprehend = FakeComprehend()
+    result = detect_transcript_sentiment(comprehend, "I enjoyed the project. It was a great success.")
+
+    assert result['Sentiment'] == 'POSITIVE'
+    assert result['ChunkCount'] == 1
+    assert comprehend.calls == {'DetectSentiment': 1}
+
+
+def test_long_transcript_is_batched_and_weighted():
+    # Much more positive text than negative, in chunks past one batch of 25
+    positive = "I enjoyed building a great project with the team. " * 3000
+    negative = "It was a difficult problem. " * 200
+    comprehend = FakeComprehend()
+    result = detect_transcript_sentiment(comprehend, positive + negative)
+
+    chunk_count = len(chunk_text(positive + negative))
+    assert result['ChunkCount'] == chunk_count > BATCH_SIZE
+    assert comprehend.calls == {'BatchDetectSentiment': -(-chunk_count // BATCH_SIZE)}
+    assert result['Sentiment'] == 'POSITIVE'
+    assert result['SentimentScore']['Negative'] > 0
+
+
+def test_documents_rejected_by_the_batch_are_retried_alone():
+    class RejectingFirst(FakeComprehend):
+        def batch_detect_sentiment(self, TextList, LanguageCode):
+            response = super().batch_detect_sentiment(TextList, LanguageCode)
+            response['ResultList'] = [entry for entry in response['ResultList'] if entry['Index'] != 0]
+            response['ErrorList'].append({'Index': 0, 'ErrorCode': 'InternalServerException'})
+            return response
+
+    comprehend = RejectingFirst()
+    result = detect_transcript_sentiment(comprehend, "We had a good week. " * 600)
+
+    assert comprehend.calls['DetectSentiment'] == comprehend.calls['BatchDetectSentiment']
+    assert result['Sentiment'] == 'POSITIVE'
@@ -0,0 +1,68 @@
+import io
+import json
+
+import pytest
+
+from transcript_stream import stream_transcript
+
+DOCUMENTS = [
+    {'x': 1.25, 'results': {'transcripts': [{'transcript': 'hi'}]}},
+    {
+        'jobName': 'interview-1',
+        'accountId': '123456789012',
+        'results': {
+            'language_code': 'en-US',
+            'transcripts': [{'transcript': 'I led the migration to Kubernetes.'}],
+            'items': [
+                {'start_time': '0.0', 'end_time': '0.31', 'type': 'pronunciation',
+                 'alternatives': [{'confidence': '0.998', 'content': 'I'}]},
+                {'start_time': '0.31', 'end_time': '0.52', 'type': 'pronunciation',
+                 'alternatives': [{'confidence': '1.0', 'content': 'led'}]},
+                {'type': 'punctuation', 'alternatives': [{'confidence': '0.0', 'content': '.'}]},
+            ],
+            'speaker_labels': {'speakers': 2, 'segments': [{'start_time': '0.0', 'speaker_label': 'spk_0'}]},
+        },
+        'status': 'COMPLETED',
+    },
+    {
+        'results': {
+            'duration': 1234.5,
+            'scores': [-0.5, 1e-05, 2.5E+10, 0, -12, 1.0e3],
+            'items': [],
+            'transcripts': [{'transcript': 'café naïve \U0001F600'}],
+        },
+        'version': 3,
+    },
+]
+
+
+def expected(document, with_words):
+    results = document['results']
+    words = None
+    if with_words:
+        words = [
+            (float(item['start_time']), float(item['end_time']), item['alternatives'][0]['content'],
+             float(item['alternatives'][0]['confidence']))
+            for item in results.get('items', []) if item['type'] == 'pronunciation'
+        ]
+    return results['transcripts'][0]['transcript'], words
+
+
+@pytest.mark.parametrize('chunk_size', range(1, 17))
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('with_words', [False, True])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_matches_json_loads_at_every_chunk_size(document, chunk_size, with_words, indent):
+    raw = json.dumps(document, indent=indent, ensure_ascii=False).encode()
+    got = stream_transcript(io.BytesIO(raw), with_words=with_words, chunk_size=chunk_size)
+    assert got == expected(json.loads(raw), with_words)
+
+
+def test_number_split_at_the_window_edge_is_read_whole():
+    raw = b'{"x": 1.25, "results": {"transcripts": [{"transcript": "hi"}]}}'
+    assert stream_transcript(io.BytesIO(raw), chunk_size=4) == ('hi', None)
+
+
+def test_missing_transcript_is_empty():
+    raw = json.dumps({'results': {'items': []}}).encode()
+    assert stream_transcript(io.BytesIO(raw), chunk_size=3) == ('', None)
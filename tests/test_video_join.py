@@ -0,0 +1,169 @@
+import json
+import time
+
+import pytest
+
+EMAIL = 'candidate@example.com'
+
+
+@pytest.fixture
+def video_lambda(load_lambda):
+    return load_lambda('video_resume_lambda_2_website_integrated')
+
+
+def results(aws):
+    return aws.services['dynamodb'].Table('VideoAnalysisResults').items
+
+
+def body(response):
+    assert response['statusCode'] == 200
+    return response['body']
+
+
+@pytest.mark.parametrize('rekognition_first', [True, False])
+def test_second_completion_finalizes(aws, video_lambda, video_jobs, rekognition_first):
+    events = list(video_jobs('job-1', {'useremail': EMAIL}))
+    if not rekognition_first:
+        events.reverse()
+
+    assert 'Partial result stored' in body(video_lambda.lambda_handler(events[0], None))
+    assert results(aws)[('job-1',)]['Status'] == 'PROCESSING'
+    assert 'Analysis saved' in body(video_lambda.lambda_handler(events[1], None))
+
+    item = results(aws)[('job-1',)]
+    assert item['Status'] == 'COMPLETED'
+    assert item['UserEmail'] == EMAIL
+    assert 0 < item['TotalScore'] <= 100
+    assert 'FinalizeToken' not in item and 'FinalizeLeaseExpiresAt' not in item
+
+
+def test_redelivered_completion_after_finalizing_is_ignored(aws, video_lambda, video_jobs):
+    rekognition_event, transcribe_event = video_jobs('job-1')
+    video_lambda.lambda_handler(rekognition_event, None)
+    video_lambda.lambda_handler(transcribe_event, None)
+    completed = dict(results(aws)[('job-1',)])
+
+    for event in (rekognition_event, transcribe_event):
+        assert 'Analysis already completed' in body(video_lambda.lambda_handler(event, None))
+    assert results(aws)[('job-1',)] == completed
+
+
+def test_live_claim_is_left_to_its_owner(aws, video_lambda, video_jobs):
+    rekognition_event, transcribe_event = video_jobs('job-1')
+    video_lambda.lambda_handler(rekognition_event, None)
+    results(aws)[('job-1',)].update(Status='FINALIZING', FinalizeToken='owner',
+                                    FinalizeLeaseExpiresAt=int(time.time()) + 600)
+
+    assert 'already being finalized' in body(video_lambda.lambda_handler(transcribe_event, None))
+    assert results(aws)[('job-1',)]['FinalizeToken'] == 'owner'
+
+
+@pytest.mark.parametrize('lease', [{'FinalizeLeaseExpiresAt': 0}, {}])
+def test_expired_claim_is_taken_over(aws, video_lambda, video_jobs, lease):
+    # An owner that timed out never releases its claim; a claim from before leases has none
+    rekognition_event, transcribe_event = video_jobs('job-1')
+    video_lambda.lambda_handler(rekognition_event, None)
+    results(aws)[('job-1',)].update(Status='FINALIZING', FinalizeToken='timed-out', **lease)
+
+    assert 'Analysis saved' in body(video_lambda.lambda_handler(transcribe_event, None))
+    assert results(aws)[('job-1',)]['Status'] == 'COMPLETED'
+
+
+def test_lease_follows_the_invocation_deadline(aws, video_lambda, video_jobs, monkeypatch):
+    class Context:
+        aws_request_id = 'request-1'
+
+        def get_remaining_time_in_millis(self):
+            return 30_000
+
+    rekognition_event, transcribe_event = video_jobs('job-1')
+    video_lambda.lambda_handler(rekognition_event, Context())
+    claims = []
+    original = video_lambda.finalize_analysis
+
+    def finalize(resume_id, partial):
+        claims.append(dict(results(aws)[(resume_id,)]))
+        return original(resume_id, partial)
+
+    monkeypatch.setattr(video_lambda, 'finalize_analysis', finalize)
+    video_lambda.lambda_handler(transcribe_event, Context())
+
+    expires = claims[0]['FinalizeLeaseExpiresAt']
+    assert claims[0]['Status'] == 'FINALIZING'
+    assert time.time() + 30 <= expires <= time.time() + 30 + video_lambda.FINALIZE_LEASE_MARGIN_SECONDS + 2
+
+
+def test_failed_finalization_is_released_and_raised(aws, video_lambda, video_jobs, monkeypatch):
+    rekognition_event, transcribe_event = video_jobs('job-1')
+    video_lambda.lambda_handler(rekognition_event, None)
+
+    original = video_lambda.open_transcript
+
+    def broken(uri):
+        raise OSError('transcript unavailable')
+    monkeypatch.setattr(video_lambda, 'open_transcript', broken)
+
+    # Raising (not a 500 body) is what makes Lambda retry the async invocation
+    with pytest.raises(OSError):
+        video_lambda.lambda_handler(transcribe_event, None)
+    item = results(aws)[('job-1',)]
+    assert item['Status'] == 'PROCESSING'
+    assert 'FinalizeToken' not in item
+
+    monkeypatch.setattr(video_lambda, 'open_transcript', original)
+    assert 'Analysis saved' in body(video_lambda.lambda_handler(transcribe_event, None))
+
+
+def test_failed_job_is_recorded_without_a_retry(aws, video_lambda, video_jobs):
+    _, transcribe_event = video_jobs('job-1')
+    transcribe_event['detail'].update(TranscriptionJobStatus='FAILED', FailureReason='Unsupported media')
+
+    assert 'Analysis failed' in body(video_lambda.lambda_handler(transcribe_event, None))
+    assert results(aws)[('job-1',)]['FailureReason'] == 'Unsupported media'
+    assert results(aws)[('job-1',)]['Status'] == 'FAILED'
+
+
+def app_row(aws, analysis_id='a1'):
+    return aws.services['dynamodb'].Table('InterviewAnalysisResults').items.get((analysis_id,))
+
+
+def test_completion_is_written_to_the_app_row(aws, video_lambda, video_jobs):
+    aws.services['dynamodb'].Table('InterviewAnalysisResults').put_item(
+        Item={'analysis_id': 'a1', 'status': 'PROCESSING', 'video_url': 'https://videos/a1', 'scores': {}})
+    for event in video_jobs('job-1', {'analysisid': 'a1'}):
+        video_lambda.lambda_handler(event, None)
+
+    row, item = app_row(aws), results(aws)[('job-1',)]
+    assert row['status'] == 'COMPLETED'
+    assert row['scores'] == item['Scores']
+    assert row['transcript'] == item['Transcript']
+    assert row['video_url'] == 'https://videos/a1'
+
+
+def test_long_transcript_leaves_a_pointer_on_the_app_row(aws, video_lambda, video_jobs, monkeypatch):
+    import transcript_store
+    monkeypatch.setattr(transcript_store, 'TRANSCRIPT_INLINE_MAX_BYTES', 100)
+    for event in video_jobs('job-1', {'analysisid': 'a1'}):
+        video_lambda.lambda_handler(event, None)
+
+    row, item = app_row(aws), results(aws)[('job-1',)]
+    assert row['transcript_s3'] == item['TranscriptS3']
+    assert row['transcript'] == item['TranscriptPreview']
+    assert row['transcript_length'] == item['TranscriptLength'] > 100
+
+
+@pytest.mark.parametrize('failed', ['rekognition', 'transcribe'])
+def test_failure_is_written_to_the_app_row(aws, video_lambda, video_jobs, failed):
+    rekognition_event, transcribe_event = video_jobs('job-1', {'analysisid': 'a1'})
+    if failed == 'rekognition':
+        message = json.loads(rekognition_event['Records'][0]['Sns']['Message'])
+        rekognition_event['Records'][0]['Sns']['Message'] = json.dumps({**message, 'Status': 'FAILED'})
+    else:
+        transcribe_event['detail'].update(TranscriptionJobStatus='FAILED', FailureReason='Unsupported media')
+
+    # Transcribe's event comes first, before the AnalysisID is known
+    for event in (transcribe_event, rekognition_event):
+        video_lambda.lambda_handler(event, None)
+
+    assert app_row(aws)['status'] == 'FAILED'
+    assert results(aws)[('job-1',)]['Status'] == 'FAILED'
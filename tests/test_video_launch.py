@@ -0,0 +1,114 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+from fakes import client_error
+from record_batch import RecordsFailed
+
+VIDEO_BUCKET = 'hirefusion-interview-videos'
+KEY = 'videos/0f8fad5b-d9cb-469f-a165-70867728950e_talk.mp4'
+
+
+@pytest.fixture
+def video_lambda(load_lambda):
+    return load_lambda('video_resume_lambda_1_website_integrated', JOB_IDEMPOTENCY_TABLE='VideoJobLaunches')
+
+
+def upload(aws, body=b'video'):
+    aws.s3.put_object(Bucket=VIDEO_BUCKET, Key=KEY, Body=body)
+    return {'Records': [{'s3': {'bucket': {'name': VIDEO_BUCKET}, 'object': {'key': KEY}}}]}
+
+
+def launch(video_lambda, event):
+    [result] = json.loads(video_lambda.lambda_handler(event, None)['body'])['results']
+    return result
+
+
+def launches(aws):
+    return aws.services['dynamodb'].Table('VideoJobLaunches').items
+
+
+def test_redelivered_event_starts_one_pair_of_jobs(aws, video_lambda):
+    event = upload(aws)
+    first = launch(video_lambda, event)
+    second = launch(video_lambda, event)
+
+    assert first['analysisId'] == '0f8fad5b-d9cb-469f-a165-70867728950e'
+    assert second['duplicate'] is True
+    assert (second['jobId'], second['rekognitionJobId']) == (first['jobId'], first['rekognitionJobId'])
+    assert aws.services['rekognition'].calls['StartFaceDetection'] == 1
+    assert list(aws.services['transcribe'].jobs) == [first['jobId']]
+    [record] = launches(aws).values()
+    assert record['Status'] == 'STARTED'
+    assert record['ExpiresAt'] > 0
+
+
+def test_crashed_attempt_is_finished_by_the_retry(aws, video_lambda, monkeypatch):
+    event = upload(aws)
+    transcribe = aws.services['transcribe']
+    start_job = transcribe.start_transcription_job
+
+    def unavailable(**kwargs):
+        raise client_error('ServiceUnavailableException', 'StartTranscriptionJob')
+    monkeypatch.setattr(transcribe, 'start_transcription_job', unavailable)
+    with pytest.raises(RecordsFailed):
+        video_lambda.lambda_handler(event, None)
+    [record] = launches(aws).values()
+    assert record['Status'] == 'STARTING'
+
+    monkeypatch.setattr(transcribe, 'start_transcription_job', start_job)
+    result = launch(video_lambda, event)
+
+    # The face detection job from the crashed attempt is reused through its token
+    assert aws.services['rekognition'].calls['StartFaceDetection'] == 2
+    assert len(aws.services['rekognition'].jobs) == 1
+    assert list(transcribe.jobs) == [result['jobId']]
+    assert launches(aws)[(record['LaunchKey'],)]['Status'] == 'STARTED'
+
+
+def test_transcribe_conflict_from_an_earlier_attempt_is_tolerated(aws, video_lambda, monkeypatch):
+    event = upload(aws)
+    table = video_lambda.launch_table
+    mark = table.update_item
+
+    def lost(**kwargs):
+        raise client_error('InternalServerError', 'UpdateItem')
+    # Both jobs start, then the attempt dies before recording it
+    monkeypatch.setattr(table, 'update_item', lost)
+    with pytest.raises(RecordsFailed):
+        video_lambda.lambda_handler(event, None)
+
+    monkeypatch.setattr(table, 'update_item', mark)
+    result = launch(video_lambda, event)
+
+    assert result['message'] == 'Jobs started successfully'
+    assert aws.services['transcribe'].calls['StartTranscriptionJob'] == 2
+    assert list(aws.services['transcribe'].jobs) == [result['jobId']]
+    assert len(aws.services['rekognition'].jobs) == 1
+
+
+def test_other_transcribe_errors_are_raised(aws, video_lambda, monkeypatch):
+    def bad_request(**kwargs):
+        raise client_error('BadRequestException', 'StartTranscriptionJob')
+    monkeypatch.setattr(aws.services['transcribe'], 'start_transcription_job', bad_request)
+
+    with pytest.raises(ClientError):
+        video_lambda.start_transcription('job-1', f"s3://{VIDEO_BUCKET}/{KEY}", 'mp4')
+
+
+def test_unversioned_bucket_launches_are_keyed_by_etag(aws, video_lambda):
+    first = launch(video_lambda, upload(aws, b'first take'))
+    etag = aws.s3.head_object(Bucket=VIDEO_BUCKET, Key=KEY)['ETag'].strip('"')
+    assert (video_lambda.launch_key_for(VIDEO_BUCKET, KEY, etag),) in launches(aws)
+
+    # Same key, new content: a new object, so new jobs
+    second = launch(video_lambda, upload(aws, b'second take'))
+    # The event's eTag is used when present
+    event = upload(aws, b'second take')
+    event['Records'][0]['s3']['object']['eTag'] = aws.s3.head_object(Bucket=VIDEO_BUCKET, Key=KEY)['ETag'].strip('"')
+    third = launch(video_lambda, event)
+
+    assert second['jobId'] != first['jobId']
+    assert third['duplicate'] is True and third['jobId'] == second['jobId']
+    assert len(aws.services['transcribe'].jobs) == 2
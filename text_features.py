@@ -0,0 +1,18 @@
+# Every term either scorer looks for. No term is a prefix of another, so
+# "certification" and "certificate" never count the same characters.
+FEATURE_TERMS = (
+    "project", "internship", "industry experience", "experience", "developed",
+    "built", "designed", "certification", "certificate"
+)
+
+
+def extract_text_features(text):
+    """
+    Count every scoring term and the word total for a resume or transcript.
+    The text is lowered once and shared by all counts; counts use the same
+    non-overlapping semantics as str.count, so scores are unchanged.
+    """
+    text_lower = text.lower()
+    features = {term: text_lower.count(term) for term in FEATURE_TERMS}
+    features['word_count'] = len(text.split())
+    return features
@@ -0,0 +1,101 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Comprehend accepts at most 5,000 UTF-8 bytes per document and 25 documents per batch
+MAX_CHUNK_BYTES = 4800
+BATCH_SIZE = 25
+MAX_WORKERS = 4
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+SCORE_KEYS = ('Positive', 'Negative', 'Neutral', 'Mixed')
+
+
+def _slice_bytes(word, max_bytes):
+    # A single token over the limit is cut into character-safe slices
+    data = word.encode('utf-8')
+    while data:
+        piece = data[:max_bytes].decode('utf-8', 'ignore')
+        yield piece
+        data = data[len(piece.encode('utf-8')):]
+
+
+def _split_oversized(sentence, max_bytes):
+    # A run-on "sentence" longer than the limit is cut at word boundaries
+    pieces, current, size = [], [], 0
+    for token in sentence.split():
+        for word in _slice_bytes(token, max_bytes):
+            encoded = len(word.encode('utf-8'))
+            if current and size + 1 + encoded > max_bytes:
+                pieces.append(' '.join(current))
+                current, size = [], 0
+            size += encoded + (1 if current else 0)
+            current.append(word)
+    if current:
+        pieces.append(' '.join(current))
+    return pieces
+
+
+def chunk_text(text, max_bytes=MAX_CHUNK_BYTES):
+    """Split text at sentence boundaries into chunks of at most max_bytes UTF-8 bytes."""
+    chunks, current, size = [], [], 0
+    for sentence in SENTENCE_END.split(text.strip()):
+        if not sentence:
+            continue
+        encoded = len(sentence.encode('utf-8'))
+        if encoded > max_bytes:
+            if current:
+                chunks.append(' '.join(current))
+                current, size = [], 0
+            chunks.extend(_split_oversized(sentence, max_bytes))
+            continue
+        if current and size + 1 + encoded > max_bytes:
+            chunks.append(' '.join(current))
+            current, size = [], 0
+        size += encoded + (1 if current else 0)
+        current.append(sentence)
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+def combine_sentiments(results, weights):
+    """Length-weighted average of per-chunk SentimentScore; the label is the top score."""
+    total = float(sum(weights)) or 1.0
+    combined = {key: 0.0 for key in SCORE_KEYS}
+    for result, weight in zip(results, weights):
+        for key in SCORE_KEYS:
+            combined[key] += result['SentimentScore'][key] * weight / total
+    label = max(SCORE_KEYS, key=lambda key: combined[key]).upper()
+    return {'Sentiment': label, 'SentimentScore': combined}
+
+
+def detect_transcript_sentiment(comprehend, text, language_code='en', max_workers=MAX_WORKERS):
+    """
+    Sentiment for a transcript of any length.
+    Short text is a single detect_sentiment call, as before; longer text is
+    chunked and sent through batch_detect_sentiment with bounded concurrency.
+    """
+    chunks = chunk_text(text) if text and text.strip() else []
+    if len(chunks) <= 1:
+        result = comprehend.detect_sentiment(Text=(chunks[0] if chunks else "neutral"), LanguageCode=language_code)
+        return {'Sentiment': result['Sentiment'], 'SentimentScore': result['SentimentScore'], 'ChunkCount': 1}
+
+    batches = [chunks[i:i + BATCH_SIZE] for i in range(0, len(chunks), BATCH_SIZE)]
+
+    def run_batch(batch):
+        response = comprehend.batch_detect_sentiment(TextList=batch, LanguageCode=language_code)
+        results = [None] * len(batch)
+        for entry in response['ResultList']:
+            results[entry['Index']] = entry
+        # Documents the batch call rejected are retried one by one
+        for error in response.get('ErrorList', []):
+            index = error['Index']
+            results[index] = comprehend.detect_sentiment(Text=batch[index], LanguageCode=language_code)
+        return results
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as pool:
+        results = [result for batch_results in pool.map(run_batch, batches) for result in batch_results]
+
+    combined = combine_sentiments(results, [len(chunk.encode('utf-8')) for chunk in chunks])
+    combined['ChunkCount'] = len(chunks)
+    return combined
@@ -0,0 +1,48 @@
+"""
+Interview transcripts kept out of the DynamoDB result item.
+
+Transcripts up to TRANSCRIPT_INLINE_MAX_BYTES (UTF-8) stay inline in
+Transcript. Longer ones are gzipped to S3, and the item keeps only a
+pointer (TranscriptS3), the character length (TranscriptLength) and the
+first TRANSCRIPT_PREVIEW_CHARS characters (TranscriptPreview). Result
+polls then read a few hundred bytes instead of the whole interview, and
+long interviews stay under the 400 KB item limit. The app's result row
+mirrors these as transcript, transcript_s3 and transcript_length.
+"""
+import gzip
+import os
+
+TRANSCRIPT_BUCKET = os.environ.get('TRANSCRIPT_BUCKET', 'hirefusion-interview-transcripts')
+TRANSCRIPT_PREFIX = 'transcripts/'
+TRANSCRIPT_INLINE_MAX_BYTES = int(os.environ.get('TRANSCRIPT_INLINE_MAX_BYTES', str(16 * 1024)))
+TRANSCRIPT_PREVIEW_CHARS = int(os.environ.get('TRANSCRIPT_PREVIEW_CHARS', '500'))
+
+
+def transcript_key(analysis_id):
+    return f"{TRANSCRIPT_PREFIX}{analysis_id}.txt.gz"
+
+
+def transcript_fields(s3, analysis_id, text, bucket=TRANSCRIPT_BUCKET):
+    """Return the item attributes for text, uploading it first when it is too big to inline."""
+    data = text.encode('utf-8')
+    if len(data) <= TRANSCRIPT_INLINE_MAX_BYTES:
+        return {'Transcript': text, 'TranscriptLength': len(text)}
+
+    key = transcript_key(analysis_id)
+    # Fixed key: a retried finalization overwrites the same object
+    s3.put_object(
+        Bucket=bucket, Key=key, Body=gzip.compress(data, compresslevel=6),
+        ContentType='text/plain; charset=utf-8', ContentEncoding='gzip'
+    )
+    return {
+        'TranscriptS3': f"s3://{bucket}/{key}",
+        'TranscriptLength': len(text),
+        'TranscriptPreview': text[:TRANSCRIPT_PREVIEW_CHARS]
+    }
+
+
+def read_transcript(s3, pointer):
+    """Full transcript text from an offloaded transcript's s3:// pointer."""
+    bucket, _, key = pointer[len('s3://'):].partition('/')
+    body = s3.get_object(Bucket=bucket, Key=key)['Body'].read()
+    return gzip.decompress(body).decode('utf-8')
@@ -0,0 +1,161 @@
+import codecs
+import json
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+# What can follow a prefix of a JSON number that the decoder already accepted
+NUMBER_TAIL = '.eE+-'
+
+_decoder = json.JSONDecoder()
+
+
+class _StreamReader:
+    """Pull-style reader over a JSON byte stream; holds only a small window in memory."""
+
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        if self.eof:
+            return False
+        data = self.fp.read(size or self.chunk_size)
+        if not data:
+            self.eof = True
+            self.buf += self.utf8.decode(b'', final=True)
+            return False
+        # Drop what has been consumed before growing the window
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += self.utf8.decode(data)
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the transcript stream")
+        self.pos += 1
+
+    def read_value(self):
+        """Decode one complete JSON value, reading more of the stream as needed."""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number running to the window edge, or into a bare '.'/'e'/sign
+                # there, may continue in the next chunk
+                tail = self.buf[end:]
+                if (self.eof or self.buf[self.pos] in '"{[tfn'
+                        or tail and not all(char in NUMBER_TAIL for char in tail)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+    def iter_array(self):
+        # Yields once per element; the caller must consume the element
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"Malformed array in transcript stream near offset {self.pos}")
+
+    def iter_object(self):
+        # Yields each key positioned at its value; the caller must consume the value
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError(f"Malformed object in transcript stream near offset {self.pos}")
+
+    def skip_value(self, depth=2):
+        # Stream through the outer levels so large unused arrays are never built whole
+        char = self.peek()
+        if depth and char == '[':
+            for _ in self.iter_array():
+                self.skip_value(depth - 1)
+        elif depth and char == '{':
+            for _ in self.iter_object():
+                self.skip_value(depth - 1)
+        else:
+            self.read_value()
+
+
+def _word_timing(item):
+    alternative = item['alternatives'][0]
+    return (
+        float(item['start_time']),
+        float(item['end_time']),
+        alternative['content'],
+        float(alternative.get('confidence') or 0.0),
+    )
+
+
+def stream_transcript(fp, with_words=False, chunk_size=CHUNK_SIZE):
+    """
+    Pull results.transcripts[0].transcript out of an Amazon Transcribe JSON
+    document without loading the whole file.
+    With with_words=True also return (start, end, content, confidence) for
+    every pronunciation item; otherwise reading stops once the text is found.
+    Returns (transcript_text, words or None).
+    """
+    reader = _StreamReader(fp, chunk_size)
+    transcript = None
+    words = [] if with_words else None
+
+    for key in reader.iter_object():
+        if key != 'results':
+            reader.skip_value()
+            continue
+        for result_key in reader.iter_object():
+            if result_key == 'transcripts':
+                for _ in reader.iter_array():
+                    entry = reader.read_value()
+                    if transcript is None:
+                        transcript = entry.get('transcript', '')
+            elif result_key == 'items' and with_words:
+                for _ in reader.iter_array():
+                    item = reader.read_value()
+                    if item.get('type') == 'pronunciation':
+                        words.append(_word_timing(item))
+            else:
+                reader.skip_value()
+
+            if transcript is not None and not with_words:
+                return transcript, None
+        break
+
+    return transcript or "", words
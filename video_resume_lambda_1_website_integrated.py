@@ -1,60 +1,213 @@
 import boto3
+import hashlib
 import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
 import uuid
 import urllib.parse
 import json
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from record_batch import process_records
+from segmented_transcribe import (SEGMENT_BUCKET, SEGMENT_WORKERS, extract_audio, manifest_key, segment_job_name,
+                                  segment_prefix, split_audio)
 
 rekognition = boto3.client('rekognition')
 transcribe = boto3.client('transcribe')
+s3 = boto3.client('s3')
+dynamodb = boto3.resource('dynamodb')
 
 SNS_TOPIC_ARN = os.environ['SNS_TOPIC_ARN']
 
+# Launch records: one conditional write per object version, so a redelivered
+# S3 event returns the jobs already started instead of starting (and paying
+# for) new ones. Entries expire through the table's TTL attribute (ExpiresAt).
+JOB_IDEMPOTENCY_TABLE = os.environ.get('JOB_IDEMPOTENCY_TABLE')
+JOB_IDEMPOTENCY_TTL_DAYS = int(os.environ.get('JOB_IDEMPOTENCY_TTL_DAYS', '7'))
+launch_table = dynamodb.Table(JOB_IDEMPOTENCY_TABLE) if JOB_IDEMPOTENCY_TABLE else None
+
+# Optional: long interviews are transcribed as silence-split segments in parallel
+# (needs ffmpeg, e.g. from a Lambda layer); anything shorter, or any failure
+# to split, falls back to one job for the whole file.
+TRANSCRIBE_SEGMENTED = os.environ.get('TRANSCRIBE_SEGMENTED', 'false').lower() == 'true'
+SEGMENTED_MIN_SECONDS = float(os.environ.get('SEGMENTED_MIN_SECONDS', '600'))
+# The video is downloaded to ephemeral storage (/tmp), next to its extracted
+# WAV and the segment WAVs (16 kHz mono: ~115 MB per audio hour, each); larger
+# videos, or too little free space, go to one job without being downloaded
+SEGMENTED_MAX_BYTES = int(os.environ.get('SEGMENTED_MAX_BYTES', str(2 * 1024 ** 3)))
+SEGMENTED_WORK_BYTES = int(os.environ.get('SEGMENTED_WORK_BYTES', str(512 * 1024 ** 2)))
+
+# app.py uploads to "videos/{analysis_id}_{filename}"
+ANALYSIS_ID_PREFIX = re.compile(r'(?:^|/)([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})_')
+
 def lambda_handler(event, context):
+    # Every video in a batched S3/SQS notification gets its own jobs
+    return process_records(event, start_analysis_jobs)
+
+def launch_key_for(bucket, key, version):
+    # One key per object version; the ETag stands in on unversioned buckets
+    return hashlib.sha256(f"{bucket}/{key}@{version}".encode()).hexdigest()
+
+def analysis_id_for(key, head):
+    """The analysis_id app.py created for this upload, from metadata or the key; None if unknown."""
+    analysis_id = head['Metadata'].get('analysisid')
+    if analysis_id:
+        return analysis_id
+    match = ANALYSIS_ID_PREFIX.search(key)
+    return match.group(1) if match else None
+
+def claim_launch(launch_key, job_id, analysis_id, bucket, key):
+    """
+    Write the launch record; returns None if this invocation owns the launch,
+    or the existing record if an earlier delivery already wrote it.
+    """
+    if not launch_table:
+        return None
+    item = {
+        'LaunchKey': launch_key,
+        'JobId': job_id,
+        'Bucket': bucket,
+        'Key': key,
+        'Status': 'STARTING',
+        'ExpiresAt': int(time.time()) + JOB_IDEMPOTENCY_TTL_DAYS * 86400
+    }
+    if analysis_id:
+        item['AnalysisID'] = analysis_id
     try:
-        # Get S3 object details from event
-        record = event['Records'][0]
-        bucket = record['s3']['bucket']['name']  # e.g. hirefusion-interview-resumes
-        key = urllib.parse.unquote_plus(record['s3']['object']['key'])
-
-        # Generate unique analysis_id (for website + DB mapping)
-        analysis_id = str(uuid.uuid4())
-        s3_uri = f"s3://{bucket}/{key}"
-
-        # Start Face Detection (video analysis) → async
-        rekognition.start_face_detection(
-            Video={'S3Object': {'Bucket': bucket, 'Name': key}},
-            NotificationChannel={
-                'SNSTopicArn': SNS_TOPIC_ARN,
-                'RoleArn': os.environ['REKOG_ROLE_ARN']
-            },
-            JobTag=analysis_id  # links Rekognition result back
+        launch_table.put_item(Item=item, ConditionExpression="attribute_not_exists(LaunchKey)")
+        return None
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+    return launch_table.get_item(Key={'LaunchKey': launch_key}, ConsistentRead=True).get('Item')
+
+def mark_launched(launch_key, rekognition_job_id):
+    if launch_table:
+        launch_table.update_item(
+            Key={'LaunchKey': launch_key},
+            UpdateExpression="SET #status = :started, RekognitionJobId = :job",
+            ExpressionAttributeNames={'#status': 'Status'},
+            ExpressionAttributeValues={':started': 'STARTED', ':job': rekognition_job_id}
         )
 
+def start_analysis_jobs(record):
+    # Get S3 object details from event
+    bucket = record['s3']['bucket']['name']  # e.g. hirefusion-interview-resumes
+    key = urllib.parse.unquote_plus(record['s3']['object']['key'])
+    s3_uri = f"s3://{bucket}/{key}"
+
+    # The event names the exact version that triggered it; HEAD fills in the rest
+    head = s3.head_object(Bucket=bucket, Key=key)
+    version = (record['s3']['object'].get('versionId') or head.get('VersionId')
+               or record['s3']['object'].get('eTag') or head.get('ETag', '').strip('"'))
+    launch_key = launch_key_for(bucket, key, version)
+
+    # Job id (Rekognition JobTag and Transcribe job name) is derived from the
+    # object version, so every redelivery of the same event maps to the same jobs
+    job_id = str(uuid.UUID(launch_key[:32]))
+    analysis_id = analysis_id_for(key, head)
+
+    existing = claim_launch(launch_key, job_id, analysis_id, bucket, key)
+    if existing and existing.get('Status') == 'STARTED':
+        print(f"Jobs for {s3_uri} already started as {existing['JobId']}, skipping")
+        return {
+            'message': 'Jobs already started',
+            'analysisId': existing.get('AnalysisID'),
+            'jobId': existing['JobId'],
+            'rekognitionJobId': existing.get('RekognitionJobId'),
+            'file': key,
+            'bucket': bucket,
+            'duplicate': True
+        }
+    # A STARTING record is an earlier attempt that died midway; the calls below
+    # are idempotent, so finishing it here cannot start a second pair of jobs
+
+    # Start Face Detection (video analysis) → async
+    response = rekognition.start_face_detection(
+        Video={'S3Object': {'Bucket': bucket, 'Name': key}},
+        NotificationChannel={
+            'SNSTopicArn': SNS_TOPIC_ARN,
+            'RoleArn': os.environ['REKOG_ROLE_ARN']
+        },
+        JobTag=job_id,  # links Rekognition result back
+        ClientRequestToken=launch_key  # 64 hex chars; the same token returns the same JobId
+    )
+
+    # Start Transcribe Job(s) (audio analysis) → async
+    segments = start_segmented_transcription(job_id, bucket, key, head['ContentLength']) if TRANSCRIBE_SEGMENTED else 0
+    if not segments:
         # Extract file extension dynamically (mp4, mov, etc.)
         file_ext = key.split('.')[-1]
+        start_transcription(job_id, s3_uri, file_ext)  # links Transcribe result back
+
+    mark_launched(launch_key, response['JobId'])
 
-        # Start Transcribe Job (audio analysis) → async
+    # Website receives this response immediately
+    return {
+        'message': 'Jobs started successfully',
+        'analysisId': analysis_id,
+        'jobId': job_id,
+        'rekognitionJobId': response['JobId'],
+        'transcriptionSegments': segments or 1,
+        'file': key,
+        'bucket': bucket
+    }
+
+def start_transcription(job_name, media_uri, media_format):
+    try:
         transcribe.start_transcription_job(
-            TranscriptionJobName=analysis_id,  # links Transcribe result back
-            Media={'MediaFileUri': s3_uri},
-            MediaFormat=file_ext,
+            TranscriptionJobName=job_name,
+            Media={'MediaFileUri': media_uri},
+            MediaFormat=media_format,
             LanguageCode='en-US'
         )
+    except ClientError as e:
+        # Job names are unique per account: a conflict means this job is already running
+        if e.response['Error']['Code'] != 'ConflictException':
+            raise
 
-        # Website receives this response immediately
-        return {
-            'statusCode': 200,
-            'body': json.dumps({
-                'message': 'Jobs started successfully',
-                'analysisId': analysis_id,
-                'file': key,
-                'bucket': bucket
-            })
-        }
+def start_segmented_transcription(job_id, bucket, key, size):
+    """
+    Split the audio at silences and start one Transcribe job per segment.
+    Returns the number of segments, or 0 when the whole file should be one job.
+    """
+    free = shutil.disk_usage(tempfile.gettempdir()).free
+    if size > SEGMENTED_MAX_BYTES or size + SEGMENTED_WORK_BYTES > free:
+        print(f"s3://{bucket}/{key} is {size} bytes with {free} bytes free in {tempfile.gettempdir()}, using one job")
+        return 0
 
-    except Exception as e:
-        print(f"Error: {str(e)}")
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
-        }
+    with tempfile.TemporaryDirectory() as work:
+        try:
+            video_path = os.path.join(work, 'video.' + key.split('.')[-1])
+            s3.download_file(bucket, key, video_path)
+            wav_path = os.path.join(work, 'audio.wav')
+            extract_audio(video_path, wav_path)
+            segments = split_audio(wav_path, work)
+        except (OSError, subprocess.CalledProcessError, ValueError) as e:
+            # No ffmpeg, no audio track, unreadable file...: one job still works
+            print(f"Segmented transcription not possible for s3://{bucket}/{key}, using one job: {e}")
+            return 0
+        if len(segments) < 2 or segments[-1]['end'] < SEGMENTED_MIN_SECONDS:
+            return 0
+
+        # Manifest first: Lambda 2 needs it as soon as any segment finishes
+        manifest = {'job_id': job_id, 'segments': [
+            {'index': s['index'], 'start': s['start'], 'end': s['end'],
+             'job_name': segment_job_name(job_id, s['index'])} for s in segments
+        ]}
+        s3.put_object(Bucket=SEGMENT_BUCKET, Key=manifest_key(job_id), Body=json.dumps(manifest),
+                      ContentType='application/json')
+
+        def start(segment):
+            segment_key = f"{segment_prefix(job_id)}seg{segment['index']:03d}.wav"
+            s3.upload_file(segment['path'], SEGMENT_BUCKET, segment_key)
+            start_transcription(segment_job_name(job_id, segment['index']),
+                                f"s3://{SEGMENT_BUCKET}/{segment_key}", 'wav')
+
+        # Once any segment job may exist, errors propagate so the event is retried
+        with ThreadPoolExecutor(max_workers=SEGMENT_WORKERS) as pool:
+            list(pool.map(start, segments))
+        return len(segments)
@@ -1,19 +1,44 @@
 import boto3
+import contextlib
+import contextvars
 import json
 import os
-import urllib.request
 import time
+import urllib.request
+import uuid
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from decimal import Decimal
-import re
+from dashboard_stats import STATS_TABLE, put_counted_result
+from segmented_transcribe import (SEGMENT_BUCKET, SEGMENT_WORKERS, manifest_key, merge_transcripts,
+                                  parse_segment_job_name, segment_prefix, transcribe_segments)
+from stage_timing import bind, emit, log, request_context, span
+from text_features import extract_text_features
+from transcript_sentiment import detect_transcript_sentiment
+from transcript_store import transcript_fields
+from transcript_stream import stream_transcript
 
 rekognition = boto3.client('rekognition')
 transcribe = boto3.client('transcribe')
 dynamodb = boto3.resource('dynamodb')
 comprehend = boto3.client('comprehend')
+s3 = boto3.client('s3')
 
 TABLE_NAME = os.environ['DDB_TABLE']
 table = dynamodb.Table(TABLE_NAME)
+stats_table = dynamodb.Table(STATS_TABLE)
+# The app's row for the upload (keyed by analysis_id), which /api/video_result reads
+APP_RESULTS_TABLE = os.environ.get('APP_RESULTS_TABLE', 'InterviewAnalysisResults')
+app_table = dynamodb.Table(APP_RESULTS_TABLE)
+
+FACE_PAGE_SIZE = 1000  # Rekognition maximum for get_face_detection
+
+# A FINALIZING claim is a lease that lasts as long as the claiming invocation
+# can still run; after that its owner has timed out and a redelivery takes over.
+FINALIZE_LEASE_SECONDS = int(os.environ.get('FINALIZE_LEASE_SECONDS', '900'))  # without a Lambda context
+FINALIZE_LEASE_MARGIN_SECONDS = 5
+finalize_lease = contextvars.ContextVar('finalize_lease', default=FINALIZE_LEASE_SECONDS)
 
 # Convert float/nested values into Decimal
 def to_decimal(val):
@@ -27,134 +52,408 @@ def to_decimal(val):
         return val.strip() if val else None
     return val
 
-def lambda_handler(event, context):
-    print("[DEBUG] Incoming Event:", json.dumps(event))
+def iter_face_detections(job_id):
+    """
+    Yield every face detection across all result pages.
+    The next page is requested as soon as its NextToken is known, so the
+    fetch overlaps with the caller consuming the current page.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(rekognition.get_face_detection, JobId=job_id, MaxResults=FACE_PAGE_SIZE)
+        while pending:
+            page = pending.result()
+            token = page.get('NextToken')
+            pending = pool.submit(
+                rekognition.get_face_detection, JobId=job_id, MaxResults=FACE_PAGE_SIZE, NextToken=token
+            ) if token else None
+            yield from page.get('Faces', [])
 
-    try:
-        # Parse SNS message
-        message = json.loads(event['Records'][0]['Sns']['Message'])
-        print("[DEBUG] Parsed SNS Message:", json.dumps(message))
-
-        # Use resume_id (JobTag) instead of random UUID
-        resume_id = message['JobTag']    
-        bucket = message['Video']['S3Bucket']
-        key = message['Video']['S3ObjectName']
-
-        # ---- 1. Rekognition Results ----
-        print(f"[DEBUG] Getting Rekognition results for JobId={message['JobId']}")
-        rekog_results = rekognition.get_face_detection(JobId=message['JobId'])
-        face_detections = rekog_results.get('Faces', [])
-        print(f"[DEBUG] Total Faces Detected: {len(face_detections)}")
-
-        # Facial expression score (based on "HAPPY" emotion)
-        happy_confidences = [
-            e['Confidence'] for face_item in face_detections 
-            for e in face_item['Face'].get('Emotions', []) if e['Type'] == 'HAPPY'
-        ]
-        facial_score = round(sum(happy_confidences) / len(happy_confidences), 2) if happy_confidences else 50.0
-
-        # Gesture score (based on Smile)
-        gesture_confidences = [
-            face_item['Face']['Smile']['Confidence'] 
-            for face_item in face_detections 
-            if 'Smile' in face_item['Face'] and face_item['Face']['Smile'].get('Value', False)
-        ]
-        gesture_score = round(sum(gesture_confidences) / len(gesture_confidences), 2) if gesture_confidences else 50.0
-
-        print(f"[DEBUG] Facial Score={facial_score}, Gesture Score={gesture_score}")
-
-        # ---- 2. Wait for Transcribe ----
-        print(f"[DEBUG] Waiting for Transcribe Job={resume_id}")
-        status = None
-        for _ in range(60):   # 60 attempts × 5s = 300s = 5 min
-            transcribe_result = transcribe.get_transcription_job(TranscriptionJobName=resume_id)
-            status = transcribe_result['TranscriptionJob']['TranscriptionJobStatus']
-            print(f"[DEBUG] Transcribe Status={status}")
-            if status == 'COMPLETED':
-                break
-            elif status == 'FAILED':
-                raise Exception("Transcribe job failed")
-            time.sleep(5)
-
-        if status != 'COMPLETED':
-            raise Exception("Transcribe job timed out")
-
-        transcript_uri = transcribe_result['TranscriptionJob']['Transcript']['TranscriptFileUri']
-        print(f"[DEBUG] Transcript URI={transcript_uri}")
-
-        # ---- 3. Transcript Analysis ----
-        with urllib.request.urlopen(transcript_uri) as response:
-            transcript_data = json.loads(response.read().decode('utf-8'))
-
-        transcript_text = transcript_data['results']['transcripts'][0]['transcript'] if transcript_data['results']['transcripts'] else ""
-        print(f"[DEBUG] Transcript Extracted: {transcript_text[:100]}...")
-
-        # Sentiment analysis
-        sentiment = comprehend.detect_sentiment(Text=transcript_text or "neutral", LanguageCode='en')
-        print(f"[DEBUG] Sentiment={sentiment['Sentiment']}")
-
-        # Communication score
-        communication_score = 90 if sentiment['Sentiment'] == "POSITIVE" else (75 if sentiment['Sentiment'] == "NEUTRAL" else 60)
-
-        # Grammar score based on transcript length
-        word_count = len(transcript_text.split())
-        grammar_score = 50 if word_count < 30 else (70 if word_count < 100 else 90)
-
-        # Content score based on richness (keywords + word count)
-        keywords = ["experience", "project", "internship", "developed", "built", "designed", "certification"]
-        keyword_hits = sum(transcript_text.lower().count(word) for word in keywords)
-        content_score = min(100, (word_count / 2) + (keyword_hits * 5))
-
-        # Dynamic projects, internship, certifications from transcript
-        project_score = min(20, transcript_text.lower().count("project") * 5)
-        internship_score = min(20, transcript_text.lower().count("internship") * 5)
-        certifications_count = len(re.findall(r"certification|certificate", transcript_text.lower()))
-        certification_score = min(20, certifications_count * 5)
-
-        # Total Score
-        total_score = round(
-            (facial_score + gesture_score + grammar_score + content_score +
-             communication_score + project_score + internship_score + certification_score) / 8, 2
-        )
+def aggregate_face_scores(face_detections):
+    """
+    Running averages of HAPPY confidence (facial score) and smile confidence
+    (gesture score); memory stays flat however many faces stream through.
+    """
+    happy_sum = happy_count = smile_sum = smile_count = face_count = 0
+    for face_item in face_detections:
+        face_count += 1
+        face = face_item['Face']
+        for e in face.get('Emotions', []):
+            if e['Type'] == 'HAPPY':
+                happy_sum += e['Confidence']
+                happy_count += 1
+        if 'Smile' in face and face['Smile'].get('Value', False):
+            smile_sum += face['Smile']['Confidence']
+            smile_count += 1
 
-        final_score = {
-            "facial_expressions": facial_score,
-            "hand_gestures": gesture_score,
-            "confidence_level": round((facial_score + gesture_score) / 2, 2),
-            "communication_skills": communication_score,
-            "grammar": grammar_score,
-            "content": content_score,
-            "projects": project_score,
-            "internship": internship_score,
-            "certifications": certification_score,
-            "total_score": total_score
-        }
+    # Facial expression score (based on "HAPPY" emotion)
+    facial_score = round(happy_sum / happy_count, 2) if happy_count else 50.0
+    # Gesture score (based on Smile)
+    gesture_score = round(smile_sum / smile_count, 2) if smile_count else 50.0
+    return facial_score, gesture_score, face_count
 
-        print("[DEBUG] Final Score Object:", final_score)
-
-        # ---- 4. Save to DynamoDB ----
-        item = {
-            "ResumeID": resume_id,  #  Same as website metadata
-            "Video": f"s3://{bucket}/{key}",
-            "Timestamp": datetime.utcnow().isoformat(),
-            "Scores": to_decimal(final_score),
-            "Transcript": transcript_text,
-            "Status": "COMPLETED",
-            "TotalScore": Decimal(str(total_score))
-        }
+def lambda_handler(event, context):
+    lease = FINALIZE_LEASE_SECONDS
+    if hasattr(context, 'get_remaining_time_in_millis'):
+        lease = context.get_remaining_time_in_millis() / 1000 + FINALIZE_LEASE_MARGIN_SECONDS
+    token = finalize_lease.set(lease)
+    try:
+        with request_context(getattr(context, 'aws_request_id', None)):
+            return handle_event(event)
+    finally:
+        finalize_lease.reset(token)
 
-        print(f"[DEBUG] Item to be saved to DynamoDB: {json.dumps(item, default=str)}")
-        table.put_item(Item=item)
+def handle_event(event):
+    log('DEBUG', 'Incoming event', event=event)
+
+    try:
+        # Rekognition and Transcribe finish independently; each completion stores its
+        # half of the result and whichever arrives second computes the final score.
+        if event.get('source') == 'aws.transcribe':
+            result = handle_transcribe_completion(event['detail'])
+        else:
+            # Parse SNS message
+            message = json.loads(event['Records'][0]['Sns']['Message'])
+            log('DEBUG', 'Parsed SNS message', message=message)
+            result = handle_rekognition_completion(message)
 
-        print(f"[SUCCESS] Analysis saved for {resume_id}")
         return {
             'statusCode': 200,
-            'body': json.dumps({'message': 'Analysis saved', 'resume_id': resume_id})
+            'body': json.dumps(result)
         }
 
     except Exception as e:
-        print(f"[ERROR] {str(e)}")
-        return {
-            'statusCode': 500,
-            'body': json.dumps({'error': str(e)})
+        # Raised so Lambda retries the async invocation, then hands it to the
+        # function's failure destination
+        log('ERROR', str(e))
+        raise
+
+def handle_rekognition_completion(message):
+    # Use resume_id (JobTag) instead of random UUID
+    resume_id = message['JobTag']
+    bucket = message['Video']['S3Bucket']
+    key = message['Video']['S3ObjectName']
+    bind(analysis_id=resume_id)
+
+    # Uploader email (set by /api/upload_video) drives the dashboard aggregates,
+    # analysisid links the result back to the app's InterviewAnalysisResults row
+    with span('s3_head'):
+        metadata = s3.head_object(Bucket=bucket, Key=key)['Metadata']
+
+    if message['Status'] != 'SUCCEEDED':
+        # Final for this analysis: recorded, not retried
+        reason = f"Rekognition job {message['JobId']} ended with status {message['Status']}"
+        mark_failed(resume_id, reason, metadata.get('analysisid'))
+        log('ERROR', reason)
+        return {'message': 'Analysis failed', 'resume_id': resume_id}
+
+    # ---- 1. Rekognition Results ----
+    with span('rekognition_fetch', job_id=message['JobId']) as stage:
+        facial_score, gesture_score, face_count = aggregate_face_scores(iter_face_detections(message['JobId']))
+        stage['faces'] = face_count
+    log('DEBUG', 'Face scores', facial_score=facial_score, gesture_score=gesture_score)
+
+    partial = {
+        'FacialScore': Decimal(str(facial_score)),
+        'GestureScore': Decimal(str(gesture_score)),
+        'Video': f"s3://{bucket}/{key}"
+    }
+    if metadata.get('useremail'):
+        partial['UserEmail'] = metadata['useremail']
+    if metadata.get('analysisid'):
+        partial['AnalysisID'] = metadata['analysisid']
+
+    item = store_partial_result(resume_id, partial)
+    if item and item['Status'] == 'FAILED':
+        # The transcript side failed before the AnalysisID was known
+        if item.get('AnalysisID'):
+            update_app_result(item['AnalysisID'], {'status': 'FAILED', 'failure_reason': item.get('FailureReason')})
+        return {'message': 'Analysis failed', 'resume_id': resume_id}
+    return finalize_if_ready(resume_id, item)
+
+def handle_transcribe_completion(detail):
+    # Transcribe job name is the same id used as the Rekognition JobTag
+    # (plus "__segNNN" when Lambda 1 split the audio into segments)
+    segment = parse_segment_job_name(detail['TranscriptionJobName'])
+    resume_id = segment[0] if segment else detail['TranscriptionJobName']
+    status = detail['TranscriptionJobStatus']
+    bind(analysis_id=resume_id)
+    log('DEBUG', 'Transcribe job state change', status=status)
+
+    if status == 'FAILED':
+        reason = detail.get('FailureReason', 'Transcribe job failed')
+        mark_failed(resume_id, reason)
+        log('ERROR', reason)
+        return {'message': 'Analysis failed', 'resume_id': resume_id}
+    if status != 'COMPLETED':
+        return {'message': f'Ignored Transcribe status {status}', 'resume_id': resume_id}
+    if segment:
+        return handle_segment_completion(resume_id, segment[1])
+
+    # ---- 2. Transcribe Results ----
+    with span('transcribe_status'):
+        job = transcribe.get_transcription_job(TranscriptionJobName=resume_id)['TranscriptionJob']
+    transcript_uri = job['Transcript']['TranscriptFileUri']
+    # How long the job itself took, queueing included, as reported by Transcribe
+    if job.get('CreationTime') and job.get('CompletionTime'):
+        emit('transcribe_wait', (job['CompletionTime'] - job['CreationTime']).total_seconds() * 1000)
+
+    item = store_partial_result(resume_id, {'TranscriptUri': transcript_uri})
+    return finalize_if_ready(resume_id, item)
+
+def handle_segment_completion(resume_id, index):
+    """
+    Record one finished segment; the invocation whose update completes the
+    set merges the segment transcripts and stores that as the transcript half.
+    """
+    try:
+        with span('dynamodb_write', op='segment'):
+            item = table.update_item(
+                Key={'ResumeID': resume_id},
+                UpdateExpression="ADD SegmentsDone :segment SET #status = if_not_exists(#status, :processing)",
+                ConditionExpression="attribute_not_exists(#status) OR #status <> :completed",
+                ExpressionAttributeNames={'#status': 'Status'},
+                ExpressionAttributeValues={':segment': {index}, ':processing': 'PROCESSING',
+                                           ':completed': 'COMPLETED'},
+                ReturnValues='ALL_NEW'
+            )['Attributes']
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return {'message': 'Analysis already completed', 'resume_id': resume_id}
+        raise
+
+    manifest = json.loads(s3.get_object(Bucket=SEGMENT_BUCKET, Key=manifest_key(resume_id))['Body'].read())
+    if len(item['SegmentsDone']) < len(manifest['segments']):
+        log('DEBUG', 'Segment transcript stored', segment=index, done=len(item['SegmentsDone']))
+        return {'message': f'Segment {index} stored', 'resume_id': resume_id}
+
+    with span('transcript_merge', segments=len(manifest['segments'])):
+        transcript_uri = merge_segment_transcripts(resume_id, manifest)
+    item = store_partial_result(resume_id, {'TranscriptUri': transcript_uri})
+    return finalize_if_ready(resume_id, item)
+
+def merge_segment_transcripts(resume_id, manifest):
+    """Fetch every segment's transcript, merge them with corrected times and store the result in S3."""
+    def fetch(segment):
+        job = transcribe.get_transcription_job(TranscriptionJobName=segment['job_name'])['TranscriptionJob']
+        with urllib.request.urlopen(job['Transcript']['TranscriptFileUri']) as response:
+            return json.load(response)
+
+    segments = sorted(manifest['segments'], key=lambda s: s['index'])
+    merged = merge_transcripts(transcribe_segments(segments, fetch, SEGMENT_WORKERS), [s['start'] for s in segments])
+    key = f"{segment_prefix(resume_id)}transcript.json"
+    s3.put_object(Bucket=SEGMENT_BUCKET, Key=key, Body=json.dumps(merged), ContentType='application/json')
+    return f"s3://{SEGMENT_BUCKET}/{key}"
+
+def open_transcript(uri):
+    # Merged segment transcripts live in S3; Transcribe's own URIs are presigned HTTPS
+    if uri.startswith('s3://'):
+        bucket, _, key = uri[len('s3://'):].partition('/')
+        return s3.get_object(Bucket=bucket, Key=key)['Body']
+    return urllib.request.urlopen(uri)
+
+def store_partial_result(resume_id, values):
+    """
+    Atomically merge one half of the result into the item and return the
+    item as it stands after the write (None if it is already COMPLETED).
+    """
+    names = {f"#p{i}": name for i, name in enumerate(values)}
+    assignments = ", ".join(f"#p{i} = :p{i}" for i in range(len(values)))
+    attribute_values = {f":p{i}": value for i, value in enumerate(values.values())}
+    try:
+        with span('dynamodb_write', op='partial'):
+            response = table.update_item(
+                Key={'ResumeID': resume_id},
+                UpdateExpression=f"SET {assignments}, #status = if_not_exists(#status, :processing)",
+                ConditionExpression="attribute_not_exists(#status) OR #status <> :completed",
+                ExpressionAttributeNames={**names, '#status': 'Status'},
+                ExpressionAttributeValues={**attribute_values, ':processing': 'PROCESSING', ':completed': 'COMPLETED'},
+                ReturnValues='ALL_NEW'
+            )
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return None
+        raise
+    return response['Attributes']
+
+def claim_finalization(resume_id):
+    """
+    Move PROCESSING -> FINALIZING for this invocation only, even if both see
+    every part. A claim whose lease ran out (its owner timed out) can be
+    taken over. Returns the claim token, or None while another invocation
+    holds a live claim.
+    """
+    now = int(time.time())
+    token = uuid.uuid4().hex
+    try:
+        table.update_item(
+            Key={'ResumeID': resume_id},
+            UpdateExpression="SET #status = :finalizing, FinalizeToken = :token, FinalizeLeaseExpiresAt = :expires",
+            ConditionExpression="#status = :processing OR (#status = :finalizing AND "
+                                "(FinalizeLeaseExpiresAt < :now OR attribute_not_exists(FinalizeLeaseExpiresAt)))",
+            ExpressionAttributeNames={'#status': 'Status'},
+            ExpressionAttributeValues={':finalizing': 'FINALIZING', ':processing': 'PROCESSING', ':token': token,
+                                       ':now': now, ':expires': now + int(finalize_lease.get()) + 1}
+        )
+        return token
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            return None
+        raise
+
+def release_finalization(resume_id, token):
+    # Let the retried event finalize after a failure; only the claim's owner may release it
+    table.update_item(
+        Key={'ResumeID': resume_id},
+        UpdateExpression="SET #status = :processing REMOVE FinalizeToken, FinalizeLeaseExpiresAt",
+        ConditionExpression="#status = :finalizing AND FinalizeToken = :token",
+        ExpressionAttributeNames={'#status': 'Status'},
+        ExpressionAttributeValues={':finalizing': 'FINALIZING', ':processing': 'PROCESSING', ':token': token}
+    )
+
+def mark_failed(resume_id, reason, analysis_id=None):
+    values = {'Status': 'FAILED', 'FailureReason': reason}
+    if analysis_id:
+        values['AnalysisID'] = analysis_id
+    names = {f"#p{i}": name for i, name in enumerate(values)}
+    item = table.update_item(
+        Key={'ResumeID': resume_id},
+        UpdateExpression="SET " + ", ".join(f"#p{i} = :p{i}" for i in range(len(values))),
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues={f":p{i}": value for i, value in enumerate(values.values())},
+        ReturnValues='ALL_NEW'
+    )['Attributes']
+    if item.get('AnalysisID'):
+        update_app_result(item['AnalysisID'], {'status': 'FAILED', 'failure_reason': reason})
+
+def update_app_result(analysis_id, values):
+    """
+    Set attributes on the app's row for the upload. An upsert: the S3 event
+    can beat the app's PROCESSING insert, which then leaves this row alone.
+    """
+    names = {f"#a{i}": name for i, name in enumerate(values)}
+    with span('dynamodb_write', op='app_result'):
+        app_table.update_item(
+            Key={'analysis_id': analysis_id},
+            UpdateExpression="SET " + ", ".join(f"#a{i} = :a{i}" for i in range(len(values))),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues={f":a{i}": value for i, value in enumerate(values.values())}
+        )
+
+def finalize_if_ready(resume_id, item):
+    if item is None:
+        return {'message': 'Analysis already completed', 'resume_id': resume_id}
+    if 'FacialScore' not in item or 'TranscriptUri' not in item:
+        log('DEBUG', 'Partial result stored, waiting for the other job')
+        return {'message': 'Partial result stored', 'resume_id': resume_id}
+    token = claim_finalization(resume_id)
+    if not token:
+        return {'message': 'Analysis already being finalized', 'resume_id': resume_id}
+
+    try:
+        return finalize_analysis(resume_id, item)
+    except Exception:
+        try:
+            release_finalization(resume_id, token)
+        except ClientError as e:
+            # Surface the finalization error, not the failed release
+            log('ERROR', 'Could not release finalization', error=str(e))
+        raise
+
+def finalize_analysis(resume_id, partial):
+    facial_score = float(partial['FacialScore'])
+    gesture_score = float(partial['GestureScore'])
+
+    # ---- 3. Transcript Analysis ----
+    # Streamed: only the transcript text is kept, the per-word items are skipped
+    with span('transcript_fetch') as stage:
+        with contextlib.closing(open_transcript(partial['TranscriptUri'])) as response:
+            transcript_text, _ = stream_transcript(response)
+        stage['chars'] = len(transcript_text)
+
+    # Sentiment analysis (chunked at sentence boundaries for long transcripts)
+    with span('comprehend') as stage:
+        sentiment = detect_transcript_sentiment(comprehend, transcript_text)
+        stage['chunks'] = sentiment['ChunkCount']
+
+    # Communication score
+    communication_score = 90 if sentiment['Sentiment'] == "POSITIVE" else (75 if sentiment['Sentiment'] == "NEUTRAL" else 60)
+
+    # All term counts and the word count in one go
+    with span('transcript_features'):
+        features = extract_text_features(transcript_text)
+
+    # Grammar score based on transcript length
+    word_count = features["word_count"]
+    grammar_score = 50 if word_count < 30 else (70 if word_count < 100 else 90)
+
+    # Content score based on richness (keywords + word count)
+    keywords = ["experience", "project", "internship", "developed", "built", "designed", "certification"]
+    keyword_hits = sum(features[word] for word in keywords)
+    content_score = min(100, (word_count / 2) + (keyword_hits * 5))
+
+    # Dynamic projects, internship, certifications from transcript
+    project_score = min(20, features["project"] * 5)
+    internship_score = min(20, features["internship"] * 5)
+    certifications_count = features["certification"] + features["certificate"]
+    certification_score = min(20, certifications_count * 5)
+
+    # Total Score
+    total_score = round(
+        (facial_score + gesture_score + grammar_score + content_score +
+         communication_score + project_score + internship_score + certification_score) / 8, 2
+    )
+
+    final_score = {
+        "facial_expressions": facial_score,
+        "hand_gestures": gesture_score,
+        "confidence_level": round((facial_score + gesture_score) / 2, 2),
+        "communication_skills": communication_score,
+        "grammar": grammar_score,
+        "content": content_score,
+        "projects": project_score,
+        "internship": internship_score,
+        "certifications": certification_score,
+        "total_score": total_score
+    }
+
+    log('DEBUG', 'Final score', scores=final_score)
+
+    # ---- 4. Save to DynamoDB ----
+    # Long transcripts go to S3; the item keeps a pointer and a preview
+    with span('transcript_store') as stage:
+        transcript = transcript_fields(s3, resume_id, transcript_text)
+        stage['offloaded'] = 'TranscriptS3' in transcript
+
+    item = {
+        "ResumeID": resume_id,  #  Same as website metadata
+        "Video": partial['Video'],
+        "Timestamp": datetime.utcnow().isoformat(),
+        "Scores": to_decimal(final_score),
+        **transcript,
+        "Status": "COMPLETED",
+        "TotalScore": Decimal(str(total_score))
+    }
+    if partial.get('UserEmail'):
+        item["UserEmail"] = partial['UserEmail']
+    if partial.get('AnalysisID'):
+        item["AnalysisID"] = partial['AnalysisID']
+        # The app's row first: it is idempotent, and once the row below is
+        # COMPLETED a redelivered event would no longer get here to retry it
+        app_values = {
+            "status": "COMPLETED",
+            "scores": item["Scores"],
+            "timestamp": int(time.time()),
+            "transcript": transcript.get('Transcript', transcript.get('TranscriptPreview', "")),
+            "transcript_length": transcript['TranscriptLength']
         }
+        if 'TranscriptS3' in transcript:
+            app_values["transcript_s3"] = transcript['TranscriptS3']
+        update_app_result(partial['AnalysisID'], app_values)
+
+    # The COMPLETED row and the uploader's dashboard aggregates commit together,
+    # so a failure here leaves the item FINALIZING with nothing counted
+    with span('dynamodb_write', op='final'):
+        put_counted_result(table, item, stats_table, 'video', total_score)
+
+    log('INFO', 'Analysis saved', total_score=total_score)
+    return {'message': 'Analysis saved', 'resume_id': resume_id}